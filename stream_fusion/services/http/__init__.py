@@ -0,0 +1,10 @@
+from stream_fusion.services.http.http_client import (
+    AsyncHttpClient,
+    HttpResponse,
+    close_http_client,
+    get_http_client,
+    init_http_client,
+)
+
+
+__all__ = ["AsyncHttpClient", "HttpResponse", "close_http_client", "get_http_client", "init_http_client"]
\ No newline at end of file
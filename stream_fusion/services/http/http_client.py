@@ -0,0 +1,222 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+import orjson
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 60
+
+
+class HttpResponse:
+    """Fully read response, detached from the connection it came from."""
+
+    def __init__(self, response: aiohttp.ClientResponse, content: bytes):
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.content = content
+        self._request_info = response.request_info
+        self._history = response.history
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return orjson.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise aiohttp.ClientResponseError(
+                self._request_info,
+                self._history,
+                status=self.status,
+                message=self.reason or "",
+                headers=self.headers,
+            )
+
+
+class AsyncHttpClient:
+    """
+    Async transport shared by every indexer, metadata and debrid integration.
+
+    It reuses the application's aiohttp sessions, caps concurrent requests per
+    host, applies a per-request timeout and retries connection errors, timeouts,
+    429 and 5xx responses with exponential backoff (honouring Retry-After).
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        proxy_session: Optional[aiohttp.ClientSession] = None,
+        timeout: float = settings.http_timeout,
+        max_retries: int = settings.http_max_retries,
+        backoff_factor: float = settings.http_backoff_factor,
+        limit_per_host: int = settings.http_limit_per_host,
+    ):
+        self._session = session
+        self._proxy_session = proxy_session or session
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.limit_per_host = limit_per_host
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _clean_params(params: Optional[dict]) -> Optional[dict]:
+        if params is None:
+            return None
+        return {
+            key: value if isinstance(value, (str, int, float)) and not isinstance(value, bool) else str(value)
+            for key, value in params.items()
+            if value is not None
+        }
+
+    @staticmethod
+    def _form_fields(data: dict) -> List[Tuple[str, Any]]:
+        # Like requests, a list value is sent as the same field repeated.
+        fields = []
+        for key, value in data.items():
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                fields.append((key, item if isinstance(item, (str, bytes)) else str(item)))
+        return fields
+
+    def _build_body(self, data: Any, files: Optional[dict]) -> Any:
+        if not files:
+            return self._form_fields(data) if isinstance(data, dict) else data
+        form = aiohttp.FormData()
+        for key, value in self._form_fields(data or {}):
+            form.add_field(key, value)
+        for key, value in files.items():
+            filename, content = value[0], value[1]
+            content_type = value[2] if len(value) > 2 else "application/octet-stream"
+            form.add_field(key, content, filename=filename, content_type=content_type)
+        return form
+
+    def _get_retry_delay(self, attempt: int, response: Optional[HttpResponse] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), MAX_RETRY_AFTER)
+                except ValueError:
+                    pass
+        return self.backoff_factor * (2**attempt)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        data: Any = None,
+        json: Any = None,
+        files: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        use_proxy: bool = False,
+        allow_redirects: bool = True,
+        raise_for_status: bool = True,
+    ) -> HttpResponse:
+        """
+        Send a request and return the fully read response.
+
+        ``files`` maps a field name to a ``(filename, content[, content_type])``
+        tuple, like ``requests`` does. Requests flagged with ``use_proxy`` go
+        through the configured ``PROXY_URL`` session.
+        """
+        session = self._proxy_session if use_proxy else self._session
+        retries = self.max_retries if max_retries is None else max_retries
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+        host = urlsplit(str(url)).netloc
+        params = self._clean_params(params)
+
+        for attempt in range(retries + 1):
+            try:
+                async with self._get_semaphore(host):
+                    async with session.request(
+                        method.upper(),
+                        url,
+                        params=params,
+                        data=self._build_body(data, files),
+                        json=json,
+                        headers=headers,
+                        timeout=client_timeout,
+                        allow_redirects=allow_redirects,
+                    ) as response:
+                        http_response = HttpResponse(response, await response.read())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    raise
+                delay = self._get_retry_delay(attempt)
+                logger.warning(
+                    f"HttpClient: {method.upper()} on {host} failed ({type(e).__name__}), retrying in {delay:.1f}s ({attempt + 1}/{retries})"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if http_response.status in RETRY_STATUSES and attempt < retries:
+                delay = self._get_retry_delay(attempt, http_response)
+                logger.warning(
+                    f"HttpClient: {method.upper()} on {host} returned {http_response.status}, retrying in {delay:.1f}s ({attempt + 1}/{retries})"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if raise_for_status:
+                http_response.raise_for_status()
+            return http_response
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+
+_http_client: Optional[AsyncHttpClient] = None
+
+
+def init_http_client(
+    session: aiohttp.ClientSession,
+    proxy_session: Optional[aiohttp.ClientSession] = None,
+) -> AsyncHttpClient:
+    """Create the process wide client on top of the application's sessions."""
+    global _http_client
+    _http_client = AsyncHttpClient(session, proxy_session)
+    return _http_client
+
+
+def get_http_client() -> AsyncHttpClient:
+    if _http_client is None:
+        raise RuntimeError("HTTP client is not initialized, call init_http_client() first.")
+    return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client
+    _http_client = None
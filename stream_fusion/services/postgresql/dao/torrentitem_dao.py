@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from fastapi import Depends
-from sqlalchemy import select, func
+from sqlalchemy import String, any_, literal, select, func
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 
@@ -9,6 +10,9 @@ from stream_fusion.services.postgresql.models.torrentitem_model import TorrentIt
 from stream_fusion.logging_config import logger
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 
+UPSERT_BATCH_SIZE = 500
+
+
 class TorrentItemDAO:
     """Class for accessing TorrentItem table."""
 
@@ -29,6 +33,44 @@ class TorrentItemDAO:
             except Exception as e:
                 logger.error(f"TorrentItemDAO: Error creating TorrentItem: {str(e)}")
 
+    async def upsert_torrent_items(self, torrent_items: Dict[str, TorrentItem]) -> int:
+        """Insert or refresh many TorrentItems, keyed by id, with one INSERT ... ON CONFLICT per batch."""
+        if not torrent_items:
+            return 0
+
+        rows = [self._to_row(torrent_item, item_id) for item_id, torrent_item in torrent_items.items()]
+        async with self.session.begin():
+            try:
+                for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                    query = insert(TorrentItemModel).values(rows[start:start + UPSERT_BATCH_SIZE])
+                    query = query.on_conflict_do_update(
+                        index_elements=[TorrentItemModel.id],
+                        set_={
+                            column: query.excluded[column]
+                            for column in rows[0]
+                            if column not in ("id", "created_at")
+                        },
+                    )
+                    await self.session.execute(query)
+
+                logger.debug(f"TorrentItemDAO: Upserted {len(rows)} TorrentItems")
+                return len(rows)
+            except Exception as e:
+                logger.error(f"TorrentItemDAO: Error upserting {len(rows)} TorrentItems: {str(e)}")
+                return 0
+
+    @staticmethod
+    def _to_row(torrent_item: TorrentItem, item_id: str) -> dict:
+        model = TorrentItemModel.from_torrent_item(torrent_item)
+        model.id = item_id
+        row = {}
+        for column in TorrentItemModel.__table__.columns:
+            value = getattr(model, column.key)
+            if value is None and column.default is not None and column.default.is_scalar:
+                value = column.default.arg
+            row[column.key] = value
+        return row
+
     async def get_all_torrent_items(self, limit: int, offset: int) -> List[TorrentItemModel]:
         async with self.session.begin():
             try:
@@ -56,6 +98,23 @@ class TorrentItemDAO:
                 logger.error(f"TorrentItemDAO: Error retrieving TorrentItem {item_id}: {str(e)}")
                 return None
 
+    async def get_torrent_items_by_ids(self, item_ids: List[str]) -> List[TorrentItemModel]:
+        if not item_ids:
+            return []
+
+        async with self.session.begin():
+            try:
+                query = select(TorrentItemModel).where(
+                    TorrentItemModel.id == any_(literal(list(item_ids), ARRAY(String)))
+                )
+                result = await self.session.execute(query)
+                items = result.scalars().all()
+                logger.debug(f"TorrentItemDAO: Retrieved {len(items)}/{len(item_ids)} TorrentItems by id")
+                return items
+            except Exception as e:
+                logger.error(f"TorrentItemDAO: Error retrieving TorrentItems by ids: {str(e)}")
+                return []
+
     async def update_torrent_item(self, item_id: str, torrent_item: TorrentItem) -> TorrentItemModel:
         async with self.session.begin():
             try:
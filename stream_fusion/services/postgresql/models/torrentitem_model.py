@@ -7,6 +7,7 @@ from typing import Optional, List
 import hashlib
 import json
 
+from stream_fusion.utils.parser.parse_cache import parse_title, rebuild_parsed_data
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 
 class TorrentItemModel(Base):
@@ -80,22 +81,31 @@ class TorrentItemModel(Base):
         return cls(**model_dict)
 
     def to_torrent_item(self):
-        from RTN.models import ParsedData
-        from stream_fusion.utils.torrent.torrent_item import TorrentItem
-
-        torrent_item_dict = {}
-        for attr, value in self.__dict__.items():
-            if attr not in ['_sa_instance_state', 'created_at', 'updated_at']:
-                if attr == 'parsed_data':
-                    torrent_item_dict[attr] = ParsedData(**value) if value else None
-                else:
-                    torrent_item_dict[attr] = value
-
-        # Supprimez les attributs qui ne sont pas dans TorrentItem
-        valid_attrs = set(TorrentItem.__init__.__code__.co_varnames)
-        torrent_item_dict = {k: v for k, v in torrent_item_dict.items() if k in valid_attrs}
-
-        return TorrentItem(**torrent_item_dict)
+        torrent_item = TorrentItem(
+            raw_title=self.raw_title,
+            size=self.size,
+            magnet=self.magnet,
+            info_hash=self.info_hash,
+            link=self.link,
+            seeders=self.seeders,
+            languages=self.languages,
+            indexer=self.indexer,
+            privacy=self.privacy,
+            type=self.type,
+            parsed_data=(
+                rebuild_parsed_data(self.parsed_data)
+                if self.parsed_data
+                else parse_title(self.raw_title)
+            ),
+        )
+        torrent_item.file_name = self.file_name
+        torrent_item.files = self.files
+        torrent_item.torrent_download = self.torrent_download
+        torrent_item.trackers = self.trackers or []
+        torrent_item.file_index = self.file_index
+        torrent_item.full_index = self.full_index
+
+        return torrent_item
 
     @staticmethod
     def _parse_size(size):
@@ -1,9 +1,12 @@
+import asyncio
 import hashlib
+import time
+
 import aiohttp
-import redis
-import requests
+from redis.exceptions import RedisError
 
-from stream_fusion.settings import settings
+from stream_fusion.services.http import get_http_client
+from stream_fusion.services.redis.redis_config import create_redis_cache
 from stream_fusion.logging_config import logger
 
 
@@ -45,9 +48,10 @@ class RealDebridService:
 
 class RDTokenManager:
     BASE_URL = "https://api.real-debrid.com/oauth/v2"
+    # Tokens are renewed this many seconds before Real-Debrid expires them.
+    EXPIRY_MARGIN = 300
 
     def __init__(self, config):
-        self.redis = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=settings.redis_db)
         self.config = config
         self.rd_config = self.config.get("RDToken", {})
         if not self.rd_config:
@@ -65,24 +69,65 @@ class RDTokenManager:
             raise Exception("Missing required Real Debrid configuration")
 
         self.token_key = self.generate_token_key()
+        # The access token is kept in memory until it expires, Redis shares it
+        # with the other workers.
+        self._access_token = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
         self.logger.info("RDTokenManager initialized successfully")
 
     def generate_token_key(self):
         unique_string = f"{self.client_id}:{self.client_secret}:{self.refresh_token}"
         return f"rd_access_token:{hashlib.sha256(unique_string.encode()).hexdigest()}"
 
-    def get_access_token(self):
-        token = self.redis.get(self.token_key)
-        if token:
-            self.logger.debug("Access token found in Redis")
-            return token.decode("utf-8")
-        self.logger.info("Access token not found in Redis, generating new token")
-        return self.new_access_token()
+    def _remember(self, token, expires_in):
+        self._access_token = token
+        self._expires_at = time.monotonic() + expires_in
 
-    def new_access_token(self):
+    def _cached_token(self):
+        if self._access_token and time.monotonic() < self._expires_at:
+            return self._access_token
+        return None
+
+    async def get_access_token(self):
+        token = self._cached_token()
+        if token:
+            return token
+
+        # A single renewal per account, concurrent requests wait for it.
+        async with self._lock:
+            token = self._cached_token()
+            if token:
+                return token
+
+            try:
+                async with create_redis_cache() as redis_cache:
+                    client = await redis_cache.get_redis_client()
+                    token = await client.get(self.token_key)
+                    ttl = await client.ttl(self.token_key)
+                    if token and ttl > 0:
+                        self.logger.debug("Access token found in Redis")
+                        self._remember(token.decode("utf-8"), ttl)
+                        return self._access_token
+
+                    self.logger.info("Access token not found in Redis, generating new token")
+                    token, expires_in = await self.new_access_token()
+                    await client.setex(self.token_key, expires_in, token)
+                    self.logger.debug(
+                        f"Access token stored in Redis with expiry: {expires_in} seconds"
+                    )
+            except RedisError as e:
+                self.logger.warning(f"Redis unavailable, access token kept in memory only: {e}")
+                token, expires_in = await self.new_access_token()
+
+            self._remember(token, expires_in)
+            return token
+
+    async def new_access_token(self):
+        """Request a new access token, returns it with its lifetime in seconds."""
         self.logger.info("Requesting new access token from Real Debrid")
         try:
-            response = requests.post(
+            response = await get_http_client().post(
                 f"{self.BASE_URL}/token",
                 data={
                     "client_id": self.client_id,
@@ -92,16 +137,10 @@ class RDTokenManager:
                 },
             )
 
-            response.raise_for_status()
-
             data = response.json()
             self.logger.info("New access token received successfully")
-            self.redis.setex(self.token_key, 43200, data["access_token"])
-            self.logger.debug(
-                f"Access token stored in Redis with expiry: {data['expires_in']} seconds"
-            )
-
-            return data["access_token"]
-        except requests.exceptions.RequestException as e:
+            expires_in = max(60, int(data.get("expires_in", 43200)) - self.EXPIRY_MARGIN)
+            return data["access_token"], expires_in
+        except aiohttp.ClientError as e:
             self.logger.error(f"Error requesting new access token: {str(e)}")
             raise
@@ -2,7 +2,7 @@ from functools import lru_cache
 from typing import AsyncGenerator
 
 from fastapi import Depends, Request
-from redis import Redis
+from redis.asyncio import Redis
 from stream_fusion.settings import settings
 from stream_fusion.utils.cache.local_redis import RedisCache
 
@@ -42,7 +42,7 @@ async def get_redis_client(request: Request) -> AsyncGenerator[Redis, None]:
     try:
         yield redis_client
     finally:
-        redis_client.close()
+        await redis_client.aclose()
 
 # Dependency for Redis connection pool
 def get_redis_dependency():
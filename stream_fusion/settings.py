@@ -82,6 +82,14 @@ class Settings(BaseSettings):
         None  # If set, the link will be proxied through the given proxy.
     )
     proxy_buffer_size: int = 1024 * 1024
+    proxy_chunk_size: int = 64 * 1024
+    proxy_segment_cache: bool = False
+    proxy_segment_cache_path: str = "/app/config/segments"
+    proxy_segment_cache_size: int = 2 * 1024 * 1024 * 1024
+    proxy_segment_block_size: int = 4 * 1024 * 1024
+
+    # PLAYBACK
+    playback_link_timeout: int = 30
 
     # REALDEBRID
     rd_token: str | None = None
@@ -104,6 +112,20 @@ class Settings(BaseSettings):
     tb_base_url: str = "https://api.torbox.app"
     tb_api_version: str = "v1"
 
+    # DEBRID AVAILABILITY
+    debrid_availability_ttl: int = 3600
+    debrid_unavailability_ttl: int = 900
+
+    # DEBRID TORRENT LIST
+    debrid_torrent_list_ttl: int = 900
+
+    # DEBRID RATE LIMIT
+    debrid_rate_limit_max_wait: int = 15
+
+    # DEBRID CLIENTS
+    debrid_client_pool_size: int = 1000
+    debrid_client_idle_ttl: int = 1800
+
     # LOGGING
     log_level: LogLevel = LogLevel.INFO
     log_path: str = "/app/config/logs/stream-fusion.log"
@@ -128,6 +150,13 @@ class Settings(BaseSettings):
     redis_db: int = 5
     redis_expiration: int = 604800
     redis_password: str | None = None
+    redis_max_connections: int = 50
+    redis_socket_timeout: int = 5
+    redis_compression: str = "zlib"
+    redis_compression_threshold: int = 1024
+    redis_l1_enabled: bool = False
+    redis_l1_max_bytes: int = 67108864
+    redis_l1_ttl: int = 60
 
     # TMDB
     tmdb_api_key: str | None = None
@@ -163,6 +192,26 @@ class Settings(BaseSettings):
     # PUBLIC_CACHE
     public_cache_url: str = "https://stremio-jackett-cacher.elfhosted.com/"
 
+    # SEARCH
+    search_timeout: int = 45
+    search_single_flight_timeout: int = 90
+    search_cache_soft_ttl: int = 21600
+
+    # PARSER
+    parse_cache_size: int = 50000
+    parse_cache_redis: bool = False
+
+    # HTTP CLIENT
+    http_timeout: int = 30
+    http_max_retries: int = 3
+    http_backoff_factor: float = 0.5
+    http_limit_per_host: int = 20
+
+    # TORRENT FILES
+    torrent_fetch_concurrency: int = 10
+    torrent_fetch_rate: float = 5.0
+    torrent_decode_workers: int = 2
+
     # DEVELOPMENT
     debug: bool = False
     dev_host: str = "0.0.0.0"
@@ -1,4 +1,6 @@
 from stream_fusion.utils.cache.cache_base import CacheBase
+from stream_fusion.utils.cache.codecs import CacheCodec
 from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.memory_cache import MemoryCache
 
-__all__ = ["CacheBase", "RedisCache"]
\ No newline at end of file
+__all__ = ["CacheBase", "CacheCodec", "MemoryCache", "RedisCache"]
@@ -5,12 +5,13 @@ import requests
 from typing import List
 
 from stream_fusion.logging_config import logger
+from stream_fusion.services.http import get_http_client
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.constants import EXCLUDED_TRACKERS
 from stream_fusion.settings import settings
 
 
-def search_public(media):
+async def search_public(media):
     logger.info("Searching for public cached " + media.type + " results")
     url = settings.public_cache_url + "getResult/" + media.type + "/"
     # Without that, the cache doesn't return results. Maybe make multiple requests? One for each language, just like jackett?
@@ -18,7 +19,7 @@ def search_public(media):
     cache_search["title"] = cache_search["titles"][0]
     cache_search["language"] = cache_search["languages"][0]
     #  Wtf, why do we need to use __dict__ here? And also, why is it stuck when we use media directly?
-    response = requests.get(url, json=cache_search)
+    response = await get_http_client().get(url, json=cache_search)
     return response.json()
 
 
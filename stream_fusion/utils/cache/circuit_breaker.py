@@ -0,0 +1,45 @@
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of a backend from the outcome of real calls.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    are refused without touching the backend. Once ``reset_timeout`` seconds
+    have passed, a single probe is let through: its success closes the circuit,
+    its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        # Restarting the clock on each probe lets another one through if a
+        # probe never reports back (e.g. its request was cancelled).
+        now = time.monotonic()
+        if now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.opened_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
@@ -0,0 +1,144 @@
+import base64
+import importlib
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+import jsonpickle
+import orjson
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Every value written by CacheCodec starts with MAGIC, then the format version
+# and the compression id. Anything else is a legacy jsonpickle entry.
+MAGIC = b"SF"
+FORMAT_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+
+TYPE_KEY = "__type__"
+DATA_KEY = "__data__"
+
+# Only these classes are rebuilt when reading tagged objects back from Redis.
+ALLOWED_TYPES = frozenset(
+    {
+        "stream_fusion.utils.models.movie.Movie",
+        "stream_fusion.utils.models.series.Series",
+        "stream_fusion.web.root.search.schemas.Stream",
+    }
+)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+COMPRESSORS: Dict[int, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    0: ("none", lambda data: data, lambda data: data),
+    1: ("zlib", lambda data: zlib.compress(data, 3), zlib.decompress),
+}
+if zstandard is not None:
+    COMPRESSORS[2] = ("zstd", _zstd_compress, _zstd_decompress)
+
+COMPRESSION_IDS = {name: compression_id for compression_id, (name, _, _) in COMPRESSORS.items()}
+
+
+class CacheCodec:
+    """
+    Versioned serialization of RedisCache values.
+
+    Values are encoded with orjson and compressed once they exceed a size
+    threshold. Objects orjson does not know are tagged with their class, which
+    has to be listed in ``ALLOWED_TYPES`` to be rebuilt on read. Entries written
+    with jsonpickle before this format existed are still decoded.
+    """
+
+    def __init__(
+        self,
+        compression: str = settings.redis_compression,
+        compression_threshold: int = settings.redis_compression_threshold,
+    ):
+        if compression not in COMPRESSION_IDS:
+            logger.warning(
+                f"CacheCodec: Compression {compression} is not available, using zlib"
+            )
+            compression = "zlib"
+        self.compression_id = COMPRESSION_IDS[compression]
+        self.compression_threshold = compression_threshold
+        self._types: Dict[str, type] = {}
+
+    @staticmethod
+    def _type_path(cls: type) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, bytes):
+            return {TYPE_KEY: "bytes", DATA_KEY: base64.b64encode(obj).decode()}
+        if isinstance(obj, (set, frozenset, tuple)):
+            return list(obj)
+        type_path = self._type_path(type(obj))
+        if type_path not in ALLOWED_TYPES:
+            raise TypeError(f"Type {type_path} is not allowed in cache")
+        if hasattr(obj, "model_dump"):
+            return {TYPE_KEY: type_path, DATA_KEY: obj.model_dump()}
+        return {TYPE_KEY: type_path, DATA_KEY: vars(obj)}
+
+    def _load_type(self, type_path: str) -> type:
+        cls = self._types.get(type_path)
+        if cls is None:
+            if type_path not in ALLOWED_TYPES:
+                raise TypeError(f"Type {type_path} is not allowed in cache")
+            module_name, _, name = type_path.rpartition(".")
+            cls = getattr(importlib.import_module(module_name), name)
+            self._types[type_path] = cls
+        return cls
+
+    def _restore(self, obj: Any) -> Any:
+        if isinstance(obj, list):
+            return [self._restore(item) for item in obj]
+        if not isinstance(obj, dict):
+            return obj
+        if TYPE_KEY in obj and DATA_KEY in obj and len(obj) == 2:
+            type_path, data = obj[TYPE_KEY], self._restore(obj[DATA_KEY])
+            if type_path == "bytes":
+                return base64.b64decode(data)
+            cls = self._load_type(type_path)
+            if hasattr(cls, "model_validate"):
+                return cls.model_validate(data)
+            instance = cls.__new__(cls)
+            instance.__dict__.update(data)
+            return instance
+        return {key: self._restore(value) for key, value in obj.items()}
+
+    def encode(self, value: Any) -> bytes:
+        payload = orjson.dumps(value, default=self._default, option=orjson.OPT_NON_STR_KEYS)
+        compression_id = 0
+        if len(payload) >= self.compression_threshold:
+            compression_id = self.compression_id
+            payload = COMPRESSORS[compression_id][1](payload)
+        return MAGIC + bytes((FORMAT_VERSION, compression_id)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        if not data.startswith(MAGIC):
+            return jsonpickle.decode(data)
+
+        version, compression_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache format version {version}")
+        if compression_id not in COMPRESSORS:
+            raise ValueError(f"Unsupported cache compression {compression_id}")
+
+        payload = COMPRESSORS[compression_id][2](data[HEADER_SIZE:])
+        value = orjson.loads(payload)
+        # Only walk the decoded value when it actually holds tagged objects.
+        if TYPE_KEY.encode() in payload:
+            value = self._restore(value)
+        return value
@@ -1,14 +1,53 @@
 import asyncio
 import inspect
-import jsonpickle
 import time
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 import hashlib
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 from stream_fusion.settings import settings
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
 from stream_fusion.utils.cache.cache_base import CacheBase
+from stream_fusion.utils.cache.circuit_breaker import CLOSED, CircuitBreaker
+from stream_fusion.utils.cache.codecs import CacheCodec
+from stream_fusion.utils.cache.memory_cache import INVALIDATE_ALL, INVALIDATION_CHANNEL, get_memory_cache
+
+# Shared by every RedisCache of the worker, see init_redis_pool().
+_redis_pool: Optional[ConnectionPool] = None
+redis_circuit_breaker = CircuitBreaker()
+
+
+class RedisCircuitOpenError(RedisConnectionError):
+    """Raised instead of calling Redis while the circuit breaker is open."""
+
+
+def get_redis_url() -> str:
+    return f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
+
+
+def init_redis_pool() -> ConnectionPool:
+    """Create the worker wide async connection pool used by every RedisCache."""
+    global _redis_pool
+    _redis_pool = ConnectionPool.from_url(
+        get_redis_url(),
+        max_connections=settings.redis_max_connections,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+    )
+    return _redis_pool
+
+
+def get_redis_pool() -> Optional[ConnectionPool]:
+    return _redis_pool
+
+
+async def close_redis_pool() -> None:
+    global _redis_pool
+    if _redis_pool is not None:
+        await _redis_pool.disconnect()
+        _redis_pool = None
+
 
 class RedisCache(CacheBase):
     def __init__(self, config):
@@ -16,37 +55,56 @@ class RedisCache(CacheBase):
         self.redis_host = settings.redis_host
         self.redis_port = settings.redis_port
         self.redis_db = settings.redis_db
-        self.redis_url = f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
+        self.redis_url = get_redis_url()
         self._redis_client = None
+        self._owns_client = False
         self.media_expiration = settings.redis_expiration
+        self.codec = CacheCodec()
+        self.memory_cache = get_memory_cache()
+        self.circuit_breaker = redis_circuit_breaker
 
     async def get_redis_client(self):
         if not self._redis_client:
             try:
-                self._redis_client = Redis.from_url(
-                    self.redis_url,
-                    max_connections=10
-                )
+                pool = get_redis_pool()
+                if pool is not None:
+                    self._redis_client = Redis(connection_pool=pool)
+                    self._owns_client = False
+                else:
+                    # Outside of the application (scripts, workers), fall back to a private pool.
+                    self._redis_client = Redis.from_url(
+                        self.redis_url,
+                        max_connections=10
+                    )
+                    self._owns_client = True
             except Exception as e:
                 self.logger.error(f"RedisCache: Failed to create Redis client: {e}")
                 self._redis_client = None
         return self._redis_client
     
     async def reconnect(self):
+        if self._owns_client and self._redis_client:
+            await self._redis_client.aclose()
         self._redis_client = None
         return await self.get_redis_client()
 
     async def execute_with_retry(self, operation, *args, **kwargs):
+        if not self.circuit_breaker.allow_request():
+            raise RedisCircuitOpenError("Redis circuit breaker is open")
+
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                return await operation(*args, **kwargs)
-            except ConnectionError:
+                result = await operation(*args, **kwargs)
+                self.circuit_breaker.record_success()
+                return result
+            except (RedisConnectionError, RedisTimeoutError):
                 if attempt < max_retries - 1:
                     self.logger.warning(f"RedisCache: Connection lost. Attempting reconnection (attempt {attempt + 1}/{max_retries})")
                     await self.reconnect()
                 else:
                     self.logger.error("RedisCache: Max retries reached. Unable to reconnect to Redis.")
+                    self.circuit_breaker.record_failure()
                     raise
 
     async def get_list(self, key: str) -> List[Any]:
@@ -79,6 +137,7 @@ class RedisCache(CacheBase):
         try:
             client = await self.get_redis_client()
             await client.flushdb()
+            await self._invalidate(client, INVALIDATE_ALL)
         except Exception as e:
             self.logger.error(f"RedisCache: Error clearing cache: {e}")
 
@@ -86,14 +145,14 @@ class RedisCache(CacheBase):
         self.logger.debug(f"RedisCache: Entering get_or_set for function: {func.__name__}")
         start_time = time.time()
 
-        if not await self.can_cache():
-            self.logger.debug("RedisCache: Cache is not available, executing function directly")
-            return await self._execute_func(func, *args, **kwargs)
-
         key = self.generate_key(func.__name__, *args, **kwargs)
         self.logger.debug(f"RedisCache: Generated cache key: {key}")
 
-        cached_result = await self.get(key)
+        try:
+            cached_result = await self.get(key)
+        except RedisConnectionError as e:
+            self.logger.debug(f"RedisCache: Cache is not available ({e}), executing function directly")
+            return await self._execute_func(func, *args, **kwargs)
         self.logger.debug(f"RedisCache: Attempted to get result from cache. Found: {cached_result is not None}")
 
         if cached_result is not None:
@@ -103,7 +162,10 @@ class RedisCache(CacheBase):
         self.logger.debug(f"RedisCache: Cache miss for key: {key}. Executing function.")
         result = await self._execute_func(func, *args, **kwargs)
         self.logger.debug(f"RedisCache: Function execution completed. Setting result in cache.")
-        await self.set(key, result)
+        try:
+            await self.set(key, result)
+        except RedisConnectionError as e:
+            self.logger.warning(f"RedisCache: Unable to cache result for key {key}: {e}")
 
         end_time = time.time()
         self.logger.debug(f"RedisCache: get_or_set completed in {end_time - start_time:.2f} seconds")
@@ -155,22 +217,46 @@ class RedisCache(CacheBase):
         return result
 
     async def can_cache(self) -> bool:
-        self.logger.debug("RedisCache: Checking if caching is possible")
+        # Redis is only pinged to probe it once the circuit breaker has opened,
+        # while it is closed the outcome of real calls is enough.
+        if self.circuit_breaker.state == CLOSED:
+            return True
+        if not self.circuit_breaker.allow_request():
+            return False
+        self.logger.debug("RedisCache: Probing Redis after failures")
         try:
             client = await self.get_redis_client()
             result = await client.ping()
             self.logger.debug(f"RedisCache: Redis ping result: {result}")
+            self.circuit_breaker.record_success()
             return result
         except Exception as e:
             self.logger.error(f"RedisCache: Unable to connect to Redis: {e}")
+            self.circuit_breaker.record_failure()
             return False
 
+    async def _invalidate(self, client, key: str) -> None:
+        if self.memory_cache is None:
+            return
+        self.memory_cache.evict(key)
+        try:
+            await client.publish(INVALIDATION_CHANNEL, self.memory_cache.invalidation_message(key))
+        except Exception as e:
+            self.logger.warning(f"RedisCache: Failed to publish invalidation for {key}: {e}")
+
     async def get(self, key: str) -> Any:
+        if self.memory_cache is not None:
+            cached_result = self.memory_cache.get(key)
+            if cached_result is not None:
+                return self.codec.decode(cached_result)
+
         async def get_operation():
             client = await self.get_redis_client()
             cached_result = await client.get(key)
             if cached_result:
-                return jsonpickle.decode(cached_result)
+                if self.memory_cache is not None:
+                    self.memory_cache.set(key, cached_result)
+                return self.codec.decode(cached_result)
             return None
 
         return await self.execute_with_retry(get_operation)
@@ -181,15 +267,67 @@ class RedisCache(CacheBase):
 
         async def set_operation():
             client = await self.get_redis_client()
-            cached_data = jsonpickle.encode(value)
-            return await client.set(key, cached_data, ex=expiration)
+            cached_data = self.codec.encode(value)
+            result = await client.set(key, cached_data, ex=expiration)
+            await self._invalidate(client, key)
+            if self.memory_cache is not None:
+                self.memory_cache.set(key, cached_data)
+            return result
 
         await self.execute_with_retry(set_operation)
 
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        """Get several keys in one round trip, ``None`` for the missing ones."""
+        results = [None] * len(keys)
+        missing = []
+        for index, key in enumerate(keys):
+            cached_result = self.memory_cache.get(key) if self.memory_cache is not None else None
+            if cached_result is not None:
+                results[index] = self.codec.decode(cached_result)
+            else:
+                missing.append(index)
+        if not missing:
+            return results
+
+        async def get_many_operation():
+            client = await self.get_redis_client()
+            return await client.mget([keys[index] for index in missing])
+
+        for index, cached_result in zip(missing, await self.execute_with_retry(get_many_operation)):
+            if cached_result:
+                if self.memory_cache is not None:
+                    self.memory_cache.set(keys[index], cached_result)
+                results[index] = self.codec.decode(cached_result)
+        return results
+
+    async def set_many(self, values: Dict[str, Any], expiration: int = None) -> None:
+        """Set several keys with the same expiration in one round trip."""
+        if not values:
+            return
+        if expiration is None:
+            expiration = self.media_expiration
+        encoded = {key: self.codec.encode(value) for key, value in values.items()}
+
+        async def set_many_operation():
+            client = await self.get_redis_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for key, cached_data in encoded.items():
+                    pipe.set(key, cached_data, ex=expiration)
+                    if self.memory_cache is not None:
+                        pipe.publish(INVALIDATION_CHANNEL, self.memory_cache.invalidation_message(key))
+                await pipe.execute()
+
+        await self.execute_with_retry(set_many_operation)
+        if self.memory_cache is not None:
+            for key, cached_data in encoded.items():
+                self.memory_cache.set(key, cached_data)
+
     async def delete(self, key: str) -> bool:
         async def delete_operation():
             client = await self.get_redis_client()
-            return bool(await client.delete(key))
+            deleted = bool(await client.delete(key))
+            await self._invalidate(client, key)
+            return deleted
 
         return await self.execute_with_retry(delete_operation)
 
@@ -215,8 +353,10 @@ class RedisCache(CacheBase):
         return await self.execute_with_retry(update_expiration_operation)
 
     async def close(self):
-        if self._redis_client:
-            await self._redis_client.close()
+        # Clients on the shared pool only borrow connections, the pool outlives them.
+        if self._redis_client and self._owns_client:
+            await self._redis_client.aclose()
+        self._redis_client = None
 
     async def __aenter__(self):
         return self
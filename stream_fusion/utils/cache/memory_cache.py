@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+from typing import Optional
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+INVALIDATION_CHANNEL = "stream_fusion:cache:invalidate"
+# Sent instead of a key when every worker should drop its whole L1 cache.
+INVALIDATE_ALL = "*"
+
+
+class MemoryCache:
+    """
+    Per worker L1 cache in front of Redis.
+
+    It holds the encoded bytes read from or written to Redis, so every read
+    decodes a fresh object and the size limit is enforced in bytes. Writes from
+    any worker are broadcast on ``INVALIDATION_CHANNEL`` and evict the key from
+    the other workers' caches.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.worker_id = uuid.uuid4().hex
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=len)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            self._cache[key] = value
+        except ValueError:
+            # Larger than the whole cache, keep it in Redis only.
+            self._cache.pop(key, None)
+
+    def evict(self, key: str) -> None:
+        if key == INVALIDATE_ALL:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "worker_id": self.worker_id,
+            "entries": len(self._cache),
+            "size_bytes": self._cache.currsize,
+            "max_bytes": self._cache.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def invalidation_message(self, key: str) -> str:
+        return f"{self.worker_id}:{key}"
+
+    async def listen_for_invalidations(self, redis_url: str) -> None:
+        """Evict keys written by other workers until cancelled."""
+        while True:
+            client = Redis.from_url(redis_url)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Messages may have been missed while we were not subscribed.
+                self._cache.clear()
+                logger.info(f"MemoryCache: Listening for invalidations on {INVALIDATION_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    worker_id, _, key = message["data"].decode().partition(":")
+                    if worker_id != self.worker_id:
+                        self.evict(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"MemoryCache: Invalidation listener error, retrying in 5s: {e}")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+_memory_cache: Optional[MemoryCache] = None
+_listener_task: Optional[asyncio.Task] = None
+
+
+def get_memory_cache() -> Optional[MemoryCache]:
+    return _memory_cache
+
+
+def init_memory_cache(redis_url: str) -> Optional[MemoryCache]:
+    """Create the worker's L1 cache and start its invalidation listener, if enabled."""
+    global _memory_cache, _listener_task
+    if not settings.redis_l1_enabled:
+        return None
+    _memory_cache = MemoryCache(settings.redis_l1_max_bytes, settings.redis_l1_ttl)
+    _listener_task = asyncio.create_task(_memory_cache.listen_for_invalidations(redis_url))
+    return _memory_cache
+
+
+async def close_memory_cache() -> None:
+    global _memory_cache, _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    _memory_cache = None
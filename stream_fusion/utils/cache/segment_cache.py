@@ -0,0 +1,131 @@
+import asyncio
+import mmap
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+from cachetools import LRUCache
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+# A block fetcher returns the block bytes and the total size of the file.
+BlockFetcher = Callable[[], Awaitable[Tuple[bytes, int]]]
+
+
+class SegmentCache:
+    """
+    Fixed-size blocks of proxied files in a bounded, memory-mapped file.
+
+    Blocks are keyed by ``(file_key, block)`` where ``file_key`` identifies the
+    torrent file (info hash and file index), not the debrid link, so viewers
+    of the same file share them whoever's link fetched them. Every block has a
+    slot in the mapped file and the least recently used block is evicted when
+    no slot is free. A block requested by several viewers while it is being
+    fetched is only fetched once.
+
+    The store lives in the worker process, each worker has its own file.
+    """
+
+    def __init__(self, path: str, max_bytes: int, block_size: int):
+        self.path = path
+        self.block_size = block_size
+        self.slots = max(1, max_bytes // block_size)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "w+b")
+        self._file.truncate(self.slots * block_size)
+        self._mmap = mmap.mmap(self._file.fileno(), self.slots * block_size)
+        self._index: OrderedDict = OrderedDict()
+        self._free = list(range(self.slots))
+        self._pending = {}
+        self._sizes = LRUCache(maxsize=10000)
+        self.hits = 0
+        self.misses = 0
+
+    def get_size(self, file_key: str) -> Optional[int]:
+        return self._sizes.get(file_key)
+
+    async def get_block(self, file_key: str, block: int, fetch: BlockFetcher) -> bytes:
+        key = (file_key, block)
+        entry = self._index.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._index.move_to_end(key)
+            slot, length = entry
+            offset = slot * self.block_size
+            return self._mmap[offset : offset + length]
+
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # A viewer going away must not cancel a fetch the others are waiting for.
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key, fetch: BlockFetcher) -> bytes:
+        data, total_size = await fetch()
+        self._sizes[key[0]] = total_size
+        self._store(key, data)
+        return data
+
+    def _store(self, key, data: bytes) -> None:
+        if not self._free:
+            _, (slot, _) = self._index.popitem(last=False)
+            self._free.append(slot)
+        slot = self._free.pop()
+        offset = slot * self.block_size
+        self._mmap[offset : offset + len(data)] = data
+        self._index[key] = (slot, len(data))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "blocks": len(self._index),
+            "max_blocks": self.slots,
+            "block_size": self.block_size,
+            "fetching": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+        self._mmap.close()
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+_segment_cache: Optional[SegmentCache] = None
+
+
+def get_segment_cache() -> Optional[SegmentCache]:
+    return _segment_cache
+
+
+def init_segment_cache() -> Optional[SegmentCache]:
+    """Create the worker's segment store, if enabled."""
+    global _segment_cache
+    if not settings.proxy_segment_cache:
+        return None
+    path = os.path.join(settings.proxy_segment_cache_path, f"segments-{os.getpid()}.bin")
+    _segment_cache = SegmentCache(
+        path, settings.proxy_segment_cache_size, settings.proxy_segment_block_size
+    )
+    logger.info(
+        f"SegmentCache: {_segment_cache.slots} blocks of {_segment_cache.block_size} bytes in {path}"
+    )
+    return _segment_cache
+
+
+def close_segment_cache() -> None:
+    global _segment_cache
+    if _segment_cache is not None:
+        _segment_cache.close()
+        _segment_cache = None
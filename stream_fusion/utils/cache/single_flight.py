@@ -0,0 +1,148 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+
+# Only delete the lock if it still belongs to us, it may have expired and been
+# taken over by another leader in the meantime.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+DONE = "done"
+FAILED = "failed"
+
+
+async def wait_for_message(pubsub, timeout: float) -> Optional[str]:
+    """Wait up to ``timeout`` seconds for the next message on a subscribed pubsub."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        message = await pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=remaining
+        )
+        if message is not None and message["type"] == "message":
+            data = message["data"]
+            return data.decode() if isinstance(data, bytes) else data
+
+
+class SingleFlight:
+    """
+    Cluster wide single-flight on top of Redis.
+
+    The first caller for a key takes a ``SET NX`` lock and runs ``compute``,
+    which is expected to store its result in the cache. Every other caller
+    subscribes to the key's channel and, once the leader publishes, reads the
+    result back with ``load``. If the leader fails or does not answer in time,
+    waiters fall back to running ``compute`` themselves.
+    """
+
+    def __init__(
+        self,
+        redis_cache: RedisCache,
+        timeout: float = settings.search_single_flight_timeout,
+        prefix: str = "singleflight",
+    ):
+        self.redis_cache = redis_cache
+        self.timeout = timeout
+        self.prefix = prefix
+        self.logger = logger
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}:lock:{key}"
+
+    def _channel(self, key: str) -> str:
+        return f"{self.prefix}:done:{key}"
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        try:
+            client = await self.redis_cache.get_redis_client()
+            token = uuid.uuid4().hex
+            acquired = await client.set(
+                self._lock_key(key), token, nx=True, px=int(self.timeout * 1000)
+            )
+        except Exception as e:
+            self.logger.warning(f"SingleFlight: Unable to take lock for {key}: {e}")
+            return await compute()
+
+        if acquired:
+            return await self._lead(client, key, token, compute)
+        return await self._follow(client, key, compute, load)
+
+    async def run_if_idle(self, key: str, compute: Callable[[], Awaitable[Any]]) -> bool:
+        """Run ``compute`` as leader unless a flight is already running for ``key``."""
+        try:
+            client = await self.redis_cache.get_redis_client()
+            token = uuid.uuid4().hex
+            acquired = await client.set(
+                self._lock_key(key), token, nx=True, px=int(self.timeout * 1000)
+            )
+        except Exception as e:
+            self.logger.warning(f"SingleFlight: Unable to take lock for {key}: {e}")
+            return False
+
+        if not acquired:
+            self.logger.debug(f"SingleFlight: Flight already running for {key}, skipping")
+            return False
+        await self._lead(client, key, token, compute)
+        return True
+
+    async def _lead(self, client, key: str, token: str, compute) -> Any:
+        self.logger.debug(f"SingleFlight: Leading flight for {key}")
+        status = FAILED
+        try:
+            result = await compute()
+            status = DONE
+            return result
+        finally:
+            try:
+                await client.publish(self._channel(key), status)
+                await client.eval(RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+            except Exception as e:
+                self.logger.warning(f"SingleFlight: Unable to release flight for {key}: {e}")
+
+    async def _follow(self, client, key: str, compute, load) -> Any:
+        self.logger.info(f"SingleFlight: Flight already running for {key}, waiting for its result")
+        status = None
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(key))
+            # The leader may have finished between our lock attempt and the
+            # subscription, in which case no message will ever come.
+            if await client.exists(self._lock_key(key)):
+                status = await wait_for_message(pubsub, self.timeout)
+            else:
+                status = DONE
+        except Exception as e:
+            self.logger.warning(f"SingleFlight: Error while waiting for {key}: {e}")
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+        if status == DONE:
+            result = await load()
+            if result is not None:
+                self.logger.success(f"SingleFlight: Reusing result of flight {key}")
+                return result
+
+        self.logger.warning(
+            f"SingleFlight: No result from flight {key} ({status or 'timeout'}), running it locally"
+        )
+        return await compute()
@@ -1,9 +1,11 @@
 from stream_fusion.utils.debrid.alldebrid import AllDebrid
+from stream_fusion.utils.debrid.availability_cache import AvailabilityCache
 from stream_fusion.utils.debrid.base_debrid import BaseDebrid
 from stream_fusion.utils.debrid.realdebrid import RealDebrid
 from stream_fusion.utils.debrid.premiumize import Premiumize
+from stream_fusion.utils.debrid.torrent_index import TorrentIndex
 from stream_fusion.utils.debrid.get_debrid_service import get_all_debrid_services
 
 
 
-__all__ = ["AllDebrid", "BaseDebrid", "RealDebrid", "Premiumize", "get_all_debrid_services"]
\ No newline at end of file
+__all__ = ["AllDebrid", "AvailabilityCache", "BaseDebrid", "RealDebrid", "Premiumize", "TorrentIndex", "get_all_debrid_services"]
\ No newline at end of file
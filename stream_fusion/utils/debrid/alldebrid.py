@@ -16,6 +16,11 @@ class AllDebrid(BaseDebrid):
         self.base_url = f"{settings.ad_base_url}/{settings.ad_api_version}/"
         self.agent = settings.ad_user_app
 
+    def get_account_id(self):
+        if settings.ad_unique_account:
+            return self._hash_credential(settings.ad_token)
+        return self._hash_credential(self.config["ADToken"])
+
     def get_headers(self):
         if settings.ad_unique_account:
             if not settings.proxied_link:
@@ -30,40 +35,43 @@ class AllDebrid(BaseDebrid):
         else:
             return {"Authorization": f"Bearer {self.config["ADToken"]}"}
 
-    def add_magnet(self, magnet, ip=None):
+    async def add_magnet(self, magnet, ip=None):
         url = f"{self.base_url}magnet/upload?agent={self.agent}"
         data = {"magnets[]": magnet}
-        return self.json_response(url, method='post', headers=self.get_headers(), data=data)
+        return await self.json_response(url, method='post', headers=self.get_headers(), data=data)
 
-    def add_torrent(self, torrent_file, ip=None):
+    async def add_torrent(self, torrent_file, ip=None):
         url = f"{self.base_url}magnet/upload/file?agent={self.agent}"
         files = {"files[]": (str(uuid.uuid4()) + ".torrent", torrent_file, 'application/x-bittorrent')}
-        return self.json_response(url, method='post', headers=self.get_headers(), files=files)
+        return await self.json_response(url, method='post', headers=self.get_headers(), files=files)
 
-    def check_magnet_status(self, id, ip=None):
+    async def check_magnet_status(self, id, ip=None):
         url = f"{self.base_url}magnet/status?agent={self.agent}&id={id}"
-        return self.json_response(url, method='get', headers=self.get_headers())
+        return await self.json_response(url, method='get', headers=self.get_headers())
 
-    def unrestrict_link(self, link, ip=None):
+    async def unrestrict_link(self, link, ip=None):
         url = f"{self.base_url}link/unlock?agent={self.agent}&link={link}"
-        return self.json_response(url, method='get', headers=self.get_headers())
+        return await self.json_response(url, method='get', headers=self.get_headers())
 
-    def get_stream_link(self, query, config, ip=None):
+    async def get_stream_link(self, query, config, ip=None):
         magnet = query['magnet']
         stream_type = query['type']
         torrent_download = unquote(query["torrent_download"]) if query["torrent_download"] is not None else None
 
-        torrent_id = self.add_magnet_or_torrent(magnet, torrent_download, ip)
+        torrent_id = await self.add_magnet_or_torrent(magnet, torrent_download, ip)
         logger.info(f"AllDebrid: Torrent ID: {torrent_id}")
 
-        if not self.wait_for_ready_status(
-                lambda: self.check_magnet_status(torrent_id, ip)["data"]["magnets"]["status"] == "Ready"):
+        async def is_ready():
+            status = await self.check_magnet_status(torrent_id, ip)
+            return status["data"]["magnets"]["status"] == "Ready"
+
+        if not await self.wait_for_ready_status(is_ready):
             logger.error("AllDebrid: Torrent not ready, caching in progress.")
             return settings.no_cache_video_url
         logger.info("AllDebrid: Torrent is ready.")
 
         logger.info(f"AllDebrid: Retrieving data for torrent ID: {torrent_id}")
-        data = self.check_magnet_status(torrent_id, ip)["data"]
+        data = (await self.check_magnet_status(torrent_id, ip))["data"]
         logger.info(f"AllDebrid: Data retrieved for torrent ID")
 
         link = settings.no_cache_video_url
@@ -95,7 +103,7 @@ class AllDebrid(BaseDebrid):
 
         logger.info(f"AllDebrid: Retrieved link: {link}")
 
-        unlocked_link_data = self.unrestrict_link(link, ip)
+        unlocked_link_data = await self.unrestrict_link(link, ip)
 
         if not unlocked_link_data:
             logger.error("AllDebrid: Failed to unlock link.")
@@ -105,20 +113,41 @@ class AllDebrid(BaseDebrid):
 
         return unlocked_link_data["data"]["link"]
 
-    def get_availability_bulk(self, hashes_or_magnets, ip=None):
-        if len(hashes_or_magnets) == 0:
-            logger.info("AllDebrid: No hashes to be sent.")
-            return dict()
-
+    async def _get_availability_batch(self, hashes_or_magnets, ip=None):
         url = f"{self.base_url}magnet/instant?agent={self.agent}"
         data = {"magnets[]": hashes_or_magnets}
-        return self.json_response(url, method='post', headers=self.get_headers(), data=data)
-
-    def add_magnet_or_torrent(self, magnet, torrent_download=None, ip=None):
+        return await self.json_response(url, method='post', headers=self.get_headers(), data=data)
+
+    def _merge_availability_batches(self, responses):
+        magnets = []
+        for response in responses:
+            if response.get("status") != "success":
+                logger.error(f"AllDebrid: Availability batch error: {response}")
+                continue
+            magnets.extend(response["data"]["magnets"])
+        if not magnets and responses:
+            # Every batch failed, let the caller see the error.
+            return responses[0]
+        return {"status": "success", "data": {"magnets": magnets}}
+
+    def _split_availability_batch(self, hashes_or_magnets, response):
+        if response.get("status") != "success":
+            return {}
+        magnets = {magnet["hash"]: magnet for magnet in response["data"]["magnets"] if "hash" in magnet}
+        return {
+            info_hash: magnets[info_hash] if magnets[info_hash].get("instant") else False
+            for info_hash in hashes_or_magnets
+            if info_hash in magnets
+        }
+
+    def build_availability_response(self, availability):
+        return {"status": "success", "data": {"magnets": list(availability.values())}}
+
+    async def add_magnet_or_torrent(self, magnet, torrent_download=None, ip=None):
         torrent_id = ""
         if torrent_download is None:
             logger.info(f"AllDebrid: Adding magnet")
-            magnet_response = self.add_magnet(magnet, ip)
+            magnet_response = await self.add_magnet(magnet, ip)
             logger.info(f"AllDebrid: Add magnet response received")
 
             if not magnet_response or "status" not in magnet_response or magnet_response["status"] != "success":
@@ -127,11 +156,11 @@ class AllDebrid(BaseDebrid):
             torrent_id = magnet_response["data"]["magnets"][0]["id"]
         else:
             logger.info(f"AllDebrid: Downloading torrent file")
-            torrent_file = self.download_torrent_file(torrent_download)
+            torrent_file = await self.download_torrent_file(torrent_download)
             logger.info(f"AllDebrid: Torrent file downloaded")
 
             logger.info(f"AllDebrid: Adding torrent file")
-            upload_response = self.add_torrent(torrent_file, ip)
+            upload_response = await self.add_torrent(torrent_file, ip)
             logger.info(f"AllDebrid: Add torrent file response received")
 
             if not upload_response or "status" not in upload_response or upload_response["status"] != "success":
@@ -0,0 +1,81 @@
+from typing import List
+
+from redis.exceptions import RedisError
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.debrid.base_debrid import BaseDebrid
+
+
+class AvailabilityCache:
+    """
+    Instant availability shared by every user of a debrid service.
+
+    Each ``(service, info_hash)`` is stored on its own key with the part of the
+    debrid response ``TorrentSmartContainer`` consumes, or ``False`` when the
+    torrent is not cached on the service. Only hashes missing from Redis are
+    sent to the debrid.
+    """
+
+    def __init__(
+        self,
+        redis_cache: RedisCache,
+        available_ttl: int = settings.debrid_availability_ttl,
+        unavailable_ttl: int = settings.debrid_unavailability_ttl,
+    ):
+        self.redis_cache = redis_cache
+        self.available_ttl = available_ttl
+        self.unavailable_ttl = unavailable_ttl
+        self.logger = logger
+
+    @staticmethod
+    def _key(debrid: BaseDebrid, info_hash: str) -> str:
+        return f"availability:{type(debrid).__name__}:{info_hash.lower()}"
+
+    async def get_availability_bulk(self, debrid: BaseDebrid, hashes: List[str], ip=None):
+        """Same response as ``debrid.get_availability_bulk``, built from the cache where possible."""
+        if not debrid.availability_cacheable or len(hashes) == 0:
+            return await debrid.get_availability_bulk(hashes, ip)
+
+        service = type(debrid).__name__
+        keys = [self._key(debrid, info_hash) for info_hash in hashes]
+        try:
+            cached = await self.redis_cache.get_many(keys)
+        except RedisError as e:
+            self.logger.warning(f"AvailabilityCache: Cache unavailable for {service}: {e}")
+            return await debrid.get_availability_bulk(hashes, ip)
+
+        availability = {}
+        missing = []
+        for info_hash, payload in zip(hashes, cached):
+            if payload is None:
+                missing.append(info_hash)
+            else:
+                availability[info_hash] = payload
+        self.logger.info(
+            f"AvailabilityCache: {len(availability)}/{len(hashes)} hashes cached for {service}, checking {len(missing)}"
+        )
+
+        if missing:
+            fetched = await debrid.get_availability_by_hash(missing, ip)
+            availability.update(fetched)
+            await self._store(debrid, fetched)
+
+        available = {info_hash: payload for info_hash, payload in availability.items() if payload}
+        if not available:
+            return None
+        return debrid.build_availability_response(available)
+
+    async def _store(self, debrid: BaseDebrid, availability: dict) -> None:
+        available, unavailable = {}, {}
+        for info_hash, payload in availability.items():
+            if payload:
+                available[self._key(debrid, info_hash)] = payload
+            else:
+                unavailable[self._key(debrid, info_hash)] = False
+        try:
+            await self.redis_cache.set_many(available, expiration=self.available_ttl)
+            await self.redis_cache.set_many(unavailable, expiration=self.unavailable_ttl)
+        except RedisError as e:
+            self.logger.warning(f"AvailabilityCache: Unable to store availability: {e}")
@@ -1,80 +1,88 @@
-from collections import deque
+import asyncio
+import hashlib
 import json
 import time
 
-import requests
+import aiohttp
 
 from stream_fusion.logging_config import logger
+from stream_fusion.services.http import get_http_client
+from stream_fusion.utils.debrid.rate_limiter import (
+    DebridRateLimitExceeded,
+    debrid_rate_limiter,
+    get_retry_after,
+)
 from stream_fusion.settings import settings
 
 
 class BaseDebrid:
+    # Number of hashes sent in a single instant availability request.
+    availability_batch_size = 100
+    # Whether availability responses can be split per hash for the shared availability cache.
+    availability_cacheable = True
+    # Number of torrents requested per page when listing the user's torrents.
+    torrent_list_page_size = 1000
+
     def __init__(self, config):
         self.config = config
         self.logger = logger
-        self.__session = self._create_session()
+        self.__http = get_http_client()
+        self.__use_proxy = self._use_proxy()
 
-        # Rate limiters
+        # Rate limits, shared by every request made with the same account
         self.global_limit = 250
         self.global_period = 60
         self.torrent_limit = 1
         self.torrent_period = 1
 
-        self.global_requests = deque()
-        self.torrent_requests = deque()
-
-    def _create_session(self):
-        session = requests.Session()
+    def _use_proxy(self):
         if settings.proxy_url:
             self.logger.info(f"BaseDebrid: Using proxy: {settings.proxy_url}")
-            session.proxies = {
-                "http": str(settings.proxy_url),
-                "https": str(settings.proxy_url),
-            }
-        return session
-
-    def _rate_limit(self, requests_queue, limit, period):
-        current_time = time.time()
-
-        while requests_queue and requests_queue[0] <= current_time - period:
-            requests_queue.popleft()
-
-        if len(requests_queue) >= limit:
-            sleep_time = requests_queue[0] - (current_time - period)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-
-        requests_queue.append(time.time())
+            return True
+        return False
 
-    def _global_rate_limit(self):
-        self._rate_limit(self.global_requests, self.global_limit, self.global_period)
+    async def _rate_limit(self, endpoint, limit, period):
+        await debrid_rate_limiter.acquire(
+            type(self).__name__, self.get_account_id(), endpoint, limit, period
+        )
 
-    def _torrent_rate_limit(self):
-        self._rate_limit(self.torrent_requests, self.torrent_limit, self.torrent_period)
+    async def _global_rate_limit(self):
+        await self._rate_limit("global", self.global_limit, self.global_period)
 
-    def json_response(self, url, method="get", data=None, headers=None, files=None):
-        self._global_rate_limit()
-        if "torrents" in url:
-            self._torrent_rate_limit()
+    async def _torrent_rate_limit(self):
+        await self._rate_limit("torrents", self.torrent_limit, self.torrent_period)
 
+    async def json_response(self, url, method="get", data=None, headers=None, files=None, empty=None):
+        # ``empty`` is returned for a successful response without content, None stands for a failure.
         max_attempts = 5
         for attempt in range(max_attempts):
+            # Every attempt waits for the account's limits, and for its backoff after a 429.
+            try:
+                await self._global_rate_limit()
+                if "torrents" in url:
+                    await self._torrent_rate_limit()
+            except DebridRateLimitExceeded as e:
+                self.logger.warning(f"BaseDebrid: Request dropped, {e}")
+                return None
             try:
                 if method == "get":
-                    response = self.__session.get(url, headers=headers)
+                    response = await self.__request("GET", url, headers=headers)
                 elif method == "post":
-                    response = self.__session.post(
-                        url, data=data, headers=headers, files=files
+                    response = await self.__request(
+                        "POST", url, data=data, headers=headers, files=files
                     )
                 elif method == "put":
-                    response = self.__session.put(url, data=data, headers=headers)
+                    response = await self.__request("PUT", url, data=data, headers=headers)
                 elif method == "delete":
-                    response = self.__session.delete(url, headers=headers)
+                    response = await self.__request("DELETE", url, headers=headers)
                 else:
                     raise ValueError(f"BaseDebrid: Unsupported HTTP method: {method}")
 
                 response.raise_for_status()
 
+                if not response.content:
+                    return empty
+
                 try:
                     return response.json()
                 except json.JSONDecodeError as json_err:
@@ -87,18 +95,20 @@ class BaseDebrid:
                         self.logger.info(
                             f"BaseDebrid: Retrying in {wait_time} seconds..."
                         )
-                        time.sleep(wait_time)
+                        await asyncio.sleep(wait_time)
                     else:
                         return None
 
-            except requests.exceptions.HTTPError as e:
-                status_code = e.response.status_code
+            except aiohttp.ClientResponseError as e:
+                status_code = e.status
                 if status_code == 429:
-                    wait_time = 2**attempt + 1
+                    wait_time = get_retry_after(e.headers, default=2**attempt + 1)
                     self.logger.warning(
                         f"BaseDebrid: Rate limit exceeded. Attempt {attempt + 1}/{max_attempts}. Waiting for {wait_time} seconds."
                     )
-                    time.sleep(wait_time)
+                    await debrid_rate_limiter.backoff(
+                        type(self).__name__, self.get_account_id(), wait_time
+                    )
                 elif 400 <= status_code < 500:
                     self.logger.error(
                         f"BaseDebrid: Client error occurred: {e}. Status code: {status_code}"
@@ -113,7 +123,7 @@ class BaseDebrid:
                         self.logger.info(
                             f"BaseDebrid: Retrying in {wait_time} seconds..."
                         )
-                        time.sleep(wait_time)
+                        await asyncio.sleep(wait_time)
                     else:
                         return None
                 else:
@@ -121,23 +131,23 @@ class BaseDebrid:
                         f"BaseDebrid: Unexpected HTTP error occurred: {e}. Status code: {status_code}"
                     )
                     return None
-            except requests.exceptions.ConnectionError as e:
+            except aiohttp.ClientConnectionError as e:
                 self.logger.error(f"BaseDebrid: Connection error occurred: {e}")
                 if attempt < max_attempts - 1:
                     wait_time = 2**attempt + 1
                     self.logger.info(f"BaseDebrid: Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     return None
-            except requests.exceptions.Timeout as e:
-                self.logger.error(f"BaseDebrid: Request timed out: {e}")
+            except asyncio.TimeoutError as e:
+                self.logger.error(f"BaseDebrid: Request timed out: {e!r}")
                 if attempt < max_attempts - 1:
                     wait_time = 2**attempt + 1
                     self.logger.info(f"BaseDebrid: Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     return None
-            except requests.exceptions.RequestException as e:
+            except aiohttp.ClientError as e:
                 self.logger.error(f"BaseDebrid: An unexpected error occurred: {e}")
                 return None
 
@@ -146,30 +156,124 @@ class BaseDebrid:
         )
         return None
 
-    def wait_for_ready_status(self, check_status_func, timeout=30, interval=5):
+    async def __request(self, method, url, **kwargs):
+        # Retries are handled by json_response so its backoff and logging stay in one place.
+        return await self.__http.request(
+            method, url, max_retries=0, use_proxy=self.__use_proxy, raise_for_status=False, **kwargs
+        )
+
+    async def wait_for_ready_status(self, check_status_func, timeout=30, interval=5):
         self.logger.info(f"BaseDebrid: Waiting for {timeout} seconds for caching.")
         start_time = time.time()
         while time.time() - start_time < timeout:
-            if check_status_func():
+            if await check_status_func():
                 self.logger.info("BaseDebrid: File is ready!")
                 return True
-            time.sleep(interval)
+            await asyncio.sleep(interval)
         self.logger.info(f"BaseDebrid: Waiting timed out.")
         return False
 
-    def download_torrent_file(self, download_url):
-        response = requests.get(download_url)
-        response.raise_for_status()
+    async def download_torrent_file(self, download_url):
+        response = await self.__http.get(download_url)
         return response.content
 
-    def get_stream_link(self, query, ip=None):
+    async def get_stream_link(self, query, ip=None):
+        raise NotImplementedError
+
+    def get_account_id(self):
+        """Stable identifier of the user's account, used to key per-account caches."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _hash_credential(credential):
+        return hashlib.sha256(str(credential).encode("utf-8")).hexdigest()[:32]
+
+    async def get_user_torrents_page(self, page):
+        """
+        One page of the user's torrents as dicts with ``hash``, ``id`` and
+        ``status``, an empty list past the last page. Raises TorrentListError
+        when the page could not be fetched.
+        """
         raise NotImplementedError
     
-    def add_magnet_or_torrent(self, magnet, torrent_download=None, ip=None):
+    async def add_magnet_or_torrent(self, magnet, torrent_download=None, ip=None):
+        raise NotImplementedError
+
+    async def add_magnet(self, magnet, ip=None):
+        raise NotImplementedError
+
+    def _get_availability_batches(self, hashes_or_magnets):
+        hashes_or_magnets = list(hashes_or_magnets)
+        return [
+            hashes_or_magnets[i : i + self.availability_batch_size]
+            for i in range(0, len(hashes_or_magnets), self.availability_batch_size)
+        ]
+
+    async def _gather_availability_batches(self, batches, ip=None):
+        responses = await asyncio.gather(
+            *(self._get_availability_batch(batch, ip) for batch in batches),
+            return_exceptions=True,
+        )
+        for batch, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"{type(self).__name__}: Availability batch failed: {response}")
+                response = self._failed_availability_batch(batch, response)
+            if response:
+                yield batch, response
+
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+        """
+        Check instant availability, split in ``availability_batch_size`` batches sent concurrently.
+
+        The batch responses are merged back into the shape of a single response.
+        """
+        if len(hashes_or_magnets) == 0:
+            self.logger.info(f"{type(self).__name__}: No hashes to be sent.")
+            return dict()
+
+        batches = self._get_availability_batches(hashes_or_magnets)
+        self.logger.info(
+            f"{type(self).__name__}: Checking availability for {len(hashes_or_magnets)} hashes in {len(batches)} batches"
+        )
+        batch_responses = [
+            response async for _, response in self._gather_availability_batches(batches, ip)
+        ]
+        if not batch_responses:
+            return None
+        return self._merge_availability_batches(batch_responses)
+
+    async def get_availability_by_hash(self, hashes_or_magnets, ip=None):
+        """
+        Check instant availability and return it per hash.
+
+        Available hashes map to their part of the response, as consumed by
+        ``TorrentSmartContainer``, unavailable ones to ``False``. Hashes of a
+        failed batch are left out since their availability is unknown.
+        """
+        availability = {}
+        batches = self._get_availability_batches(hashes_or_magnets)
+        async for batch, response in self._gather_availability_batches(batches, ip):
+            availability.update(self._split_availability_batch(batch, response))
+        return availability
+
+    async def _get_availability_batch(self, hashes_or_magnets, ip=None):
+        raise NotImplementedError
+
+    def _failed_availability_batch(self, hashes_or_magnets, error):
+        """
+        Response standing for a batch that raised ``error``, None to skip it.
+
+        Services with positional results must not skip a batch, the merged
+        results would no longer line up with the hashes.
+        """
+        return None
+
+    def _merge_availability_batches(self, responses):
         raise NotImplementedError
 
-    def add_magnet(self, magnet, ip=None):
+    def _split_availability_batch(self, hashes_or_magnets, response):
         raise NotImplementedError
 
-    def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    def build_availability_response(self, availability):
+        """Build a response from the available hashes of ``get_availability_by_hash``."""
         raise NotImplementedError
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import threading
+
+from cachetools import TTLCache
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+# The only parts of a user config a debrid client reads.
+DEBRID_CREDENTIAL_KEYS = ("apiKey", "RDToken", "ADToken", "TBToken", "debridKey")
+
+
+class DebridClientRegistry:
+    """
+    Debrid clients reused across requests, one per service and account.
+
+    A client holds nothing but its credentials and what is worth keeping
+    between requests, like the Real-Debrid access token. Requests share the
+    application's HTTP sessions, so their connections are kept alive whatever
+    the client. At most ``maxsize`` clients are kept and a client unused for
+    ``idle_ttl`` seconds is dropped.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.debrid_client_pool_size,
+        idle_ttl: int = settings.debrid_client_idle_ttl,
+    ):
+        self._clients = TTLCache(maxsize=maxsize, ttl=idle_ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(service_class, config) -> tuple:
+        credentials = {key: config.get(key) for key in DEBRID_CREDENTIAL_KEYS}
+        digest = hashlib.sha256(
+            json.dumps(credentials, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return service_class.__name__, digest
+
+    def get(self, service_class, config):
+        key = self._key(service_class, config)
+        with self._lock:
+            client = self._clients.get(key)
+        if client is None:
+            logger.debug(f"DebridClientRegistry: New {service_class.__name__} client")
+            client = service_class(config)
+        with self._lock:
+            # Stored again on every use, the idle time starts over.
+            self._clients[key] = client
+        return client
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._clients.expire()
+            return {"clients": len(self._clients), "max_clients": self._clients.maxsize}
+
+
+debrid_client_registry = DebridClientRegistry()
+
+
+def get_debrid_client(service_class, config):
+    """The pooled ``service_class`` client of the config's account."""
+    return debrid_client_registry.get(service_class, config)
@@ -1,6 +1,7 @@
 from fastapi.exceptions import HTTPException
 
 from stream_fusion.utils.debrid.alldebrid import AllDebrid
+from stream_fusion.utils.debrid.client_registry import get_debrid_client
 from stream_fusion.utils.debrid.realdebrid import RealDebrid
 from stream_fusion.utils.debrid.torbox import Torbox
 from stream_fusion.logging_config import logger
@@ -15,13 +16,13 @@ def get_all_debrid_services(config):
         return
     for service in services:
         if service == "Real-Debrid":
-            debrid_service.append(RealDebrid(config))
+            debrid_service.append(get_debrid_client(RealDebrid, config))
             logger.debug("Real-Debrid: service added to be use")
         if service == "AllDebrid":
-            debrid_service.append(AllDebrid(config))
+            debrid_service.append(get_debrid_client(AllDebrid, config))
             logger.debug("AllDebrid: service added to be use")
         if service == "TorBox":
-            debrid_service.append(Torbox(config))
+            debrid_service.append(get_debrid_client(Torbox, config))
             logger.debug("TorBox: service added to be use")
     if not debrid_service:
         raise HTTPException(status_code=500, detail="Invalid service configuration.")
@@ -37,11 +38,11 @@ def get_download_service(config):
         logger.error("No download service found in the user config.")
         return
     if service == "Real-Debrid":
-        return RealDebrid(config)
+        return get_debrid_client(RealDebrid, config)
     elif service == "AllDebrid":
-        return AllDebrid(config)
+        return get_debrid_client(AllDebrid, config)
     elif service == "TorBox":
-        return Torbox(config)
+        return get_debrid_client(Torbox, config)
     else:
         logger.error("Invalid service configuration return by stremio in the query.")
         raise HTTPException(status_code=500, detail="Invalid service configuration return by stremio.")
@@ -51,11 +52,11 @@ def get_debrid_service(config, service):
     if not service:
         service == settings.download_service
     if service == "RD":
-        return RealDebrid(config)
+        return get_debrid_client(RealDebrid, config)
     elif service == "AD":
-        return AllDebrid(config)
+        return get_debrid_client(AllDebrid, config)
     elif service == "TB":
-        return Torbox(config)
+        return get_debrid_client(Torbox, config)
     elif service == "DL":
         return get_download_service(config)
     else:
@@ -0,0 +1,134 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.redis.redis_config import create_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.single_flight import wait_for_message
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+# Final states are only kept for the waiters to read them, the link itself
+# is cached by get_stream_link.
+STATE_TTL = 30
+
+_background_tasks = set()
+
+
+class LinkResolver:
+    """
+    Resolves playback links in background jobs shared through Redis.
+
+    The first request for a stream takes the job lock and starts the
+    resolution in a task of its own, so it survives the request being
+    cancelled. The outcome is stored as the job state (``ready`` with the link
+    or ``failed``) and announced on the job's channel: every GET and HEAD for
+    the stream, on any worker, waits for that message instead of polling.
+    """
+
+    def __init__(
+        self,
+        redis_cache: RedisCache,
+        timeout: float = settings.playback_link_timeout,
+        prefix: str = "link_job",
+    ):
+        self.redis_cache = redis_cache
+        self.timeout = timeout
+        self.prefix = prefix
+        self.logger = logger
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}:lock:{key}"
+
+    def _state_key(self, key: str) -> str:
+        return f"{self.prefix}:state:{key}"
+
+    def _channel(self, key: str) -> str:
+        return f"{self.prefix}:done:{key}"
+
+    async def get_state(self, key: str) -> Optional[dict]:
+        """The final state of the job, ``pending`` while it runs, None if there is no job."""
+        state = await self.redis_cache.get(self._state_key(key))
+        if state is not None:
+            return state
+        client = await self.redis_cache.get_redis_client()
+        if await client.exists(self._lock_key(key)):
+            return {"status": PENDING}
+        return None
+
+    async def resolve(
+        self, key: str, job: Callable[[RedisCache], Awaitable[str]]
+    ) -> Optional[dict]:
+        """
+        Start the job for ``key`` unless it is running or resolved, and wait
+        for its state. ``job`` receives a Redis cache that outlives the request.
+        """
+        return await self._wait(key, job)
+
+    async def wait(self, key: str) -> Optional[dict]:
+        """Wait for the state of a job started by another request."""
+        return await self._wait(key, None)
+
+    async def _wait(self, key: str, job) -> Optional[dict]:
+        client = await self.redis_cache.get_redis_client()
+        pubsub = client.pubsub()
+        try:
+            # Subscribe before reading the state so the end of the job can not
+            # slip between the two.
+            await pubsub.subscribe(self._channel(key))
+            state = await self.get_state(key)
+            if job is not None and (state is None or state["status"] == FAILED):
+                if await self._start(client, key, job):
+                    state = {"status": PENDING}
+                else:
+                    state = await self.get_state(key)
+            if state is not None and state["status"] == PENDING:
+                self.logger.debug(f"LinkResolver: Waiting for link job {key}")
+                await wait_for_message(pubsub, self.timeout)
+                state = await self.get_state(key)
+            return state
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def _start(self, client, key: str, job) -> bool:
+        # The job may outlive the waiters' timeout, the lock keeps a second
+        # one from starting meanwhile.
+        acquired = await client.set(
+            self._lock_key(key), PENDING, nx=True, px=int(self.timeout * 2000)
+        )
+        if not acquired:
+            return False
+        await self.redis_cache.delete(self._state_key(key))
+        self.logger.info(f"LinkResolver: Starting link job {key}")
+        task = asyncio.create_task(self._run(key, job))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return True
+
+    async def _run(self, key: str, job) -> None:
+        # The request's Redis client is closed once the response is sent.
+        redis_cache = create_redis_cache()
+        try:
+            try:
+                link = await job(redis_cache)
+                state = {"status": READY, "link": link}
+                self.logger.success(f"LinkResolver: Link job {key} resolved")
+            except Exception as e:
+                state = {"status": FAILED, "error": str(e)}
+                self.logger.error(f"LinkResolver: Link job {key} failed: {e}", exc_info=True)
+
+            await redis_cache.set(self._state_key(key), state, expiration=STATE_TTL)
+            client = await redis_cache.get_redis_client()
+            await client.publish(self._channel(key), state["status"])
+            await client.delete(self._lock_key(key))
+        except Exception as e:
+            self.logger.error(f"LinkResolver: Unable to store the state of link job {key}: {e}")
+        finally:
+            await redis_cache.close()
@@ -8,44 +8,65 @@ from stream_fusion.logging_config import logger
 
 
 class Premiumize(BaseDebrid):
+    # Results are positional, they cannot be cached per hash.
+    availability_cacheable = False
+
     def __init__(self, config):
         super().__init__(config)
         self.base_url = "https://www.premiumize.me/api"
 
-    def add_magnet(self, magnet, ip=None):
+    def get_account_id(self):
+        return self._hash_credential(self.config["debridKey"])
+
+    async def add_magnet(self, magnet, ip=None):
         url = f"{self.base_url}/transfer/create?apikey={self.config['debridKey']}"
         form = {'src': magnet}
-        return self.json_response(url, method='post', data=form)
+        return await self.json_response(url, method='post', data=form)
 
     # Doesn't work for the time being. Premiumize does not support torrent file torrents
-    def add_torrent(self, torrent_file):
+    async def add_torrent(self, torrent_file):
         url = f"{self.base_url}/transfer/create?apikey={self.config['debridKey']}"
         form = {'file': torrent_file}
-        return self.json_response(url, method='post', data=form)
+        return await self.json_response(url, method='post', data=form)
 
-    def list_transfers(self):
+    async def list_transfers(self):
         url = f"{self.base_url}/transfer/list?apikey={self.config['debridKey']}"
-        return self.json_response(url)
+        return await self.json_response(url)
 
-    def get_folder_or_file_details(self, item_id, is_folder=True):
+    async def get_folder_or_file_details(self, item_id, is_folder=True):
         if is_folder:
             logger.info(f"Getting folder details with id: {item_id}")
             url = f"{self.base_url}/folder/list?id={item_id}&apikey={self.config['debridKey']}"
         else:
             logger.info(f"Getting file details with id: {item_id}")
             url = f"{self.base_url}/item/details?id={item_id}&apikey={self.config['debridKey']}"
-        return self.json_response(url)
+        return await self.json_response(url)
 
-    def get_availability(self, hash):
+    async def get_availability(self, hash):
         url = f"{self.base_url}/cache/check?apikey={self.config['debridKey']}&items[]={hash}"
-        return self.json_response(url)
+        return await self.json_response(url)
 
-    def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def _get_availability_batch(self, hashes_or_magnets, ip=None):
         url = f"{self.base_url}/cache/check?apikey={self.config['debridKey']}&items[]=" + "&items[]=".join(
             hashes_or_magnets)
-        return self.json_response(url)
-
-    def get_stream_link(self, query, config, ip=None):
+        return await self.json_response(url) or self._failed_availability_batch(hashes_or_magnets, "No response")
+
+    def _failed_availability_batch(self, hashes_or_magnets, error):
+        # Never drop a batch, the merged results would no longer line up with the hashes.
+        return {"status": "error", "message": str(error)}
+
+    def _merge_availability_batches(self, responses):
+        # Results are positional, batches are gathered in order so concatenating keeps them aligned.
+        merged = {"status": "success", "response": [], "transcoded": []}
+        for response in responses:
+            if response.get("status") != "success":
+                logger.error(f"Premiumize: Availability batch error: {response}")
+                return response
+            merged["response"].extend(response["response"])
+            merged["transcoded"].extend(response["transcoded"])
+        return merged
+
+    async def get_stream_link(self, query, config, ip=None):
         query = json.loads(query)
         magnet = query['magnet']
         logger.info(f"Received query for magnet: {magnet}")
@@ -54,21 +75,25 @@ class Premiumize(BaseDebrid):
         stream_type = query['type']
         logger.info(f"Stream type: {stream_type}")
 
-        transfer_data = self.add_magnet(magnet)
+        transfer_data = await self.add_magnet(magnet)
         if not transfer_data or 'id' not in transfer_data:
             logger.error("Failed to create transfer.")
             return "Error: Failed to create transfer."
         transfer_id = transfer_data['id']
         logger.info(f"Transfer created with ID: {transfer_id}")
 
-        if not self.wait_for_ready_status(lambda: self.get_availability(info_hash)["transcoded"][0] is True):
+        async def is_ready():
+            availability = await self.get_availability(info_hash)
+            return availability["transcoded"][0] is True
+
+        if not await self.wait_for_ready_status(is_ready):
             logger.info("Torrent not ready, caching in progress")
             return settings.no_cache_video_url
 
         logger.info("Torrent is ready.")
 
         # Assuming the transfer is complete, we need to find whether it's a file or a folder
-        transfers = self.list_transfers()
+        transfers = await self.list_transfers()
         item_id, is_folder = None, False
         for item in transfers.get('transfers', []):
             if item['id'] == transfer_id:
@@ -83,7 +108,7 @@ class Premiumize(BaseDebrid):
             logger.error("Transfer completed but no item ID found.")
             return "Error: Transfer completed but no item ID found."
 
-        details = self.get_folder_or_file_details(item_id, is_folder)
+        details = await self.get_folder_or_file_details(item_id, is_folder)
         logger.info(f"Got details")
 
         if stream_type == "movie":
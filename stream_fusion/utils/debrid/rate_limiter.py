@@ -0,0 +1,161 @@
+import asyncio
+import time
+from typing import Dict
+
+from redis.exceptions import RedisError
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.redis.redis_config import create_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.torrent.host_rate_limiter import TokenBucket
+
+# Takes a token from the bucket, or reserves the next one: the caller sleeps
+# for the returned delay, so concurrent callers are served in order. Nothing is
+# reserved while the account is backing off after a 429, the caller retries
+# once the pause is over, nor when the next free token is further away than
+# the maximum delay, so the queue can not grow without bounds.
+#   KEYS[1] bucket, KEYS[2] backoff
+#   ARGV[1] capacity, ARGV[2] tokens per millisecond, ARGV[3] maximum delay in milliseconds
+# Returns {reserved, delay in milliseconds}, reserved is -1 past the maximum delay.
+TOKEN_BUCKET_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return {0, blocked}
+end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local max_delay = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+if tokens < 0 and -tokens / rate > max_delay then
+    return {-1, math.ceil(-tokens / rate)}
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1000)
+if tokens >= 0 then
+    return {1, 0}
+end
+return {1, math.ceil(-tokens / rate)}
+"""
+
+# Sets the backoff unless a longer one is already running.
+#   KEYS[1] backoff, ARGV[1] delay in milliseconds
+BACKOFF_SCRIPT = """
+if redis.call('PTTL', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], 1, 'PX', ARGV[1])
+end
+"""
+
+
+class DebridRateLimitExceeded(Exception):
+    """The account's limits would make the request wait longer than allowed."""
+
+
+class DebridRateLimiter:
+    """
+    Token buckets shared by every request, worker and node using a debrid account.
+
+    Each ``(service, account, endpoint)`` has a bucket of ``limit`` tokens
+    refilled over ``period`` seconds, kept in Redis and updated by a Lua
+    script so concurrent callers never overdraw it. A 429 pauses every bucket
+    of the account for the Retry-After delay. A request that would wait longer
+    than ``max_wait`` seconds fails with DebridRateLimitExceeded instead of
+    queueing. While Redis is unreachable the buckets fall back to the worker's
+    memory.
+    """
+
+    def __init__(self, prefix: str = "debrid_rate", max_wait: float = settings.debrid_rate_limit_max_wait):
+        self.prefix = prefix
+        self.max_wait = max_wait
+        self.logger = logger
+        self._redis_cache = None
+        self._client = None
+        self._scripts = {}
+        self._local_buckets: Dict[str, TokenBucket] = {}
+        self._local_backoffs: Dict[str, float] = {}
+
+    def _bucket_key(self, service: str, account: str, endpoint: str) -> str:
+        return f"{self.prefix}:{service}:{account}:{endpoint}"
+
+    def _backoff_key(self, service: str, account: str) -> str:
+        return f"{self.prefix}:{service}:{account}:backoff"
+
+    async def _get_script(self, source: str):
+        if self._redis_cache is None:
+            self._redis_cache = create_redis_cache()
+        client = await self._redis_cache.get_redis_client()
+        if client is not self._client:
+            self._client = client
+            self._scripts = {}
+        if source not in self._scripts:
+            self._scripts[source] = client.register_script(source)
+        return self._scripts[source]
+
+    async def acquire(self, service: str, account: str, endpoint: str, limit: int, period: float) -> None:
+        """Wait until the account may send a request to ``endpoint``."""
+        keys = [self._bucket_key(service, account, endpoint), self._backoff_key(service, account)]
+        max_delay = int(self.max_wait * 1000)
+        try:
+            script = await self._get_script(TOKEN_BUCKET_SCRIPT)
+            while True:
+                reserved, delay = await self._redis_cache.execute_with_retry(
+                    script, keys=keys, args=[limit, limit / (period * 1000), max_delay]
+                )
+                if reserved < 0 or delay > max_delay:
+                    raise DebridRateLimitExceeded(
+                        f"{service} {endpoint} limit reached, next request in {delay / 1000:.1f}s"
+                    )
+                if delay > 0:
+                    await asyncio.sleep(delay / 1000)
+                if reserved:
+                    return
+        except RedisError as e:
+            self.logger.warning(f"DebridRateLimiter: Redis unavailable, limiting {service} in this worker: {e}")
+            await self._acquire_local(keys, limit, period)
+
+    async def _acquire_local(self, keys, limit: int, period: float) -> None:
+        bucket_key, backoff_key = keys
+        delay = self._local_backoffs.get(backoff_key, 0) - time.monotonic()
+        if delay > self.max_wait:
+            raise DebridRateLimitExceeded(f"{bucket_key} backing off for {delay:.1f}s")
+        if delay > 0:
+            await asyncio.sleep(delay)
+        bucket = self._local_buckets.get(bucket_key)
+        if bucket is None:
+            bucket = TokenBucket(limit / period, capacity=limit)
+            self._local_buckets[bucket_key] = bucket
+        try:
+            await asyncio.wait_for(bucket.acquire(), timeout=max(self.max_wait - max(delay, 0), 0.001))
+        except asyncio.TimeoutError:
+            raise DebridRateLimitExceeded(f"{bucket_key} limit reached")
+
+    async def backoff(self, service: str, account: str, delay: float) -> None:
+        """Pause every request of the account for ``delay`` seconds."""
+        key = self._backoff_key(service, account)
+        self.logger.warning(f"DebridRateLimiter: {service} rate limit hit, pausing the account for {delay}s")
+        self._local_backoffs[key] = max(self._local_backoffs.get(key, 0), time.monotonic() + delay)
+        try:
+            script = await self._get_script(BACKOFF_SCRIPT)
+            await self._redis_cache.execute_with_retry(
+                script, keys=[key], args=[max(1, int(delay * 1000))]
+            )
+        except RedisError as e:
+            self.logger.warning(f"DebridRateLimiter: Unable to share the {service} backoff: {e}")
+
+
+def get_retry_after(headers, default: float) -> float:
+    """The Retry-After delay of a 429 response in seconds, ``default`` when missing."""
+    retry_after = headers.get("Retry-After") if headers else None
+    if retry_after:
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+    return default
+
+
+debrid_rate_limiter = DebridRateLimiter()
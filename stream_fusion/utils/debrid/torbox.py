@@ -1,10 +1,10 @@
-from itertools import islice
 import uuid
 import tenacity
 from urllib.parse import unquote
 
 from fastapi import HTTPException
 from stream_fusion.utils.debrid.base_debrid import BaseDebrid
+from stream_fusion.utils.debrid.torrent_index import TorrentIndex, TorrentListError
 from stream_fusion.utils.general import get_info_hash_from_magnet, season_episode_in_filename, is_video_file
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
@@ -14,8 +14,12 @@ class Torbox(BaseDebrid):
         super().__init__(config)
         self.base_url = f"{settings.tb_base_url}/{settings.tb_api_version}/api"
         self.token = settings.tb_token if settings.tb_unique_account else self.config["TBToken"]
+        self.torrent_index = TorrentIndex(self)
         logger.info(f"Torbox: Initialized with base URL: {self.base_url}")
 
+    def get_account_id(self):
+        return self._hash_credential(self.token)
+
     def get_headers(self):
         if settings.tb_unique_account:
             if not settings.proxied_link:
@@ -30,7 +34,7 @@ class Torbox(BaseDebrid):
         else:
             return {"Authorization": f"Bearer {self.config["TBToken"]}"}
 
-    def add_magnet(self, magnet, ip=None, privacy="private"):
+    async def add_magnet(self, magnet, ip=None, privacy="private"):
         logger.info(f"Torbox: Adding magnet: {magnet[:50]}...")
         url = f"{self.base_url}/torrents/createtorrent"
         seed = 2 if privacy == "private" else 1
@@ -39,11 +43,11 @@ class Torbox(BaseDebrid):
             "seed": seed,
             "allow_zip": "false"
         }
-        response = self.json_response(url, method='post', headers=self.get_headers(), data=data)
+        response = await self.json_response(url, method='post', headers=self.get_headers(), data=data)
         logger.info(f"Torbox: Add magnet response: {response}")
         return response
 
-    def add_torrent(self, torrent_file, privacy="private"):
+    async def add_torrent(self, torrent_file, privacy="private"):
         logger.info("Torbox: Adding torrent file")
         url = f"{self.base_url}/torrents/createtorrent"
         seed = 2 if privacy == "private" else 1
@@ -54,26 +58,39 @@ class Torbox(BaseDebrid):
         files = {
             "file": (str(uuid.uuid4()) + ".torrent", torrent_file, 'application/x-bittorrent')
         }
-        response = self.json_response(url, method='post', headers=self.get_headers(), data=data, files=files)
+        response = await self.json_response(url, method='post', headers=self.get_headers(), data=data, files=files)
         logger.info(f"Torbox: Add torrent file response: {response}")
         return response
 
-    def get_torrent_info(self, torrent_id):
+    async def get_torrent_info(self, torrent_id):
         logger.info(f"Torbox: Getting info for torrent ID: {torrent_id}")
         url = f"{self.base_url}/torrents/mylist?bypass_cache=true&id={torrent_id}"
-        response = self.json_response(url, headers=self.get_headers())
+        response = await self.json_response(url, headers=self.get_headers())
         logger.debug(f"Torbox: Torrent info response: {response}")
         return response
 
-    def control_torrent(self, torrent_id, operation):
+    async def get_user_torrents_page(self, page):
+        offset = page * self.torrent_list_page_size
+        url = f"{self.base_url}/torrents/mylist?bypass_cache=true&offset={offset}&limit={self.torrent_list_page_size}"
+        response = await self.json_response(url, headers=self.get_headers())
+        if not response or not response.get("success"):
+            raise TorrentListError(f"Torbox: Unable to fetch page {page} of the torrent list")
+        return [
+            {"hash": torrent["hash"], "id": torrent["id"], "status": torrent.get("download_state")}
+            for torrent in response["data"] or []
+        ]
+
+    async def control_torrent(self, torrent_id, operation):
         logger.info(f"Torbox: Controlling torrent ID: {torrent_id}, operation: {operation}")
         url = f"{self.base_url}/torrents/controltorrent"
         data = {
             "torrent_id": torrent_id,
             "operation": operation
         }
-        response = self.json_response(url, method='post', headers=self.get_headers(), data=data)
+        response = await self.json_response(url, method='post', headers=self.get_headers(), data=data)
         logger.info(f"Torbox: Control torrent response: {response}")
+        if operation == "delete":
+            await self.torrent_index.remove(torrent_id)
         return response
 
     @tenacity.retry(
@@ -81,15 +98,15 @@ class Torbox(BaseDebrid):
         wait=tenacity.wait_fixed(2),
         retry=tenacity.retry_if_exception_type((HTTPException, TimeoutError))
     )
-    def request_download_link(self, torrent_id, file_id=None, zip_link=False):
+    async def request_download_link(self, torrent_id, file_id=None, zip_link=False):
         logger.info(f"Torbox: Requesting download link for torrent ID: {torrent_id}, file ID: {file_id}, zip link: {zip_link}")
         url = f"{self.base_url}/torrents/requestdl?token={self.token}&torrent_id={torrent_id}&file_id={file_id}&zip_link={str(zip_link).lower()}"
         logger.info(f"Torbox: Requesting URL: {url}")
-        response = self.json_response(url, headers=self.get_headers())
+        response = await self.json_response(url, headers=self.get_headers())
         logger.info(f"Torbox: Request download link response: {response}")
         return response
 
-    def get_stream_link(self, query, config, ip=None):
+    async def get_stream_link(self, query, config, ip=None):
         magnet = query['magnet']
         stream_type = query['type']
         file_index = int(query['file_index']) if query['file_index'] is not None else None
@@ -101,7 +118,7 @@ class Torbox(BaseDebrid):
         logger.info(f"Torbox: Getting stream link for {stream_type} with hash: {info_hash}")
 
         # Check if the torrent is already added
-        existing_torrent = self._find_existing_torrent(info_hash)
+        existing_torrent = await self._find_existing_torrent(info_hash)
         
         if existing_torrent:
             logger.info(f"Torbox: Found existing torrent with ID: {existing_torrent['id']}")
@@ -112,16 +129,17 @@ class Torbox(BaseDebrid):
             torrent_id = torrent_info["id"]
         else:
             # Add the magnet or torrent file
-            torrent_info = self.add_magnet_or_torrent(magnet, torrent_download)
+            torrent_info = await self.add_magnet_or_torrent(magnet, torrent_download)
             if not torrent_info or "torrent_id" not in torrent_info:
                 logger.error("Torbox: Failed to add or find torrent.")
                 return None
             torrent_id = torrent_info["torrent_id"]
+            await self.torrent_index.add(info_hash, torrent_id)
 
         logger.info(f"Torbox: Working with torrent ID: {torrent_id}")
 
         # Wait for the torrent to be ready
-        if not self._wait_for_torrent_completion(torrent_id):
+        if not await self._wait_for_torrent_completion(torrent_id):
             logger.warning("Torbox: Torrent not ready, caching in progress.")
             return settings.no_cache_video_url
 
@@ -133,7 +151,7 @@ class Torbox(BaseDebrid):
             return settings.no_cache_video_url
 
         # Request the download link
-        download_link_response = self.request_download_link(torrent_id, file_id)
+        download_link_response = await self.request_download_link(torrent_id, file_id)
         
         if not download_link_response or "data" not in download_link_response:
             logger.error("Torbox: Failed to get download link.")
@@ -142,50 +160,60 @@ class Torbox(BaseDebrid):
         logger.info(f"Torbox: Got download link: {download_link_response['data']}")
         return download_link_response['data']
 
-    def get_availability_bulk(self, hashes_or_magnets, ip=None):
-        logger.info(f"Torbox: Checking availability for {len(hashes_or_magnets)} hashes/magnets")
-        
+    availability_batch_size = 50
+
+    async def _get_availability_batch(self, hashes_or_magnets, ip=None):
+        url = f"{self.base_url}/torrents/checkcached?hash={','.join(hashes_or_magnets)}&format=list&list_files=true"
+        logger.trace(f"Torbox: Requesting URL: {url}")
+        response = await self.json_response(url, headers=self.get_headers())
+        if not response or not response.get("success"):
+            logger.debug(f"Torbox: Availability check failed for a batch of {len(hashes_or_magnets)} hashes")
+            return None
+        return response
+
+    def _merge_availability_batches(self, responses):
         all_results = []
-        
-        for i in range(0, len(hashes_or_magnets), 50):
-            batch = list(islice(hashes_or_magnets, i, i + 50))
-            logger.info(f"Torbox: Checking batch of {len(batch)} hashes/magnets (batch {i//50 + 1})")
-            url = f"{self.base_url}/torrents/checkcached?hash={','.join(batch)}&format=list&list_files=true"
-            logger.trace(f"Torbox: Requesting URL: {url}")
-            response = self.json_response(url, headers=self.get_headers())
-            
-            if response and response.get("success") and response["data"]:
-                all_results.extend(response["data"])
-            else:
-                logger.debug(f"Torbox: No cached avaibility for batch {i//50 + 1}")
-                return None
-            
-        logger.info(f"Torbox: Availability check completed for all {len(hashes_or_magnets)} hashes/magnets")
+        for response in responses:
+            all_results.extend(response["data"] or [])
+        logger.info(f"Torbox: Availability check completed, {len(all_results)} cached torrents found")
         return {
             "success": True,
             "detail": "Torrent cache status retrieved successfully.",
             "data": all_results
         }
 
-    def _find_existing_torrent(self, info_hash):
+    def _split_availability_batch(self, hashes_or_magnets, response):
+        # Torbox only lists cached torrents, every other hash of the batch is unavailable.
+        cached = {torrent["hash"]: torrent for torrent in response["data"] or []}
+        return {info_hash: cached.get(info_hash, False) for info_hash in hashes_or_magnets}
+
+    def build_availability_response(self, availability):
+        return {
+            "success": True,
+            "detail": "Torrent cache status retrieved successfully.",
+            "data": list(availability.values())
+        }
+
+    async def _find_existing_torrent(self, info_hash):
         logger.info(f"Torbox: Searching for existing torrent with hash: {info_hash}")
-        torrents = self.json_response(f"{self.base_url}/torrents/mylist", headers=self.get_headers())
-        if torrents and "data" in torrents:
-            for torrent in torrents["data"]:
-                if torrent["hash"].lower() == info_hash.lower():
-                    logger.info(f"Torbox: Found existing torrent with ID: {torrent['id']}")
-                    return torrent
+        for indexed_torrent in await self.torrent_index.find(info_hash):
+            torrent_info = await self.get_torrent_info(indexed_torrent["id"])
+            if torrent_info and torrent_info.get("data"):
+                logger.info(f"Torbox: Found existing torrent with ID: {indexed_torrent['id']}")
+                return torrent_info["data"]
+            # Deleted outside of StreamFusion since the index was built.
+            await self.torrent_index.remove(indexed_torrent["id"], info_hash)
         logger.info("Torbox: No existing torrent found")
         return None
 
-    def add_magnet_or_torrent(self, magnet, torrent_download=None, ip=None, privacy="private"):
+    async def add_magnet_or_torrent(self, magnet, torrent_download=None, ip=None, privacy="private"):
         if torrent_download is None:
             logger.info("Torbox: Adding magnet")
-            response = self.add_magnet(magnet, ip, privacy)
+            response = await self.add_magnet(magnet, ip, privacy)
         else:
             logger.info("Torbox: Downloading and adding torrent file")
-            torrent_file = self.download_torrent_file(torrent_download)
-            response = self.add_torrent(torrent_file, privacy)
+            torrent_file = await self.download_torrent_file(torrent_download)
+            response = await self.add_torrent(torrent_file, privacy)
 
         logger.info(f"Torbox: Add torrent response: {response}")
 
@@ -195,17 +223,17 @@ class Torbox(BaseDebrid):
 
         return response["data"]
 
-    def _wait_for_torrent_completion(self, torrent_id, timeout=60, interval=10):
+    async def _wait_for_torrent_completion(self, torrent_id, timeout=60, interval=10):
         logger.info(f"Torbox: Waiting for torrent completion, ID: {torrent_id}")
-        def check_status():
-            torrent_info = self.get_torrent_info(torrent_id)
+        async def check_status():
+            torrent_info = await self.get_torrent_info(torrent_id)
             if torrent_info and "data" in torrent_info:
                 files = torrent_info["data"].get("files", [])
                 logger.info(f"Torbox: Current torrent status: {torrent_info['data']['download_state']}")
                 return True if len(files) > 0 else False
             return False
 
-        result = self.wait_for_ready_status(check_status, timeout, interval)
+        result = await self.wait_for_ready_status(check_status, timeout, interval)
         if result:
             logger.info("Torbox: Torrent is ready")
         else:
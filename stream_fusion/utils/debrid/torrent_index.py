@@ -0,0 +1,251 @@
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.redis.redis_config import create_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.single_flight import SingleFlight
+
+# Indexes of accounts nobody plays from anymore are dropped after a week.
+INDEX_TTL = 7 * 24 * 3600
+# A failed refresh is not retried before this many seconds.
+RETRY_DELAY = 60
+# Longest a build or refresh holds the account's lock, and others wait for it.
+BUILD_TIMEOUT = 60
+
+# Entries of an info hash are updated in Redis so concurrent adds and
+# removes never overwrite each other.
+#   KEYS[1] index, ARGV[1] info hash, ARGV[2] torrent id (JSON), ARGV[3] index TTL,
+#   ARGV[4] entry to add (JSON), omitted to remove the torrent.
+UPDATE_ENTRIES_SCRIPT = """
+local entries = redis.call('HGET', KEYS[1], ARGV[1])
+entries = entries and cjson.decode(entries) or {}
+local id = cjson.decode(ARGV[2])
+local kept = {}
+for _, entry in ipairs(entries) do
+    if entry['id'] ~= id then
+        table.insert(kept, entry)
+    end
+end
+if ARGV[4] then
+    table.insert(kept, cjson.decode(ARGV[4]))
+end
+if #kept == 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(kept))
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return #entries - #kept
+"""
+
+_background_tasks = set()
+
+
+class TorrentListError(Exception):
+    """A page of the account's torrent list could not be fetched."""
+
+    def __init__(self, message, partial=None):
+        super().__init__(message)
+        # Torrents of the pages fetched before the failure.
+        self.partial = partial or {}
+
+
+class TorrentIndex:
+    """
+    Index of the torrents of a debrid account, from info hash to the torrent
+    ids and status.
+
+    The index is a Redis hash per ``(service, account)``, shared by every
+    worker. It is built from the account's torrent list the first time it is
+    needed, updated when StreamFusion adds or deletes a torrent and rebuilt
+    page by page in a background task once older than ``ttl``, so torrents
+    added or removed outside of StreamFusion are picked up without listing
+    the whole account on every playback. Builds and refreshes of an account
+    share a single-flight lock: a single request lists the account while the
+    others wait for its index.
+    """
+
+    def __init__(self, debrid, ttl: int = settings.debrid_torrent_list_ttl, prefix: str = "torrent_index"):
+        self.debrid = debrid
+        self.ttl = ttl
+        self.prefix = prefix
+        self.service = type(debrid).__name__
+        self.logger = logger
+
+    @property
+    def key(self) -> str:
+        return f"{self.prefix}:{self.service}:{self.debrid.get_account_id()}"
+
+    @property
+    def _synced_key(self) -> str:
+        return f"{self.key}:synced"
+
+    @property
+    def _retry_key(self) -> str:
+        return f"{self.key}:retry"
+
+    async def find(self, info_hash: str) -> List[dict]:
+        """The account's torrents with ``info_hash``, as dicts with ``id`` and ``status``."""
+        info_hash = info_hash.lower()
+        try:
+            async with create_redis_cache() as redis_cache:
+                client = await redis_cache.get_redis_client()
+
+                async def lookup():
+                    pipe = client.pipeline(transaction=False)
+                    pipe.hget(self.key, info_hash)
+                    pipe.get(self._synced_key)
+                    return await pipe.execute()
+
+                entries, synced = await redis_cache.execute_with_retry(lookup)
+                if synced is None:
+                    return await self._single_flight(redis_cache).run(
+                        self.key,
+                        lambda: self._build(redis_cache, info_hash),
+                        lambda: self._load(redis_cache, info_hash),
+                    )
+
+                if time.time() - float(synced) > self.ttl:
+                    await self._schedule_refresh(client)
+                return json.loads(entries) if entries else []
+        except RedisError as e:
+            self.logger.warning(f"TorrentIndex: Index unavailable for {self.service}, listing torrents: {e}")
+            try:
+                index = await self._list_torrents()
+            except TorrentListError as list_error:
+                self.logger.warning(f"TorrentIndex: {list_error}, using the partial list for this lookup")
+                index = list_error.partial
+            return index.get(info_hash, [])
+
+    async def add(self, info_hash: str, torrent_id, status: Optional[str] = None) -> None:
+        """Record a torrent added to the account."""
+        try:
+            await self._update_entries(
+                info_hash, torrent_id, json.dumps({"id": torrent_id, "status": status})
+            )
+        except RedisError as e:
+            self.logger.warning(f"TorrentIndex: Unable to index torrent {torrent_id}: {e}")
+
+    async def remove(self, torrent_id, info_hash: Optional[str] = None) -> None:
+        """Forget a torrent deleted from the account, the whole index is searched without ``info_hash``."""
+        try:
+            if info_hash is None:
+                async with create_redis_cache() as redis_cache:
+                    client = await redis_cache.get_redis_client()
+                    fields = await redis_cache.execute_with_retry(client.hgetall, self.key)
+                info_hashes = [
+                    field.decode() if isinstance(field, bytes) else field
+                    for field, entries in fields.items()
+                    if any(entry["id"] == torrent_id for entry in json.loads(entries))
+                ]
+            else:
+                info_hashes = [info_hash]
+            for indexed_hash in info_hashes:
+                await self._update_entries(indexed_hash, torrent_id)
+        except RedisError as e:
+            self.logger.warning(f"TorrentIndex: Unable to remove torrent {torrent_id} from the index: {e}")
+
+    async def _update_entries(self, info_hash: str, torrent_id, entry: Optional[str] = None) -> None:
+        args = [info_hash.lower(), json.dumps(torrent_id), INDEX_TTL]
+        if entry is not None:
+            args.append(entry)
+        async with create_redis_cache() as redis_cache:
+            client = await redis_cache.get_redis_client()
+            await redis_cache.execute_with_retry(
+                client.eval, UPDATE_ENTRIES_SCRIPT, 1, self.key, *args
+            )
+
+    def _single_flight(self, redis_cache) -> SingleFlight:
+        return SingleFlight(redis_cache, timeout=BUILD_TIMEOUT, prefix=self.prefix)
+
+    async def _build(self, redis_cache, info_hash: str) -> List[dict]:
+        self.logger.info(f"TorrentIndex: Building the {self.service} torrent index")
+        try:
+            index = await self._list_torrents()
+        except TorrentListError as e:
+            # Never stored: an incomplete index would hide torrents until the next refresh.
+            self.logger.warning(f"TorrentIndex: {e}, using the partial list for this lookup")
+            return e.partial.get(info_hash, [])
+        await self._store(redis_cache, index)
+        return index.get(info_hash, [])
+
+    async def _load(self, redis_cache, info_hash: str) -> Optional[List[dict]]:
+        # None when the leader could not build the index, the caller lists the account itself.
+        client = await redis_cache.get_redis_client()
+        if not await client.exists(self._synced_key):
+            return None
+        entries = await client.hget(self.key, info_hash)
+        return json.loads(entries) if entries else []
+
+    async def _list_torrents(self) -> Dict[str, List[dict]]:
+        index = {}
+        page = 0
+        while True:
+            try:
+                torrents = await self.debrid.get_user_torrents_page(page)
+            except TorrentListError as e:
+                e.partial = index
+                raise
+            for torrent in torrents:
+                index.setdefault(torrent["hash"].lower(), []).append(
+                    {"id": torrent["id"], "status": torrent["status"]}
+                )
+            if not torrents or len(torrents) < self.debrid.torrent_list_page_size:
+                self.logger.debug(
+                    f"TorrentIndex: {sum(len(entries) for entries in index.values())} {self.service} torrents listed in {page + 1} page(s)"
+                )
+                return index
+            page += 1
+
+    async def _store(self, redis_cache, index: Dict[str, List[dict]]) -> None:
+        client = await redis_cache.get_redis_client()
+
+        async def store_operation():
+            # Replaced in a single transaction, lookups never see a partial index.
+            pipe = client.pipeline(transaction=True)
+            pipe.delete(self.key)
+            if index:
+                pipe.hset(self.key, mapping={info_hash: json.dumps(entries) for info_hash, entries in index.items()})
+                pipe.expire(self.key, INDEX_TTL)
+            pipe.set(self._synced_key, time.time(), ex=INDEX_TTL)
+            await pipe.execute()
+
+        await redis_cache.execute_with_retry(store_operation)
+
+    async def _schedule_refresh(self, client) -> None:
+        if await client.exists(self._retry_key):
+            return
+        task = asyncio.create_task(self._refresh())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _refresh(self) -> None:
+        # The request's Redis client is closed once the response is sent.
+        redis_cache = create_redis_cache()
+
+        async def refresh():
+            client = await redis_cache.get_redis_client()
+            synced = await client.get(self._synced_key)
+            # Another refresh may have completed since this one was scheduled.
+            if synced is not None and time.time() - float(synced) <= self.ttl:
+                return
+            self.logger.info(f"TorrentIndex: Refreshing the {self.service} torrent index")
+            await self._store(redis_cache, await self._list_torrents())
+
+        try:
+            await self._single_flight(redis_cache).run_if_idle(self.key, refresh)
+        except Exception as e:
+            # The previous index is kept, it is only older than it should be.
+            self.logger.error(f"TorrentIndex: Unable to refresh the {self.service} torrent index: {e}")
+            try:
+                client = await redis_cache.get_redis_client()
+                await client.set(self._retry_key, 1, ex=RETRY_DELAY)
+            except RedisError:
+                pass
+        finally:
+            await redis_cache.close()
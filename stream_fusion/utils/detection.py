@@ -1,26 +1,92 @@
 import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from stream_fusion.constants import FR_RELEASE_GROUPS, FRENCH_PATTERNS
+
+LANGUAGE_PATTERNS = {
+    "fr": r"\b(?:FR(?:ench|a|e|anc[eê]s)?|V(?:O?F(?:F|I|i)?|O?Q)|TRUEFRENCH|VOST(?:FR)?|SUBFRENCH)\b",
+    "en": r"\b(?:EN(?:G(?:LISH)?)?|VOST(?:EN)?|SUBBED)\b",
+    # "es": r"\b(?:ES(?:P(?:ANISH)?)?|VOSE|SUBESP)\b",
+    # "de": r"\b(?:DE(?:UTSCH|RMAN)?|GER(?:MAN)?|SUBGER)\b",
+    # "it": r"\b(?:IT(?:A(?:LIAN)?)?|SUBITA)\b",
+    # "pt": r"\b(?:PT(?:-BR)?|POR(?:TUGUESE)?|LEGENDADO)\b",
+    # "ru": r"\b(?:RU(?:S(?:SIAN)?)?|SUBSRUS)\b",
+    # "in": r"\b(?:INDIAN|HINDI|TELUGU|TAMIL|KANNADA|MALAYALAM|PUNJABI|MARATHI|BENGALI|GUJARATI|URDU|ODIA|ASSAMESE|KONKANI|MANIPURI|NEPALI|SANSKRIT|SINHALA|SINDHI|TIBETAN|BHOJPURI|DHIVEHI|KASHMIRI|KURUKH|MAITHILI|NEWARI|RAJASTHANI|SANTALI|SINDHI|TULU)\b",
+    # "nl": r"\b(?:NL(?:D)?|DUTCH|SUBSNL)\b",
+    # "hu": r"\b(?:HU(?:N(?:GARIAN)?)?|SUBHUN)\b",
+    # "la": r"\b(?:LA(?:TIN(?:O)?)?)\b",
+    "multi": r"\b(?:MULTI(?:LANG(?:UE)?)?|DUAL(?:AUDIO)?|VF2)\b",
+}
+
+# Compiled once for the whole process, shared by every title scan below.
+LANGUAGE_REGEXES = [
+    (language, re.compile(pattern, re.IGNORECASE))
+    for language, pattern in LANGUAGE_PATTERNS.items()
+]
+RELEASE_GROUP_REGEX = re.compile("|".join(FR_RELEASE_GROUPS))
+FRENCH_LANGUAGE_REGEXES = [
+    (language, re.compile(pattern, re.IGNORECASE))
+    for language, pattern in FRENCH_PATTERNS.items()
+]
+
+
+class TitleFeatures(NamedTuple):
+    languages: Tuple[str, ...]
+    release_group: Optional[str]
+    french_language: Optional[str]
+
+
+@lru_cache(maxsize=50000)
+def get_title_features(title: str) -> TitleFeatures:
+    """
+    Everything the providers, filters and stream formatter read from a
+    torrent title, extracted once per title.
+
+    ``languages`` is empty when no language is detected, ``release_group`` is
+    the first FR release group found and ``french_language`` the French
+    variant tag (VFF, VOSTFR, ...).
+    """
+    languages = tuple(
+        language for language, regex in LANGUAGE_REGEXES if regex.search(title)
+    )
+    match = RELEASE_GROUP_REGEX.search(title)
+    french_language = next(
+        (language for language, regex in FRENCH_LANGUAGE_REGEXES if regex.search(title)),
+        None,
+    )
+    return TitleFeatures(languages, match.group(0) if match else None, french_language)
+
+
+class KeywordMatcher:
+    """
+    Case insensitive substring search for a set of keywords.
+
+    The keywords are compiled into a single alternation so a title is scanned
+    once whatever the number of keywords.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = {keyword.upper() for keyword in keywords}
+        self._regex = (
+            re.compile("|".join(re.escape(keyword) for keyword in sorted(self.keywords)))
+            if self.keywords
+            else None
+        )
+
+    def __bool__(self):
+        return self._regex is not None
+
+    def search(self, title: str) -> Optional[str]:
+        """Return the first keyword found in ``title``, or None."""
+        if self._regex is None:
+            return None
+        match = self._regex.search(title.upper())
+        return match.group(0) if match else None
 
 
 def detect_languages(torrent_name, default_language="en"):
-    language_patterns = {
-        "fr": r"\b(?:FR(?:ench|a|e|anc[eê]s)?|V(?:O?F(?:F|I|i)?|O?Q)|TRUEFRENCH|VOST(?:FR)?|SUBFRENCH)\b",
-        "en": r"\b(?:EN(?:G(?:LISH)?)?|VOST(?:EN)?|SUBBED)\b",
-        # "es": r"\b(?:ES(?:P(?:ANISH)?)?|VOSE|SUBESP)\b",
-        # "de": r"\b(?:DE(?:UTSCH|RMAN)?|GER(?:MAN)?|SUBGER)\b",
-        # "it": r"\b(?:IT(?:A(?:LIAN)?)?|SUBITA)\b",
-        # "pt": r"\b(?:PT(?:-BR)?|POR(?:TUGUESE)?|LEGENDADO)\b",
-        # "ru": r"\b(?:RU(?:S(?:SIAN)?)?|SUBSRUS)\b",
-        # "in": r"\b(?:INDIAN|HINDI|TELUGU|TAMIL|KANNADA|MALAYALAM|PUNJABI|MARATHI|BENGALI|GUJARATI|URDU|ODIA|ASSAMESE|KONKANI|MANIPURI|NEPALI|SANSKRIT|SINHALA|SINDHI|TIBETAN|BHOJPURI|DHIVEHI|KASHMIRI|KURUKH|MAITHILI|NEWARI|RAJASTHANI|SANTALI|SINDHI|TULU)\b",
-        # "nl": r"\b(?:NL(?:D)?|DUTCH|SUBSNL)\b",
-        # "hu": r"\b(?:HU(?:N(?:GARIAN)?)?|SUBHUN)\b",
-        # "la": r"\b(?:LA(?:TIN(?:O)?)?)\b",
-        "multi": r"\b(?:MULTI(?:LANG(?:UE)?)?|DUAL(?:AUDIO)?|VF2)\b",
-    }
-
-    languages = []
-    for language, pattern in language_patterns.items():
-        if re.search(pattern, torrent_name, re.IGNORECASE):
-            languages.append(language)
+    languages = list(get_title_features(torrent_name).languages)
 
     if len(languages) == 0:
         return [default_language]
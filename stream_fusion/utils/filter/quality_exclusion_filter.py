@@ -17,10 +17,10 @@ class QualityExclusionFilter(BaseFilter):
     def filter(self, data):
         return [
             stream for stream in data
-            if self._is_stream_allowed(stream)
+            if self.is_allowed(stream)
         ]
 
-    def _is_stream_allowed(self, stream: TorrentItem) -> bool:
+    def is_allowed(self, stream: TorrentItem) -> bool:
 
         parsed_data = stream.parsed_data
 
@@ -1,3 +1,4 @@
+from stream_fusion.utils.detection import KeywordMatcher
 from stream_fusion.utils.filter.base_filter import BaseFilter
 from stream_fusion.logging_config import logger
 
@@ -5,24 +6,23 @@ from stream_fusion.logging_config import logger
 class TitleExclusionFilter(BaseFilter):
     def __init__(self, config):
         super().__init__(config)
-        self.excluded_keywords = {keyword.upper() for keyword in self.config.get('exclusionKeywords', [])}
+        self.excluded_keywords = KeywordMatcher(self.config.get('exclusionKeywords', []))
 
     def filter(self, data):
         filtered_items = []
         for stream in data:
-            if self._should_include_stream(stream):
+            if self.is_allowed(stream):
                 filtered_items.append(stream)
         
         logger.debug(f"TitleExclusionFilter: input {len(data)}, output {len(filtered_items)}")
         return filtered_items
 
-    def _should_include_stream(self, stream):
+    def is_allowed(self, stream):
         try:
-            title_upper = stream.raw_title.upper()
-            for keyword in self.excluded_keywords:
-                if keyword in title_upper:
-                    logger.trace(f"Excluded stream: {stream.raw_title} (keyword: {keyword})")
-                    return False
+            keyword = self.excluded_keywords.search(stream.raw_title)
+            if keyword is not None:
+                logger.trace(f"Excluded stream: {stream.raw_title} (keyword: {keyword})")
+                return False
             return True
         except AttributeError:
             logger.warning(f"Stream has no title attribute: {stream}")
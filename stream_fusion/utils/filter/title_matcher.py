@@ -0,0 +1,144 @@
+import re
+import threading
+from collections import defaultdict
+
+from cachetools import LRUCache
+from Levenshtein import ratio
+from RTN.patterns import normalize_title
+
+from stream_fusion.logging_config import logger
+
+INTEGRALE_PATTERN = re.compile(
+    r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE
+)
+
+# Characters to filter from TMDB titles, grouped by category
+TMDB_CHARACTERS_TO_FILTER = {
+    "punctuation": r'<>"/\\|?*',
+    "control": r"\x00-\x1F",
+    "symbols": r"\u2122\u00AE\u00A9\u2120\u00A1\u00BF\u2013\u2014\u2018\u2019\u201C\u201D\u2022\u2026",
+    "spaces": r"\s+",
+}
+TMDB_FILTER_PATTERN = re.compile(
+    "".join([f"[{chars}]" for chars in TMDB_CHARACTERS_TO_FILTER.values()])
+)
+COLON_PREFIX_PATTERN = re.compile(r":(\S)")
+COLON_PATTERN = re.compile(r"\s*:\s*")
+SPACES_PATTERN = re.compile(TMDB_CHARACTERS_TO_FILTER["spaces"])
+
+# Decisions shared by every TitleMatcher, keyed on (media titles, threshold, item title).
+# The titles of a media depend on the user's languages and metadata provider,
+# so its id alone does not identify them.
+_decisions = LRUCache(maxsize=100000)
+_decisions_lock = threading.Lock()
+
+
+def clean_tmdb_title(title):
+    cleaned_title = COLON_PREFIX_PATTERN.sub(r" \1", title)
+    cleaned_title = COLON_PATTERN.sub(" ", cleaned_title)
+    cleaned_title = TMDB_FILTER_PATTERN.sub(" ", cleaned_title)
+    cleaned_title = cleaned_title.strip()
+    cleaned_title = SPACES_PATTERN.sub(" ", cleaned_title)
+
+    return cleaned_title
+
+
+def is_ordered_subset(subset_words, full_set_words):
+    subset_index = 0
+    for word in full_set_words:
+        if subset_index < len(subset_words) and word == subset_words[subset_index]:
+            subset_index += 1
+    return subset_index == len(subset_words)
+
+
+class TitleMatcher:
+    """
+    Matches parsed torrent titles against the titles of a media.
+
+    An item matches a title when the words of one are an ordered subset of the
+    other's, or when their RTN ``title_match`` Levenshtein ratio reaches
+    ``threshold``. The media titles are cleaned, tokenized and normalized once:
+    the subset checks only run on the titles sharing a word with the item,
+    found through an inverted word index, and the fuzzy scorer skips the titles
+    whose length alone keeps them under the threshold.
+    """
+
+    def __init__(self, titles, threshold: float = 0.85):
+        self.threshold = threshold
+
+        cleaned_titles = [
+            INTEGRALE_PATTERN.sub("", clean_tmdb_title(title)).strip()
+            for title in titles
+        ]
+        logger.info(f"Filters: Removing items not matching titles: {cleaned_titles}")
+
+        self.titles = cleaned_titles
+        self.title_words = [title.lower().split() for title in cleaned_titles]
+        self.normalized_titles = [normalize_title(title) for title in cleaned_titles]
+        self.cache_key = (tuple(cleaned_titles), threshold)
+        # An empty title is an ordered subset of every item title.
+        self.has_empty_title = any(not words for words in self.title_words)
+
+        self.word_index = defaultdict(set)
+        for title_id, words in enumerate(self.title_words):
+            for word in words:
+                self.word_index[word].add(title_id)
+
+    def __call__(self, item) -> bool:
+        cleaned_item_title = INTEGRALE_PATTERN.sub(
+            "", item.parsed_data.parsed_title
+        ).strip()
+        key = (self.cache_key, cleaned_item_title)
+        with _decisions_lock:
+            decision = _decisions.get(key)
+        if decision is None:
+            decision = self.matches(cleaned_item_title)
+            with _decisions_lock:
+                _decisions[key] = decision
+        return decision
+
+    def matches(self, cleaned_item_title: str) -> bool:
+        if not self.titles:
+            return False
+        if self.has_empty_title:
+            return True
+
+        item_words = cleaned_item_title.lower().split()
+        if not item_words:
+            logger.trace(f"Filters: Empty item title accepted: {cleaned_item_title}")
+            return True
+
+        candidates = set()
+        for word in item_words:
+            candidates |= self.word_index.get(word, set())
+        for title_id in sorted(candidates):
+            words = self.title_words[title_id]
+            if is_ordered_subset(item_words, words) or is_ordered_subset(words, item_words):
+                logger.trace(
+                    f"Filters: Ordered subset match found. Item accepted: {cleaned_item_title}"
+                )
+                return True
+
+        if self._fuzzy_match(cleaned_item_title):
+            logger.trace(
+                f"Filters: title_match() succeeded. Item accepted: {cleaned_item_title}"
+            )
+            return True
+
+        logger.trace(f"Filters: No match found, item skipped: {cleaned_item_title}")
+        return False
+
+    def _fuzzy_match(self, cleaned_item_title: str) -> bool:
+        normalized_item_title = normalize_title(cleaned_item_title)
+        item_length = len(normalized_item_title)
+        for normalized_title in self.normalized_titles:
+            title_length = len(normalized_title)
+            total_length = title_length + item_length
+            # The ratio can not exceed 2 * shortest / total.
+            if total_length and 2 * min(title_length, item_length) / total_length < self.threshold:
+                continue
+            score = ratio(normalized_title, normalized_item_title, score_cutoff=self.threshold)
+            # Same rounding as RTN's get_lev_ratio.
+            if round(score, 3) >= self.threshold:
+                return True
+        return False
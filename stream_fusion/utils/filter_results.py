@@ -1,17 +1,23 @@
+import json
 import re
-from typing import List
+import threading
+from typing import Dict, List, Optional, Tuple
 
-from RTN import title_match
+from cachetools import LRUCache
 
 from stream_fusion.utils.filter.language_filter import LanguageFilter
 from stream_fusion.utils.filter.max_size_filter import MaxSizeFilter
 from stream_fusion.utils.filter.quality_exclusion_filter import QualityExclusionFilter
 from stream_fusion.utils.filter.title_exclusion_filter import TitleExclusionFilter
+from stream_fusion.utils.filter.title_matcher import INTEGRALE_PATTERN, TitleMatcher
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.logging_config import logger
 
 quality_order = {"2160p": 0, "1080p": 1, "720p": 2, "480p": 3}
 
+# Config keys read by FilterPipeline, used to share pipelines between requests.
+FILTER_CONFIG_KEYS = ("languages", "maxSize", "exclusionKeywords", "exclusion")
+
 
 def sort_quality(item: TorrentItem):
     logger.trace(f"Filters: Evaluating quality for item: {item.raw_title}")
@@ -44,50 +50,46 @@ def items_sort(items, config):
     return sorted_items
 
 
-def filter_out_non_matching_movies(items, year):
-    logger.info(f"Filters: Filtering non-matching movies for year: {year}")
+def movie_year_matcher(year):
     year_min = str(int(year) - 1)
     year_max = str(int(year) + 1)
     year_pattern = re.compile(rf"\b{year_max}|{year}|{year_min}\b")
-    filtered_items = []
-    for item in items:
+
+    def matches(item):
         if year_pattern.search(item.raw_title):
             logger.trace(
                 f"Filters: Match found for year {year} in item: {item.raw_title}"
             )
-            filtered_items.append(item)
-        else:
-            logger.trace(
-                f"Filters: No match found for year {year} in item: {item.raw_title}"
-            )
-    return filtered_items
+            return True
+        logger.trace(
+            f"Filters: No match found for year {year} in item: {item.raw_title}"
+        )
+        return False
 
+    return matches
 
-def filter_out_non_matching_series(items, season, episode):
-    logger.info(
-        f"Filters: Filtering non-matching items for season {season} and episode {episode}"
-    )
-    filtered_items = []
-    clean_season = season.replace("S", "")
-    clean_episode = episode.replace("E", "")
-    numeric_season = int(clean_season)
-    numeric_episode = int(clean_episode)
-
-    integrale_pattern = re.compile(
-        r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE
-    )
 
-    for item in items:
+def filter_out_non_matching_movies(items, year):
+    logger.info(f"Filters: Filtering non-matching movies for year: {year}")
+    matches = movie_year_matcher(year)
+    return [item for item in items if matches(item)]
+
+
+def series_episode_matcher(season, episode):
+    numeric_season = int(season.replace("S", ""))
+    numeric_episode = int(episode.replace("E", ""))
+
+    def matches(item):
         if len(item.parsed_data.seasons) == 0 and len(item.parsed_data.episodes) == 0:
-            if integrale_pattern.search(item.raw_title):
+            if INTEGRALE_PATTERN.search(item.raw_title):
                 logger.trace(
                     f"Filters: Integrale match found for item: {item.raw_title}"
                 )
-                filtered_items.append(item)
+                return True
             logger.trace(
                 f"Filters: No season or episode information found for item: {item.raw_title}"
             )
-            continue
+            return False
         if (
             len(item.parsed_data.episodes) == 0
             and numeric_season in item.parsed_data.seasons
@@ -95,8 +97,7 @@ def filter_out_non_matching_series(items, season, episode):
             logger.trace(
                 f"Filters: Exact season match found for item: {item.raw_title}"
             )
-            filtered_items.append(item)
-            continue
+            return True
         if (
             numeric_season in item.parsed_data.seasons
             and numeric_episode in item.parsed_data.episodes
@@ -104,136 +105,146 @@ def filter_out_non_matching_series(items, season, episode):
             logger.trace(
                 f"Filters: Exact season and episode match found for item: {item.raw_title}"
             )
-            filtered_items.append(item)
-            continue
+            return True
+        return False
+
+    return matches
 
+
+def filter_out_non_matching_series(items, season, episode):
+    logger.info(
+        f"Filters: Filtering non-matching items for season {season} and episode {episode}"
+    )
+    matches = series_episode_matcher(season, episode)
+    filtered_items = [item for item in items if matches(item)]
     logger.debug(
         f"Filters: Filtering complete. {len(filtered_items)} matching items found out of {len(items)} total"
     )
     return filtered_items
 
 
-def clean_tmdb_title(title):
-    # Dictionary of characters to filter, grouped by category
-    characters_to_filter = {
-        "punctuation": r'<>"/\\|?*',
-        "control": r"\x00-\x1F",
-        "symbols": r"\u2122\u00AE\u00A9\u2120\u00A1\u00BF\u2013\u2014\u2018\u2019\u201C\u201D\u2022\u2026",
-        "spaces": r"\s+",
-    }
-
-    filter_pattern = "".join([f"[{chars}]" for chars in characters_to_filter.values()])
-    cleaned_title = re.sub(r":(\S)", r" \1", title)
-    cleaned_title = re.sub(r"\s*:\s*", " ", cleaned_title)
-    cleaned_title = re.sub(filter_pattern, " ", cleaned_title)
-    cleaned_title = cleaned_title.strip()
-    cleaned_title = re.sub(characters_to_filter["spaces"], " ", cleaned_title)
-
-    return cleaned_title
-
-
 def remove_non_matching_title(items, titles):
-    filtered_items = []
-    integrale_pattern = re.compile(
-        r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE
-    )
-    cleaned_titles = [clean_tmdb_title(title) for title in titles]
-    cleaned_titles = [
-        integrale_pattern.sub("", title).strip() for title in cleaned_titles
-    ]
-    logger.info(f"Filters: Removing items not matching titles: {cleaned_titles}")
-
-    def is_ordered_subset(subset, full_set):
-        subset_words = subset.lower().split()
-        full_set_words = full_set.lower().split()
-        subset_index = 0
-        for word in full_set_words:
-            if subset_index < len(subset_words) and word == subset_words[subset_index]:
-                subset_index += 1
-        return subset_index == len(subset_words)
-
-    for item in items:
-        cleaned_item_title = integrale_pattern.sub(
-            "", item.parsed_data.parsed_title
-        ).strip()
-        for title in cleaned_titles:
-            logger.trace(
-                f"Filters: Comparing item title: {cleaned_item_title} with title: {title}"
-            )
-
-            if is_ordered_subset(cleaned_item_title, title):
-                logger.trace(
-                    f"Filters: Ordered subset match found. Item accepted: {cleaned_item_title}"
-                )
-                filtered_items.append(item)
-                break
-            elif is_ordered_subset(title, cleaned_item_title):
-                logger.trace(
-                    f"Filters: Reverse ordered subset match found. Item accepted: {cleaned_item_title}"
-                )
-                filtered_items.append(item)
-                break
-            else:
-                logger.trace(f"Filters: No ordered subset match. Trying title_match()")
-                if title_match(title, cleaned_item_title):
-                    logger.trace(
-                        f"Filters: title_match() succeeded. Item accepted: {cleaned_item_title}"
-                    )
-                    filtered_items.append(item)
-                    break
-        else:
-            logger.trace(f"Filters: No match found, item skipped: {cleaned_item_title}")
-
+    matches = TitleMatcher(titles)
+    filtered_items = [item for item in items if matches(item)]
     logger.debug(
         f"Filters: Title filtering complete. {len(filtered_items)} items kept out of {len(items)} total"
     )
     return filtered_items
 
 
-def filter_items(items, media, config):
-    logger.info(f"Filters: Starting item filtering for media: {media.titles[0]}")
-    filters = {
-        "languages": LanguageFilter(config),
-        "maxSize": MaxSizeFilter(config, media.type),
-        "exclusionKeywords": TitleExclusionFilter(config),
-        "exclusion": QualityExclusionFilter(config),
-        # "resultsPerQuality": ResultsPerQualityFilter(config),
-    }
+class FilterPipeline:
+    """
+    Every filter of ``filter_items`` compiled once for a ``(media, config)``.
+
+    The stages are fused into a single pass over the items, cheapest first, so
+    the expensive title matching only sees the items every other stage kept.
+    The language stage rewrites ``languages`` on the items it keeps, it runs
+    last so only the items that survive the whole pipeline are touched.
+    """
+
+    def __init__(self, media, config):
+        self.stages = []
+
+        config_filters = {
+            "maxSize": MaxSizeFilter(config, media.type),
+            "exclusion": QualityExclusionFilter(config),
+            "exclusionKeywords": TitleExclusionFilter(config),
+            "languages": LanguageFilter(config),
+            # "resultsPerQuality": ResultsPerQualityFilter(config),
+        }
+        enabled_filters = {}
+        for name, filter_instance in config_filters.items():
+            try:
+                if filter_instance.config is not None and filter_instance.can_filter():
+                    logger.info(f"Filters: Applying {name} filter: {config[name]}")
+                    enabled_filters[name] = filter_instance
+            except Exception as e:
+                logger.error(f"Filters: Error while applying {name} filter", exc_info=e)
+
+        if "maxSize" in enabled_filters:
+            self.stages.append(("maxSize", enabled_filters["maxSize"].is_allowed))
+        if media.type == "series":
+            self.stages.append(
+                ("season/episode", series_episode_matcher(media.season, media.episode))
+            )
+        if "exclusion" in enabled_filters:
+            self.stages.append(("exclusion", enabled_filters["exclusion"].is_allowed))
+        if media.type == "movie":
+            self.stages.append(("year", movie_year_matcher(media.year)))
+        if "exclusionKeywords" in enabled_filters:
+            self.stages.append(
+                ("exclusionKeywords", enabled_filters["exclusionKeywords"].is_allowed)
+            )
+        self.stages.append(("title", TitleMatcher(media.titles)))
+        if "languages" in enabled_filters:
+            self.stages.append(("languages", enabled_filters["languages"].is_allowed))
+
+    def run(self, items) -> Tuple[List[TorrentItem], Dict[str, int]]:
+        """Return the items kept and the number of items rejected by each stage."""
+        rejections = {name: 0 for name, _ in self.stages}
+        failed_stages = set()
+        filtered_items = []
+
+        for item in items:
+            for name, is_allowed in self.stages:
+                if name in failed_stages:
+                    continue
+                try:
+                    if not is_allowed(item):
+                        rejections[name] += 1
+                        break
+                except Exception as e:
+                    logger.error(
+                        f"Filters: Error while applying {name} filter", exc_info=e
+                    )
+                    failed_stages.add(name)
+            else:
+                filtered_items.append(item)
 
-    logger.info(f"Filters: Initial item count: {len(items)}")
+        return filtered_items, rejections
 
-    if media.type == "series":
-        logger.info(f"Filters: Filtering out non-matching series torrents")
-        items = filter_out_non_matching_series(items, media.season, media.episode)
-        logger.success(
-            f"Filters: Item count after season/episode filtering: {len(items)}"
-        )
 
-    if media.type == "movie":
-        logger.info(f"Filters: Filtering out non-matching movie torrents")
-        items = filter_out_non_matching_movies(items, media.year)
-        logger.success(f"Filters: Item count after year filtering: {len(items)}")
+_pipelines = LRUCache(maxsize=256)
+_pipelines_lock = threading.Lock()
 
-    logger.info(f"Filters: Filtering out items not matching titles: {media.titles}")
-    items = remove_non_matching_title(items, media.titles)
-    logger.success(f"Filters: Item count after title filtering: {len(items)}")
 
-    for filter_name, filter_instance in filters.items():
-        try:
-            logger.info(
-                f"Filters: Applying {filter_name} filter: {config[filter_name]}"
-            )
-            items = filter_instance(items)
-            logger.success(
-                f"Filters: Item count after {filter_name} filter: {len(items)}"
-            )
-        except Exception as e:
-            logger.error(
-                f"Filters: Error while applying {filter_name} filter", exc_info=e
-            )
+def _pipeline_key(media, config):
+    return (
+        media.type,
+        tuple(media.titles),
+        getattr(media, "year", None),
+        getattr(media, "season", None),
+        getattr(media, "episode", None),
+        json.dumps({key: config.get(key) for key in FILTER_CONFIG_KEYS}, sort_keys=True),
+    )
+
+
+def get_filter_pipeline(media, config) -> FilterPipeline:
+    """Return the pipeline for ``(media, config)``, building it on first use."""
+    key = _pipeline_key(media, config)
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+    if pipeline is None:
+        pipeline = FilterPipeline(media, config)
+        with _pipelines_lock:
+            _pipelines[key] = pipeline
+    return pipeline
 
-    logger.success(f"Filters: Filtering complete. Final item count: {len(items)}")
-    return items
+
+def filter_items(items, media, config, pipeline: Optional[FilterPipeline] = None):
+    logger.info(f"Filters: Starting item filtering for media: {media.titles[0]}")
+    logger.info(f"Filters: Initial item count: {len(items)}")
+
+    if pipeline is None:
+        pipeline = get_filter_pipeline(media, config)
+    filtered_items, rejections = pipeline.run(items)
+
+    logger.debug(
+        "Filters: Items rejected per filter: "
+        + ", ".join(f"{name}={count}" for name, count in rejections.items())
+    )
+    logger.success(f"Filters: Filtering complete. Final item count: {len(filtered_items)}")
+    return filtered_items
 
 
 def sort_items(items, config):
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import parse_title
 
 from stream_fusion.logging_config import logger
 
@@ -15,7 +15,7 @@ def season_episode_in_filename(filename, season, episode):
     if not is_video_file(filename):
         return False
 
-    parsed_name = parse(filename)
+    parsed_name = parse_title(filename)
 
     return season in parsed_name.seasons and episode in parsed_name.episodes
 
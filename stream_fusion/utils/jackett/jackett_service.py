@@ -1,14 +1,11 @@
+import asyncio
 import os
-import queue
-import threading
 import time
 import xml.etree.ElementTree as ET
 
-import requests
-from RTN import parse
-from requests_ratelimiter import HTTPAdapter
-from urllib3 import Retry
+from stream_fusion.utils.parser.parse_cache import parse_title, warm_parse_cache
 
+from stream_fusion.services.http import get_http_client
 from stream_fusion.utils.jackett.jackett_indexer import JackettIndexer
 from stream_fusion.utils.jackett.jackett_result import JackettResult
 from stream_fusion.utils.models.movie import Movie
@@ -24,67 +21,44 @@ class JackettService:
 
         self.__api_key = settings.jackett_api_key
         self.__base_url = f"{settings.jackett_schema}://{settings.jackett_host}:{settings.jackett_port}/api/v2.0"
-        self.__session = requests.Session()
-        
-        adapter = HTTPAdapter(pool_connections=100, pool_maxsize=100)
-        
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        adapter.max_retries = retry_strategy
-        
-        self.__session.mount("http://", adapter)
-        self.__session.mount("https://", adapter)
-
-    def search(self, media):
+        self.__http = get_http_client()
+
+    async def search(self, media):
         self.logger.info("Started Jackett search for " + media.type + " " + media.titles[0])
 
-        indexers = self.__get_indexers()
-        threads = []
-        results_queue = queue.Queue()  # Create a Queue instance to hold the results
+        indexers = await self.__get_indexers()
 
-        # Define a wrapper function that calls the actual target function and stores its return value in the queue
-        def thread_target(media, indexer):
+        async def search_indexer(media, indexer):
             self.logger.info(f"Searching on {indexer.title}")
             start_time = time.time()
 
-            # Call the actual function
             if isinstance(media, Movie):
-                result = self.__search_movie_indexer(media, indexer)
+                result = await self.__search_movie_indexer(media, indexer)
             elif isinstance(media, Series):
-                result = self.__search_series_indexer(media, indexer)
+                result = await self.__search_series_indexer(media, indexer)
             else:
                 raise TypeError("Only Movie and Series is allowed as media!")
 
             self.logger.info(
                 f"Search on {indexer.title} took {time.time() - start_time} seconds and found {len([result for sublist in result for result in sublist])} results")
 
-            results_queue.put(result)  # Put the result in the queue
-
-        for indexer in indexers:
-            # Pass the wrapper function as the target to Thread, with necessary arguments
-            threads.append(threading.Thread(target=thread_target, args=(media, indexer)))
-
-        for thread in threads:
-            thread.start()
-
-        for thread in threads:
-            thread.join()
+            return result
 
         results = []
-
-        # Retrieve results from the queue and append them to the results list
-        while not results_queue.empty():
-            results.extend(results_queue.get())
+        for result in await asyncio.gather(*(search_indexer(media, indexer) for indexer in indexers)):
+            results.extend(result)
 
         flatten_results = [result for sublist in results for result in sublist]
 
+        await warm_parse_cache(result.raw_title for result in flatten_results)
         return self.__post_process_results(flatten_results, media)
 
-    def __search_movie_indexer(self, movie, indexer):
+    async def __get(self, url, params=None):
+        # Jackett proxies the search to the indexer, so it can take far longer than a plain API call.
+        response = await self.__http.get(url, params=params, timeout=settings.search_timeout)
+        return response.text
+
+    async def __search_movie_indexer(self, movie, indexer):
 
         # url = f"{self.__base_url}/indexers/all/results/torznab/api?apikey={self.__api_key}&t=movie&cat=2000&q={movie.title}&year={movie.year}"
 
@@ -119,12 +93,9 @@ class JackettService:
                 params['imdbid'] = movie.id
 
             url = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
-            url += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
 
             try:
-                response = self.__session.get(url)
-                response.raise_for_status()
-                results.append(self.__get_torrent_links_from_xml(response.text))
+                results.append(self.__get_torrent_links_from_xml(await self.__get(url, params)))
             except Exception:
                 self.logger.exception(
                     f"An exception occured while searching for a movie on Jackett with indexer {indexer.title} and "
@@ -132,7 +103,7 @@ class JackettService:
 
         return results
 
-    def __search_series_indexer(self, series, indexer):
+    async def __search_series_indexer(self, series, indexer):
         season = str(int(series.season.replace('S', '')))
         episode = str(int(series.episode.replace('E', '')))
 
@@ -165,28 +136,20 @@ class JackettService:
             if has_imdb_search_capability:
                 params['imdbid'] = series.id
 
-            url_title = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
-            url_title += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
-
-            url_season = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
-            params['season'] = season
-            url_season += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
-
-            url_ep = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
-            params['ep'] = episode
-            url_ep += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
+            url = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
+            params_title = dict(params)
+            params_season = {**params_title, 'season': season}
+            params_ep = {**params_season, 'ep': episode}
 
             try:
                 # Current functionality is that it returns if the season, episode search was successful. This is subject to change
                 # TODO: what should we prioritize? season, episode or title?
-                response_ep = self.__session.get(url_ep)
-                response_ep.raise_for_status()
-
-                response_season = self.__session.get(url_season)
-                response_season.raise_for_status()
+                response_ep, response_season = await asyncio.gather(
+                    self.__get(url, params_ep), self.__get(url, params_season)
+                )
 
-                data_ep = self.__get_torrent_links_from_xml(response_ep.text)
-                data_season = self.__get_torrent_links_from_xml(response_season.text)
+                data_ep = self.__get_torrent_links_from_xml(response_ep)
+                data_season = self.__get_torrent_links_from_xml(response_season)
 
                 if data_ep:
                     results.append(data_ep)
@@ -194,9 +157,8 @@ class JackettService:
                     results.append(data_season)
 
                 if not data_ep and not data_season:
-                    response_title = self.__session.get(url_title)
-                    response_title.raise_for_status()
-                    data_title = self.__get_torrent_links_from_xml(response_title.text)
+                    response_title = await self.__get(url, params_title)
+                    data_title = self.__get_torrent_links_from_xml(response_title)
                     if data_title:
                         results.append(data_title)
             except Exception:
@@ -205,13 +167,12 @@ class JackettService:
 
         return results
 
-    def __get_indexers(self):
-        url = f"{self.__base_url}/indexers/all/results/torznab/api?apikey={self.__api_key}&t=indexers&configured=true"
+    async def __get_indexers(self):
+        url = f"{self.__base_url}/indexers/all/results/torznab/api"
+        params = {'apikey': self.__api_key, 't': 'indexers', 'configured': 'true'}
 
         try:
-            response = self.__session.get(url)
-            response.raise_for_status()
-            return self.__get_indexer_from_xml(response.text)
+            return self.__get_indexer_from_xml(await self.__get(url, params))
         except Exception:
             self.logger.exception("An exception occured while getting indexers from Jackett.")
             return []
@@ -282,7 +243,7 @@ class JackettService:
 
     def __post_process_results(self, results, media):
         for result in results:
-            parsed_result = parse(result.raw_title)
+            parsed_result = parse_title(result.raw_title)
             
             result.parsed_data = parsed_result
             result.languages = detect_languages(result.raw_title)
@@ -1,18 +1,16 @@
-import requests
-
 from stream_fusion.utils.metdata.metadata_provider_base import MetadataProvider
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
 
 
 class Cinemeta(MetadataProvider):
-    def get_metadata(self, id, type):
+    async def get_metadata(self, id, type):
         self.logger.info("Getting metadata for " + type + " with id " + id)
 
         full_id = id.split(":")
 
         url = f"https://v3-cinemeta.strem.io/meta/{type}/{full_id[0]}.json"
-        response = requests.get(url)
+        response = await self.http.get(url)
         data = response.json()
 
         if type == "movie":
@@ -1,4 +1,5 @@
 from stream_fusion.logging_config import logger
+from stream_fusion.services.http import get_http_client
 
 
 class MetadataProvider:
@@ -6,6 +7,7 @@ class MetadataProvider:
     def __init__(self, config):
         self.config = config
         self.logger = logger
+        self.http = get_http_client()
 
     def replace_weird_characters(self, string):
         corresp = {
@@ -31,5 +33,5 @@ class MetadataProvider:
 
         return string
 
-    def get_metadata(self, id, type):
+    async def get_metadata(self, id, type):
         raise NotImplementedError
@@ -1,5 +1,3 @@
-import requests
-
 from stream_fusion.utils.metdata.metadata_provider_base import MetadataProvider
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
@@ -7,7 +5,7 @@ from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
 
 class TMDB(MetadataProvider):
-    def get_metadata(self, id, type):
+    async def get_metadata(self, id, type):
         self.logger.info("Getting metadata for " + type + " with id " + id)
 
         full_id = id.split(":")
@@ -15,8 +13,9 @@ class TMDB(MetadataProvider):
         result = None
 
         for lang in self.config['languages']:
-            url = f"https://api.themoviedb.org/3/find/{full_id[0]}?api_key={settings.tmdb_api_key}&external_source=imdb_id&language={lang}"
-            response = requests.get(url)
+            url = f"https://api.themoviedb.org/3/find/{full_id[0]}"
+            params = {"api_key": settings.tmdb_api_key, "external_source": "imdb_id", "language": lang}
+            response = await self.http.get(url, params=params)
             data = response.json()
             logger.trace(data)
 
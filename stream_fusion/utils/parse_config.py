@@ -1,8 +1,20 @@
+import hashlib
 import json
 
 from stream_fusion.utils.string_encoding import decodeb64
 from stream_fusion.logging_config import logger
 
+# Per user credentials, they never change which streams a config gets.
+CREDENTIAL_KEYS = {
+    "apiKey",
+    "RDToken",
+    "ADToken",
+    "TBToken",
+    "debridKey",
+    "yggPasskey",
+    "sharewoodPasskey",
+}
+
 def parse_config(b64config):
     config = json.loads(decodeb64(b64config))
 
@@ -17,4 +29,11 @@ def parse_config(b64config):
             pass
     if "anonymizeMagnets" not in config:
         config["anonymizeMagnets"] = False
-    return config
\ No newline at end of file
+    return config
+
+
+def config_fingerprint(config):
+    """Hash of the config without its credentials, shared by users with the same settings."""
+    settings_only = {key: value for key, value in config.items() if key not in CREDENTIAL_KEYS}
+    serialized = json.dumps(settings_only, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import threading
+from typing import Iterable
+
+from cachetools import LRUCache
+from redis.exceptions import RedisError
+from RTN import parse
+from RTN.models import ParsedData
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.redis.redis_config import create_redis_cache
+from stream_fusion.settings import settings
+
+# Filters run in worker threads, cachetools caches are not thread safe on their own.
+_lock = threading.Lock()
+_cache = LRUCache(maxsize=settings.parse_cache_size)
+_stats = {"hits": 0, "misses": 0}
+
+
+def parse_title(raw_title: str) -> ParsedData:
+    """
+    ``RTN.parse`` memoized per process.
+
+    The same titles and file names are parsed by every provider, filter and
+    cache hit. ParsedData is never mutated, so the instances are shared.
+    """
+    with _lock:
+        parsed = _cache.get(raw_title)
+        if parsed is not None:
+            _stats["hits"] += 1
+            return parsed
+        _stats["misses"] += 1
+
+    parsed = parse(raw_title)
+    with _lock:
+        _cache[raw_title] = parsed
+    return parsed
+
+
+def rebuild_parsed_data(data: dict) -> ParsedData:
+    """Rebuild a ParsedData stored with ``model_dump`` without parsing or validating it again."""
+    return ParsedData.model_construct(**data)
+
+
+def get_parse_cache_stats() -> dict:
+    with _lock:
+        return {"entries": len(_cache), "max_entries": _cache.maxsize, **_stats}
+
+
+def _redis_key(raw_title: str) -> str:
+    return f"parsed:{hashlib.sha256(raw_title.encode('utf-8')).hexdigest()[:32]}"
+
+
+async def warm_parse_cache(raw_titles: Iterable[str]) -> None:
+    """
+    Load the titles missing from the process cache from Redis, parse the rest
+    and store them back so the other workers do not have to.
+
+    Does nothing unless ``PARSE_CACHE_REDIS`` is enabled.
+    """
+    if not settings.parse_cache_redis:
+        return
+
+    with _lock:
+        missing = list({title for title in raw_titles if title and title not in _cache})
+    if not missing:
+        return
+
+    redis_cache = create_redis_cache()
+    try:
+        cached = await redis_cache.get_many([_redis_key(title) for title in missing])
+        to_parse = []
+        with _lock:
+            for title, data in zip(missing, cached):
+                if data is None:
+                    to_parse.append(title)
+                else:
+                    _cache[title] = rebuild_parsed_data(data)
+
+        if to_parse:
+            parsed = await asyncio.to_thread(lambda: [parse_title(title) for title in to_parse])
+            await redis_cache.set_many(
+                {_redis_key(title): data.model_dump(mode="json") for title, data in zip(to_parse, parsed)},
+                expiration=settings.redis_expiration,
+            )
+        logger.debug(
+            f"ParseCache: {len(missing) - len(to_parse)} titles loaded from Redis, {len(to_parse)} parsed"
+        )
+    except RedisError as e:
+        logger.warning(f"ParseCache: Redis tier unavailable: {e}")
+    finally:
+        await redis_cache.close()
@@ -1,6 +1,4 @@
 import json
-import queue
-import threading
 from typing import List, Dict
 
 from RTN import ParsedData
@@ -14,39 +12,41 @@ from stream_fusion.utils.parser.parser_utils import (
     extract_release_group,
     filter_by_availability,
     filter_by_direct_torrent,
-    get_emoji,
+    get_languages_emoji,
     INSTANTLY_AVAILABLE,
     DOWNLOAD_REQUIRED,
     DIRECT_TORRENT,
 )
 
+# Stands for the user's configb64 in playback URLs of streams shared between users.
+CONFIG_PLACEHOLDER = "__CONFIGB64__"
+
+
+def encode_config(config: Dict) -> str:
+    return encodeb64(json.dumps(config).replace("=", "%3D"))
+
+
+def render_streams(stream_list: List[Dict], configb64: str) -> List[Dict]:
+    """Inject a user's configb64 into streams parsed with ``CONFIG_PLACEHOLDER``."""
+    rendered = []
+    for stream in stream_list:
+        if stream.get("url"):
+            stream = {**stream, "url": stream["url"].replace(CONFIG_PLACEHOLDER, configb64)}
+        rendered.append(stream)
+    return rendered
+
 
 class StreamParser:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, configb64: str = None):
         self.config = config
-        self.configb64 = encodeb64(json.dumps(config).replace("=", "%3D"))
+        self.configb64 = configb64 or encode_config(config)
 
     def parse_to_stremio_streams(
         self, torrent_items: List[TorrentItem], media: Media
     ) -> List[Dict]:
         stream_list = []
-        threads = []
-        thread_results_queue = queue.Queue()
-
         for torrent_item in torrent_items[: int(self.config["maxResults"])]:
-            thread = threading.Thread(
-                target=self._parse_to_debrid_stream,
-                args=(torrent_item, thread_results_queue, media),
-                daemon=True,
-            )
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
-
-        while not thread_results_queue.empty():
-            stream_list.append(thread_results_queue.get())
+            stream_list.extend(self._parse_to_debrid_stream(torrent_item, media))
 
         if self.config["debrid"]:
             stream_list = sorted(stream_list, key=filter_by_availability)
@@ -55,8 +55,8 @@ class StreamParser:
         return stream_list
 
     def _parse_to_debrid_stream(
-        self, torrent_item: TorrentItem, results: queue.Queue, media: Media
-    ) -> None:
+        self, torrent_item: TorrentItem, media: Media
+    ) -> List[Dict]:
         parsed_data: ParsedData = torrent_item.parsed_data
         name = self._create_stream_name(torrent_item, parsed_data)
         title = self._create_stream_title(torrent_item, parsed_data, media)
@@ -65,7 +65,7 @@ class StreamParser:
             json.dumps(torrent_item.to_debrid_stream_query(media))
         ).replace("=", "%3D")
 
-        results.put(
+        streams = [
             {
                 "name": name,
                 "description": title,
@@ -75,10 +75,13 @@ class StreamParser:
                     "filename": torrent_item.file_name or torrent_item.raw_title,
                 },
             }
-        )
+        ]
 
         if self.config["torrenting"] and torrent_item.privacy == "public":
-            self._add_direct_torrent_stream(torrent_item, parsed_data, title, results)
+            streams.append(
+                self._create_direct_torrent_stream(torrent_item, parsed_data, title)
+            )
+        return streams
 
     def _create_stream_name(
         self, torrent_item: TorrentItem, parsed_data: ParsedData
@@ -112,7 +115,7 @@ class StreamParser:
         self, torrent_item: TorrentItem, parsed_data: ParsedData
     ) -> str:
         info = (
-            "/".join(get_emoji(lang) for lang in torrent_item.languages)
+            get_languages_emoji(tuple(torrent_item.languages))
             if torrent_item.languages
             else "🌐"
         )
@@ -141,28 +144,25 @@ class StreamParser:
             info.append(f"🎧 {' '.join(parsed_data.audio)}")
         return " ".join(info) + "\n" if info else ""
 
-    def _add_direct_torrent_stream(
+    def _create_direct_torrent_stream(
         self,
         torrent_item: TorrentItem,
         parsed_data: ParsedData,
         title: str,
-        results: queue.Queue,
-    ) -> None:
+    ) -> Dict:
         direct_torrent_name = f"{DIRECT_TORRENT}\n{parsed_data.quality}\n"
         if parsed_data.quality and parsed_data.quality[0] not in ["Unknown", ""]:
             direct_torrent_name += f"({'|'.join(parsed_data.quality)})"
 
-        results.put(
-            {
-                "name": direct_torrent_name,
-                "description": title,
-                "infoHash": torrent_item.info_hash,
-                "fileIdx": (
-                    int(torrent_item.file_index) if torrent_item.file_index else None
-                ),
-                "behaviorHints": {
-                    "bingeGroup": f"stream-fusion-{torrent_item.info_hash}",
-                    "filename": torrent_item.file_name or torrent_item.raw_title,
-                },
-            }
-        )
+        return {
+            "name": direct_torrent_name,
+            "description": title,
+            "infoHash": torrent_item.info_hash,
+            "fileIdx": (
+                int(torrent_item.file_index) if torrent_item.file_index else None
+            ),
+            "behaviorHints": {
+                "bingeGroup": f"stream-fusion-{torrent_item.info_hash}",
+                "filename": torrent_item.file_name or torrent_item.raw_title,
+            },
+        }
@@ -1,19 +1,24 @@
-import re
-from typing import Dict
-from stream_fusion.constants import FR_RELEASE_GROUPS, FRENCH_PATTERNS
+from functools import lru_cache
+from typing import Dict, Tuple
+from stream_fusion.utils.detection import get_title_features
 
 INSTANTLY_AVAILABLE = "⚡"
 DOWNLOAD_REQUIRED = "⬇️​​"
 DIRECT_TORRENT = "🏴‍☠️"
 
+EMOJI_DICT = {
+    "fr": "🇫🇷 FR", "en": "🇬🇧 EN", "es": "🇪🇸 ES",
+    "de": "🇩🇪 GR", "it": "🇮🇹 IT", "pt": "🇵🇹 PO",
+    "ru": "🇷🇺 RU", "in": "🇮🇳 IN", "nl": "🇳🇱 DU",
+    "hu": "🇭🇺 HU", "la": "🇲🇽 LA", "multi": "🌍 MULTi",
+}
+
 def get_emoji(language: str) -> str:
-    emoji_dict = {
-        "fr": "🇫🇷 FR", "en": "🇬🇧 EN", "es": "🇪🇸 ES",
-        "de": "🇩🇪 GR", "it": "🇮🇹 IT", "pt": "🇵🇹 PO",
-        "ru": "🇷🇺 RU", "in": "🇮🇳 IN", "nl": "🇳🇱 DU",
-        "hu": "🇭🇺 HU", "la": "🇲🇽 LA", "multi": "🌍 MULTi",
-    }
-    return emoji_dict.get(language, "🇬🇧")
+    return EMOJI_DICT.get(language, "🇬🇧")
+
+@lru_cache(maxsize=1024)
+def get_languages_emoji(languages: Tuple[str, ...]) -> str:
+    return "/".join(get_emoji(language) for language in languages)
 
 def filter_by_availability(item: Dict) -> int:
     return 0 if item["name"].startswith(INSTANTLY_AVAILABLE) else 1
@@ -22,12 +27,7 @@ def filter_by_direct_torrent(item: Dict) -> int:
     return 1 if item["name"].startswith(DIRECT_TORRENT) else 0
 
 def extract_release_group(title: str) -> str:
-    combined_pattern = "|".join(FR_RELEASE_GROUPS)
-    match = re.search(combined_pattern, title)
-    return match.group(0) if match else None
+    return get_title_features(title).release_group
 
 def detect_french_language(title: str) -> str:
-    for language, pattern in FRENCH_PATTERNS.items():
-        if re.search(pattern, title, re.IGNORECASE):
-            return language
-    return None
\ No newline at end of file
+    return get_title_features(title).french_language
\ No newline at end of file
@@ -0,0 +1,5 @@
+from stream_fusion.utils.search.search_cache import CachedSearch, SearchResultCache
+from stream_fusion.utils.search.search_orchestrator import SearchOrchestrator
+
+
+__all__ = ["CachedSearch", "SearchOrchestrator", "SearchResultCache"]
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import List, Optional, Union
+
+from stream_fusion.logging_config import logger
+from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
+from stream_fusion.services.redis.redis_config import create_redis_cache
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.single_flight import SingleFlight
+from stream_fusion.utils.filter_results import merge_items
+from stream_fusion.utils.models.movie import Movie
+from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.search.search_orchestrator import SearchOrchestrator
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+from stream_fusion.utils.torrent.torrent_service import TorrentService
+
+# Keep a reference on background refreshes so they are not garbage collected mid-flight.
+_background_tasks = set()
+
+
+class CachedSearch:
+    """Raw search results read back from the cache, with the time they were stored."""
+
+    def __init__(self, results: List[TorrentItem], timestamp: float):
+        self.results = results
+        self.timestamp = timestamp
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class SearchResultCache:
+    """
+    Stale-while-revalidate cache for raw search results.
+
+    Entries are stored as ``{"timestamp", "results"}`` and kept in Redis for the
+    hard TTL (``REDIS_EXPIRATION``). Past the soft TTL an entry is still served,
+    but a refresh is started in the background. Entries that are too small are
+    topped up: a new search is merged into them instead of replacing them.
+    """
+
+    def __init__(
+        self,
+        redis_cache: RedisCache,
+        session_factory,
+        soft_ttl: int = settings.search_cache_soft_ttl,
+        hard_ttl: int = settings.redis_expiration,
+    ):
+        self.redis_cache = redis_cache
+        self.session_factory = session_factory
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.logger = logger
+
+    async def get(self, key: str) -> Optional[CachedSearch]:
+        entry = await self.redis_cache.get(key)
+        if entry is None:
+            return None
+        if isinstance(entry, list):
+            # Entries written before the envelope existed, refresh them on first read.
+            entry = {"timestamp": 0, "results": entry}
+        results = [TorrentItem.from_dict(item) for item in entry["results"]]
+        return CachedSearch([item for item in results if item is not None], entry["timestamp"])
+
+    async def set(self, key: str, results: List[TorrentItem]) -> None:
+        entry = {"timestamp": time.time(), "results": [item.to_dict() for item in results]}
+        await self.redis_cache.set(key, entry, expiration=self.hard_ttl)
+
+    def is_stale(self, entry: CachedSearch) -> bool:
+        return entry.age > self.soft_ttl
+
+    async def search(
+        self,
+        key: str,
+        media: Union[Movie, Series],
+        config: dict,
+        torrent_dao: TorrentItemDAO,
+        cached: Optional[List[TorrentItem]] = None,
+        existing: Optional[List[TorrentItem]] = None,
+    ) -> List[TorrentItem]:
+        """
+        Search the providers and store the results under ``key``.
+
+        ``existing`` seeds the search (see ``SearchOrchestrator.search``) and the
+        new results are merged into ``cached`` when given, for a top-up.
+        """
+        torrent_service = TorrentService(config, torrent_dao)
+        results = await SearchOrchestrator(config, torrent_service).search(media, existing)
+        if cached:
+            results = merge_items(cached, results)
+        await self.set(key, results)
+        self.logger.info(f"SearchCache: Stored {len(results)} results for {key}")
+        return results
+
+    async def load(self, key: str) -> Optional[List[TorrentItem]]:
+        entry = await self.get(key)
+        return entry.results if entry is not None else None
+
+    def refresh_in_background(
+        self,
+        key: str,
+        media: Union[Movie, Series],
+        config: dict,
+        cached: Optional[List[TorrentItem]] = None,
+        existing: Optional[List[TorrentItem]] = None,
+    ) -> None:
+        task = asyncio.create_task(self._refresh(key, media, config, cached, existing))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _refresh(self, key, media, config, cached, existing) -> None:
+        # The request's Redis client and DB session are closed once the response
+        # is sent, so the refresh opens its own.
+        redis_cache = create_redis_cache()
+        session = self.session_factory()
+        try:
+            search_cache = SearchResultCache(
+                redis_cache, self.session_factory, self.soft_ttl, self.hard_ttl
+            )
+
+            async def refresh():
+                await search_cache.search(
+                    key, media, config, TorrentItemDAO(session), cached, existing
+                )
+                await session.commit()
+
+            if await SingleFlight(redis_cache).run_if_idle(key, refresh):
+                self.logger.success(f"SearchCache: Background refresh of {key} completed")
+        except Exception as e:
+            self.logger.error(f"SearchCache: Background refresh of {key} failed: {e}")
+            await session.rollback()
+        finally:
+            await session.close()
+            await redis_cache.close()
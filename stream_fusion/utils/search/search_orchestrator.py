@@ -0,0 +1,192 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.cache import search_public
+from stream_fusion.utils.filter_results import filter_items, merge_items
+from stream_fusion.utils.jackett.jackett_result import JackettResult
+from stream_fusion.utils.jackett.jackett_service import JackettService
+from stream_fusion.utils.models.movie import Movie
+from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.sharewood.sharewood_service import SharewoodService
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+from stream_fusion.utils.torrent.torrent_service import TorrentService
+from stream_fusion.utils.yggfilx.yggflix_service import YggflixService
+from stream_fusion.utils.zilean.zilean_result import ZileanResult
+from stream_fusion.utils.zilean.zilean_service import ZileanService
+
+
+class SearchOrchestrator:
+    """
+    Fan out a media search to every enabled provider at once.
+
+    All providers start together and share a single deadline. Their results are
+    converted and merged in completion order, and as soon as the merged list
+    reaches ``minCachedResults`` the providers still running are cancelled.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        torrent_service: TorrentService,
+        timeout: float = settings.search_timeout,
+    ):
+        self.config = config
+        self.torrent_service = torrent_service
+        self.timeout = timeout
+        self.min_results = int(config.get("minCachedResults", 5))
+        self.logger = logger
+
+    def _get_providers(self) -> Dict[str, Callable]:
+        providers = {}
+        if self.config.get("cache"):
+            providers["Public cache"] = self._search_public_cache
+        if self.config.get("yggflix"):
+            providers["YggFlix"] = self._search_yggflix
+        if self.config.get("zilean"):
+            providers["Zilean"] = self._search_zilean
+        if self.config.get("sharewood"):
+            providers["Sharewood"] = self._search_sharewood
+        if self.config.get("jackett"):
+            providers["Jackett"] = self._search_jackett
+        return providers
+
+    async def search(
+        self,
+        media: Union[Movie, Series],
+        existing: Optional[List[TorrentItem]] = None,
+    ) -> List[TorrentItem]:
+        """
+        Search every provider, merging into ``existing`` results if given.
+
+        Existing results count towards ``minCachedResults``, so topping up a
+        small cached list stops as soon as enough new results came in.
+        """
+        providers = self._get_providers()
+        if not providers:
+            self.logger.warning("Search: No search provider enabled in config")
+            return []
+
+        self.logger.info(
+            f"Search: Starting concurrent search on {', '.join(providers)}"
+        )
+        start = time.time()
+        tasks = {
+            asyncio.create_task(provider(media)): name
+            for name, provider in providers.items()
+        }
+        pending = set(tasks)
+        search_results = list(existing or [])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.logger.warning(
+                        f"Search: Deadline of {self.timeout}s reached, dropping {', '.join(tasks[task] for task in pending)}"
+                    )
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    search_results = await self._merge_provider_results(
+                        tasks[task], task, search_results
+                    )
+
+                if pending and len(search_results) >= self.min_results:
+                    self.logger.info(
+                        f"Search: {len(search_results)} results reached minCachedResults, cancelling {', '.join(tasks[task] for task in pending)}"
+                    )
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self.logger.success(
+            f"Search: Concurrent search found {len(search_results)} results in {time.time() - start:.2f} seconds"
+        )
+        return search_results
+
+    async def _merge_provider_results(
+        self, name: str, task: asyncio.Task, search_results: List[TorrentItem]
+    ) -> List[TorrentItem]:
+        try:
+            provider_results = task.result()
+        except Exception as e:
+            self.logger.error(f"Search: {name} search failed: {e}", exc_info=True)
+            return search_results
+
+        if not provider_results:
+            self.logger.info(f"Search: No usable results from {name}")
+            return search_results
+
+        torrent_items = await self.torrent_service.convert_and_process(
+            provider_results
+        )
+        self.logger.success(
+            f"Search: Merging {len(torrent_items)} results from {name}"
+        )
+        return merge_items(search_results, torrent_items)
+
+    async def _filter(self, items, media):
+        # filter_items is CPU bound, keep it off the event loop.
+        return await asyncio.to_thread(filter_items, items, media, config=self.config)
+
+    async def _search_public_cache(self, media):
+        public_cached_results = await search_public(media)
+        if not public_cached_results:
+            return []
+        self.logger.success(
+            f"Search: Found {len(public_cached_results)} public cached results"
+        )
+        public_cached_results = [
+            JackettResult().from_cached_item(torrent, media)
+            for torrent in public_cached_results
+            if len(torrent.get("hash", "")) == 40
+        ]
+        return await self._filter(public_cached_results, media)
+
+    async def _search_yggflix(self, media):
+        yggflix_search_results = await YggflixService(self.config).search(media)
+        if not yggflix_search_results:
+            return []
+        self.logger.success(
+            f"Search: Found {len(yggflix_search_results)} results from YggFlix"
+        )
+        return await self._filter(yggflix_search_results, media)
+
+    async def _search_zilean(self, media):
+        zilean_search_results = await ZileanService(self.config).search(media)
+        if not zilean_search_results:
+            return []
+        self.logger.success(
+            f"Search: Found {len(zilean_search_results)} results from Zilean"
+        )
+        zilean_search_results = [
+            ZileanResult().from_api_cached_item(torrent, media)
+            for torrent in zilean_search_results
+            if len(getattr(torrent, "info_hash", "")) == 40
+        ]
+        return await self._filter(zilean_search_results, media)
+
+    async def _search_sharewood(self, media):
+        sharewood_search_results = await SharewoodService(self.config).search(media)
+        if not sharewood_search_results:
+            return []
+        self.logger.success(
+            f"Search: Found {len(sharewood_search_results)} results from Sharewood"
+        )
+        return await self._filter(sharewood_search_results, media)
+
+    async def _search_jackett(self, media):
+        jackett_search_results = await JackettService(self.config).search(media)
+        self.logger.success(
+            f"Search: Found {len(jackett_search_results)} results from Jackett"
+        )
+        return await self._filter(jackett_search_results, media)
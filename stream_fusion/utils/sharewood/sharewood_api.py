@@ -1,8 +1,10 @@
+import asyncio
+import functools
 import time
-from urllib3.util.retry import Retry
-import requests
-from requests.adapters import HTTPAdapter
 
+import aiohttp
+
+from stream_fusion.services.http import get_http_client
 from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
 
@@ -11,15 +13,18 @@ class RateLimiter:
     def __init__(self, calls_per_second=1):
         self.calls_per_second = calls_per_second
         self.last_call = 0
+        self.lock = asyncio.Lock()
 
     def __call__(self, func):
-        def wrapper(*args, **kwargs):
-            now = time.time()
-            time_since_last_call = now - self.last_call
-            if time_since_last_call < 1 / self.calls_per_second:
-                time.sleep(1 / self.calls_per_second - time_since_last_call)
-            self.last_call = time.time()
-            return func(*args, **kwargs)
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with self.lock:
+                now = time.monotonic()
+                time_since_last_call = now - self.last_call
+                if time_since_last_call < 1 / self.calls_per_second:
+                    await asyncio.sleep(1 / self.calls_per_second - time_since_last_call)
+                self.last_call = time.monotonic()
+            return await func(*args, **kwargs)
 
         return wrapper
 
@@ -28,8 +33,6 @@ class SharewoodAPI:
     def __init__(
         self,
         sharewood_passkey: str,
-        pool_connections=10,
-        pool_maxsize=10,
         max_retries=3,
         timeout=10,
     ):
@@ -38,37 +41,26 @@ class SharewoodAPI:
             raise ValueError("Sharewood passkey must be 32 characters long")
         self.sharewood_passkey = sharewood_passkey
         self.timeout = timeout
-        self.session = requests.Session()
-        self.rate_limiter = RateLimiter(calls_per_second=1)
-
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=0.1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-        )
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retry_strategy,
-        )
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.max_retries = max_retries
+        self.http = get_http_client()
 
     @RateLimiter()
-    def _make_request(self, method, endpoint, params=None):
+    async def _make_request(self, method, endpoint, params=None):
         url = f"{self.base_url}/{self.sharewood_passkey}/{endpoint}"
         try:
-            response = self.session.request(
-                method, url, params=params, timeout=self.timeout
+            response = await self.http.request(
+                method,
+                url,
+                params=params,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
             )
-            response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"An error occurred during the request: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"An error occurred during the request: {e!r}")
             raise
 
-    def get_last_torrents(self, category=None, subcategory=None, limit=25):
+    async def get_last_torrents(self, category=None, subcategory=None, limit=25):
         """Get the last torrents, optionally filtered by category or subcategory."""
         params = {}
         if category:
@@ -77,57 +69,55 @@ class SharewoodAPI:
             params["subcategory"] = subcategory
         if limit and 1 <= limit <= 25:
             params["limit"] = limit
-        return self._make_request("GET", "last-torrents", params=params)
+        return await self._make_request("GET", "last-torrents", params=params)
 
-    def search(self, query, category=None, subcategory=None):
+    async def search(self, query, category=None, subcategory=None):
         """Search for torrents, optionally filtered by category or subcategory."""
         params = {"name": query}
         if category:
             params["category"] = category
         if subcategory:
             params["subcategory"] = subcategory
-        return self._make_request("GET", "search", params=params)
+        return await self._make_request("GET", "search", params=params)
 
-    def get_video_torrents(self, limit=25):
+    async def get_video_torrents(self, limit=25):
         """Get the last video torrents."""
-        return self.get_last_torrents(category=1, limit=limit)
+        return await self.get_last_torrents(category=1, limit=limit)
 
-    def get_audio_torrents(self, limit=25):
+    async def get_audio_torrents(self, limit=25):
         """Get the last audio torrents."""
-        return self.get_last_torrents(category=2, limit=limit)
+        return await self.get_last_torrents(category=2, limit=limit)
 
-    def get_application_torrents(self, limit=25):
+    async def get_application_torrents(self, limit=25):
         """Get the last application torrents."""
-        return self.get_last_torrents(category=3, limit=limit)
+        return await self.get_last_torrents(category=3, limit=limit)
 
-    def get_ebook_torrents(self, limit=25):
+    async def get_ebook_torrents(self, limit=25):
         """Get the last ebook torrents."""
-        return self.get_last_torrents(category=4, limit=limit)
+        return await self.get_last_torrents(category=4, limit=limit)
 
-    def get_game_torrents(self, limit=25):
+    async def get_game_torrents(self, limit=25):
         """Get the last game torrents."""
-        return self.get_last_torrents(category=5, limit=limit)
+        return await self.get_last_torrents(category=5, limit=limit)
 
-    def get_training_torrents(self, limit=25):
+    async def get_training_torrents(self, limit=25):
         """Get the last training torrents."""
-        return self.get_last_torrents(category=6, limit=limit)
+        return await self.get_last_torrents(category=6, limit=limit)
 
-    def get_adult_torrents(self, limit=25):
+    async def get_adult_torrents(self, limit=25):
         """Get the last adult torrents."""
-        return self.get_last_torrents(category=7, limit=limit)
+        return await self.get_last_torrents(category=7, limit=limit)
 
     @RateLimiter()
-    def download_torrent(self, torrent_id):
+    async def download_torrent(self, torrent_id):
         """Download a specific torrent file."""
         url = f"{self.base_url}/{self.sharewood_passkey}/{torrent_id}/download"
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = await self.http.get(
+                url, timeout=self.timeout, max_retries=self.max_retries
+            )
             return response.content
-        except requests.exceptions.RequestException as e:
-            logger.error(f"An error occurred while downloading the torrent: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"An error occurred while downloading the torrent: {e!r}")
             raise
 
-    def __del__(self):
-        """Close the session when the object is destroyed."""
-        self.session.close()
@@ -1,7 +1,7 @@
 import re
 import urllib.parse
 from typing import List, Union
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import parse_title, warm_parse_cache
 
 from stream_fusion.logging_config import logger
 from stream_fusion.utils.detection import detect_languages
@@ -23,7 +23,7 @@ class SharewoodService:
             self.sharewood_passkey = config.get("sharewoodPasskey")
         self.sharewood = SharewoodAPI(self.sharewood_passkey)
 
-    def search(self, media: Union[Movie, Series]) -> List[SharewoodResult]:
+    async def search(self, media: Union[Movie, Series]) -> List[SharewoodResult]:
         """
         Search for a media (movie or series) on sharewood.
 
@@ -37,12 +37,13 @@ class SharewoodService:
             TypeError: If the media type is neither Movie nor Series.
         """
         if isinstance(media, Movie):
-            results = self.__search_movie(media)
+            results = await self.__search_movie(media)
         elif isinstance(media, Series):
-            results = self.__search_series(media)
+            results = await self.__search_series(media)
         else:
             raise TypeError("Only Movie and Series types are allowed as media!")
 
+        await warm_parse_cache(result.get("name") for result in results or [])
         return self.__post_process_results(results, media)
 
     def __convert_size(self, size):
@@ -156,15 +157,15 @@ class SharewoodService:
             if not (title.lower() in seen or seen.add(title.lower()))
         ]
 
-    def __search_movie(self, movie: Movie) -> List[dict]:
+    async def __search_movie(self, movie: Movie) -> List[dict]:
         unique_titles = self.__remove_duplicate_titles(movie.titles)
         clean_titles = [self.__clean_title(title) for title in unique_titles]
         results = []
         for title in clean_titles:
-            results.extend(self.sharewood.search(query=title, category=1))
+            results.extend(await self.sharewood.search(query=title, category=1))
         return self.__deduplicate_api_results(results)
 
-    def __search_series(self, series: Series) -> List[dict]:
+    async def __search_series(self, series: Series) -> List[dict]:
         unique_titles = self.__remove_duplicate_titles(series.titles)
         clean_titles = [self.__clean_title(title) for title in unique_titles]
         search_texts = clean_titles.copy()
@@ -176,7 +177,7 @@ class SharewoodService:
 
         results = []
         for text in search_texts:
-            results.extend(self.sharewood.search(query=text, category=1))
+            results.extend(await self.sharewood.search(query=text, category=1))
         return self.__deduplicate_api_results(results)
 
     def __filter_out_no_seeders(self, results: List[dict]) -> List[dict]:
@@ -224,7 +225,7 @@ class SharewoodService:
             item.privacy = "private"
             item.languages = detect_languages(item.raw_title, default_language="fr")
             item.type = media.type
-            item.parsed_data = parse(item.raw_title)
+            item.parsed_data = parse_title(item.raw_title)
 
             items.append(item)
 
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order.
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 0
+            self.updated_at = time.monotonic()
+
+
+class HostRateLimiter:
+    """
+    One token bucket per upstream site.
+
+    Jackett serves every indexer from the same host, so its ``/dl/<indexer>/``
+    links get a bucket per indexer rather than a single one for Jackett.
+    """
+
+    def __init__(self, default_rate: float, rates: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        parts = urlsplit(url)
+        path = parts.path.split("/")
+        if len(path) > 2 and path[1] == "dl":
+            return f"{parts.netloc}/dl/{path[2]}"
+        return parts.netloc
+
+    async def acquire(self, url: str):
+        key = self.get_key(url)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            host = urlsplit(url).netloc
+            bucket = TokenBucket(self.rates.get(host, self.default_rate))
+            self.buckets[key] = bucket
+        await bucket.acquire()
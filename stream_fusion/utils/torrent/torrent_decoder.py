@@ -0,0 +1,56 @@
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bencode
+
+# This module is imported by the worker processes, keep its imports light.
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def decode_torrent(torrent_file: bytes) -> dict:
+    """
+    Decode a .torrent file and compute its info hash.
+
+    Only the fields TorrentService uses are returned, so the piece hashes
+    never travel back from the worker process.
+    """
+    metadata = bencode.bdecode(torrent_file)
+    info = metadata["info"]
+
+    decoded = {
+        "info_hash": hashlib.sha1(bencode.bencode(info)).hexdigest().lower(),
+        "info": {"name": info["name"]},
+    }
+    for key in ("announce", "announce-list"):
+        if key in metadata:
+            decoded[key] = metadata[key]
+    if "files" in info:
+        decoded["info"]["files"] = info["files"]
+    return decoded
+
+
+def init_torrent_decoder(max_workers: int) -> None:
+    global _executor
+    if max_workers > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+
+def shutdown_torrent_decoder() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def decode_torrent_file(torrent_file: bytes) -> dict:
+    """Run decode_torrent in the worker pool, or in a thread when no pool is configured."""
+    if _executor is None:
+        return await asyncio.to_thread(decode_torrent, torrent_file)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, decode_torrent, torrent_file)
@@ -1,4 +1,4 @@
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import parse_title, rebuild_parsed_data
 from RTN.models import ParsedData
 from urllib.parse import quote
 
@@ -64,6 +64,7 @@ class TorrentItem:
             'file_index': self.file_index,
             'full_index': self.full_index,
             'availability': self.availability,
+            'parsed_data': self.parsed_data.model_dump() if self.parsed_data else None,
         }
     
     @classmethod
@@ -93,6 +94,8 @@ class TorrentItem:
         instance.full_index = data['full_index']
         instance.availability = data['availability']
         
-        instance.parsed_data = parse(instance.raw_title)
+        # Entries cached before parsed_data was stored still need parsing.
+        parsed_data = data.get('parsed_data')
+        instance.parsed_data = rebuild_parsed_data(parsed_data) if parsed_data else parse_title(instance.raw_title)
 
         return instance
@@ -1,29 +1,41 @@
+import asyncio
 import hashlib
 import os
-import time
 import urllib.parse
-from typing import List
+from typing import Dict, List
 
-import bencode
-import requests
-from RTN import parse
+import aiohttp
+from stream_fusion.utils.parser.parse_cache import parse_title
 
+from stream_fusion.services.http import get_http_client
 from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
 from stream_fusion.utils.jackett.jackett_result import JackettResult
 from stream_fusion.utils.sharewood.sharewood_result import SharewoodResult
 from stream_fusion.utils.zilean.zilean_result import ZileanResult
 from stream_fusion.utils.yggfilx.yggflix_result import YggflixResult
+from stream_fusion.utils.torrent.host_rate_limiter import HostRateLimiter
+from stream_fusion.utils.torrent.torrent_decoder import decode_torrent_file
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.utils.general import get_info_hash_from_magnet
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
+# Shared by every search of the worker so site limits hold across concurrent requests.
+host_rate_limiter = HostRateLimiter(
+    default_rate=settings.torrent_fetch_rate,
+    rates={
+        urllib.parse.urlsplit(settings.sharewood_url).netloc: 1,  # API limit 1 request per second
+        urllib.parse.urlsplit(settings.yggflix_url).netloc: 10,  # fair usage for small VPS
+    },
+)
+
+
 class TorrentService:
     def __init__(self, config, torrent_dao: TorrentItemDAO):
         self.config = config
         self.torrent_dao = torrent_dao
         self.logger = logger
-        self.__session = requests.Session()
+        self.__http = get_http_client()
 
     @staticmethod
     def __generate_unique_id(raw_title: str, indexer: str = "cached") -> str:
@@ -31,117 +43,128 @@ class TorrentService:
         full_hash = hashlib.sha256(unique_string.encode()).hexdigest()
         return full_hash[:16]
 
-    async def get_cached_torrent(self, raw_title: str, indexer: str) -> TorrentItem | None:
-        unique_id = self.__generate_unique_id(raw_title, indexer)
+    async def get_cached_torrents(self, unique_ids: List[str]) -> Dict[str, TorrentItem]:
         try:
-            cached_item = await self.torrent_dao.get_torrent_item_by_id(unique_id)
-            if cached_item:
-                return cached_item.to_torrent_item()
-            return None
+            cached_items = await self.torrent_dao.get_torrent_items_by_ids(unique_ids)
+            return {cached_item.id: cached_item.to_torrent_item() for cached_item in cached_items}
         except Exception as e:
-            self.logger.error(f"Error getting cached torrent: {e}")
-            return None
+            self.logger.error(f"Error getting cached torrents: {e}")
+            return {}
 
-    async def cache_torrent(self, torrent_item: TorrentItem, id: str = None):
-        unique_id = self.__generate_unique_id(torrent_item.raw_title, torrent_item.indexer)
-        await self.torrent_dao.create_torrent_item(torrent_item, unique_id)
+    async def cache_torrents(self, torrent_items: Dict[str, TorrentItem]):
+        await self.torrent_dao.upsert_torrent_items(torrent_items)
 
     async def convert_and_process(self, results: List[JackettResult | ZileanResult | YggflixResult | SharewoodResult]):
-        torrent_items_result = []
-
-        for result in results:
-            torrent_item = result.convert_to_torrent_item()
-
-            cached_item = await self.get_cached_torrent(torrent_item.raw_title, torrent_item.indexer)
-            if cached_item:
-                torrent_items_result.append(cached_item)
-                continue
-
-            if torrent_item.link.startswith("magnet:"):
-                processed_torrent_item = self.__process_magnet(torrent_item)
-            elif settings.sharewood_url and torrent_item.link.startswith(settings.sharewood_url):
-                processed_torrent_item = self.__process_sharewood_web_url(torrent_item)
-            elif settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
-                processed_torrent_item = self.__process_ygg_api_url(torrent_item)
-            else:
-                processed_torrent_item = self.__process_web_url(torrent_item)
-
-            await self.cache_torrent(processed_torrent_item)
-            torrent_items_result.append(processed_torrent_item)
-
-        return torrent_items_result
+        torrent_items = [result.convert_to_torrent_item() for result in results]
+        unique_ids = [self.__generate_unique_id(item.raw_title, item.indexer) for item in torrent_items]
+        cached_items = await self.get_cached_torrents(list(set(unique_ids)))
+        self.logger.debug(f"Found {len(cached_items)} of {len(torrent_items)} torrents in database")
+
+        misses = {}
+        for unique_id, torrent_item in zip(unique_ids, torrent_items):
+            if unique_id not in cached_items and unique_id not in misses:
+                misses[unique_id] = torrent_item
+
+        new_items = await self.__process_torrent_items(misses)
+        await self.cache_torrents(new_items)
+        return [cached_items.get(unique_id) or new_items[unique_id] for unique_id in unique_ids]
+
+    async def __process_torrent_items(self, torrent_items: Dict[str, TorrentItem]) -> Dict[str, TorrentItem]:
+        semaphore = asyncio.Semaphore(settings.torrent_fetch_concurrency)
+
+        async def process(torrent_item):
+            async with semaphore:
+                return await self.__process_torrent_item(torrent_item)
+
+        processed_items = await asyncio.gather(*(process(item) for item in torrent_items.values()))
+        return dict(zip(torrent_items, processed_items))
+
+    async def __process_torrent_item(self, torrent_item: TorrentItem) -> TorrentItem:
+        if torrent_item.link.startswith("magnet:"):
+            return self.__process_magnet(torrent_item)
+        elif settings.sharewood_url and torrent_item.link.startswith(settings.sharewood_url):
+            return await self.__process_sharewood_web_url(torrent_item)
+        elif settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
+            return await self.__process_ygg_api_url(torrent_item)
+        else:
+            return await self.__process_web_url(torrent_item)
         
-    def __process_sharewood_web_url(self, result: TorrentItem):
+    async def __fetch_torrent_url(self, url: str, **kwargs):
+        await host_rate_limiter.acquire(url)
+        return await self.__http.get(url, max_retries=0, raise_for_status=False, **kwargs)
+
+    async def __process_sharewood_web_url(self, result: TorrentItem):
         if not self.config["sharewood"]:
             logger.error("Sharewood is not enabled in the config. Skipping processing of Sharewood URL.")
         
         try:
-            time.sleep(1) # API limit 1 request per second
-            response = self.__session.get(result.link, allow_redirects=True, timeout=5)
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
+            response = await self.__fetch_torrent_url(result.link, allow_redirects=True, timeout=5)
+        except asyncio.TimeoutError:
             self.logger.error(f"Timeout while processing url: {result.link}")
             return result
+        except aiohttp.ClientError:
+            self.logger.error(f"Error while processing url: {result.link}")
+            return result
         
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
+        if response.status == 200:
+            return await self.__process_torrent(result, response.content)
         else:
-            self.logger.error(f"Error code {response.status_code} while processing sharewood url: {result.link}")
+            self.logger.error(f"Error code {response.status} while processing sharewood url: {result.link}")
 
         return result
 
 
-    def __process_ygg_api_url(self, result: TorrentItem): 
+    async def __process_ygg_api_url(self, result: TorrentItem): 
         if not self.config["yggflix"]:
             logger.error("Yggflix is not enabled in the config. Skipping processing of Yggflix URL.")
         try:
-            response = self.__session.get(result.link, timeout=10)
-            time.sleep(0.1) # Add a delay of 0.1 seconds between requests faire usage for small VPS
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
+            response = await self.__fetch_torrent_url(result.link, timeout=10)
+        except asyncio.TimeoutError:
             self.logger.error(f"Timeout while processing url: {result.link}")
             return result
+        except aiohttp.ClientError:
+            self.logger.error(f"Error while processing url: {result.link}")
+            return result
         
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        elif response.status_code == 422:
+        if response.status == 200:
+            return await self.__process_torrent(result, response.content)
+        elif response.status == 422:
             self.logger.info(f"Not aviable torrent on yggflix: {result.file_name}")
         else:
-            self.logger.error(f"Error code {response.status_code} while processing ygg url: {result.link}")
+            self.logger.error(f"Error code {response.status} while processing ygg url: {result.link}")
 
         return result
 
-    def __process_web_url(self, result: TorrentItem):
+    async def __process_web_url(self, result: TorrentItem):
         try:
-            time.sleep(0.2)
-            response = self.__session.get(result.link, allow_redirects=False, timeout=40) # flaresolverr and Jackett timeouts
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
+            response = await self.__fetch_torrent_url(result.link, allow_redirects=False, timeout=40) # flaresolverr and Jackett timeouts
+        except asyncio.TimeoutError:
             self.logger.error(f"Timeout while processing url: {result.link}")
             return result
+        except aiohttp.ClientError:
+            self.logger.error(f"Error while processing url: {result.link}")
+            return result
 
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        elif response.status_code == 302:
+        if response.status == 200:
+            return await self.__process_torrent(result, response.content)
+        elif response.status == 302:
             result.magnet = response.headers['Location']
             return self.__process_magnet(result)
         else:
-            self.logger.error(f"Error code {response.status_code} while processing url: {result.link}")
+            self.logger.error(f"Error code {response.status} while processing url: {result.link}")
 
         return result
 
-    def __process_torrent(self, result: TorrentItem, torrent_file):
-        metadata = bencode.bdecode(torrent_file)
+    async def __process_torrent(self, result: TorrentItem, torrent_file):
+        try:
+            metadata = await decode_torrent_file(torrent_file)
+        except Exception as e:
+            self.logger.error(f"Invalid torrent file from url: {result.link} ({e})")
+            return result
 
         result.torrent_download = result.link
         result.trackers = self.__get_trackers_from_torrent(metadata)
-        result.info_hash = self.__convert_torrent_to_hash(metadata["info"])
+        result.info_hash = metadata["info_hash"]
         result.magnet = self.__build_magnet(result.info_hash, metadata["info"]["name"], result.trackers)
 
         if "files" not in metadata["info"]:
@@ -178,11 +201,6 @@ class TorrentService:
 
         return result
 
-    def __convert_torrent_to_hash(self, torrent_contents):
-        hashcontents = bencode.bencode(torrent_contents)
-        hexHash = hashlib.sha1(hashcontents).hexdigest()
-        return hexHash.lower()
-
     def __build_magnet(self, hash, display_name, trackers):
         magnet_base = "magnet:?xt=urn:btih:"
         magnet = f"{magnet_base}{hash}&dn={display_name}"
@@ -235,7 +253,7 @@ class TorrentService:
         for files in file_structure:
             for file in files["path"]:
 
-                parsed_file = parse(file)
+                parsed_file = parse_title(file)
 
                 if season[0] in parsed_file.seasons and episode[0] in parsed_file.episodes:
                     episode_files.append({
@@ -270,7 +288,7 @@ class TorrentService:
             _, file_extension = os.path.splitext(file_name.lower())
             
             if file_extension in video_formats:
-                parsed_file = parse(file_name)
+                parsed_file = parse_title(file_name)
                 if len(parsed_file.seasons) == 0 or len(parsed_file.episodes) == 0:
                     self.logger.debug(f"Skipping file without season or episode parsed: {file_name}")
                     continue
@@ -2,7 +2,7 @@ import os
 import threading
 
 from typing import List, Dict
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import parse_title
 
 from stream_fusion.utils.debrid.alldebrid import AllDebrid
 from stream_fusion.utils.debrid.premiumize import Premiumize
@@ -192,7 +192,9 @@ class TorrentSmartContainer:
                     f"TorrentSmartContainer: Skipping hash {info_hash}: no RealDebrid data"
                 )
                 continue
-            torrent_item: TorrentItem = self.__itemsDict[info_hash]
+            torrent_item: TorrentItem = self._get_unavailable_item(info_hash)
+            if torrent_item is None:
+                continue
             self.logger.debug(
                 f"Processing {torrent_item.type}: {torrent_item.raw_title}"
             )
@@ -208,6 +210,14 @@ class TorrentSmartContainer:
             "TorrentSmartContainer: RealDebrid availability update completed"
         )
 
+    def _get_unavailable_item(self, info_hash):
+        # Services are checked concurrently and applied in the configured order,
+        # an item already available on a previous service keeps it.
+        torrent_item = self.__itemsDict.get(info_hash)
+        if torrent_item is None or torrent_item.availability is not False:
+            return None
+        return torrent_item
+
     def _process_series_files(
         self, details, media, torrent_item, files, debrid: str = "??"
     ):
@@ -266,7 +276,9 @@ class TorrentSmartContainer:
                     f"TorrentSmartContainer: Skipping non-instant magnet: {data['hash']}"
                 )
                 continue
-            torrent_item: TorrentItem = self.__itemsDict[data["hash"]]
+            torrent_item: TorrentItem = self._get_unavailable_item(data["hash"])
+            if torrent_item is None:
+                continue
             files = []
             self._explore_folders_alldebrid(
                 data["files"], files, 1, torrent_item.type, media
@@ -283,7 +295,9 @@ class TorrentSmartContainer:
             return
 
         for data in response["data"]:
-            torrent_item: TorrentItem = self.__itemsDict[data["hash"]]
+            torrent_item: TorrentItem = self._get_unavailable_item(data["hash"])
+            if torrent_item is None:
+                continue
             files = self._process_torbox_files(data["files"], torrent_item.type, media)
             self._update_file_details(torrent_item, files, debrid="TB")
 
@@ -383,7 +397,7 @@ class TorrentSmartContainer:
                         file["e"], files, file_index, type, media
                     )
                     continue
-                parsed_file = parse(file["n"])
+                parsed_file = parse_title(file["n"])
                 clean_season = media.season.replace("S", "")
                 clean_episode = media.episode.replace("E", "")
                 numeric_season = int(clean_season)
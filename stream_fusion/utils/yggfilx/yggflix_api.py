@@ -1,8 +1,9 @@
+import asyncio
 from typing import List, Optional
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+import aiohttp
+
+from stream_fusion.services.http import get_http_client
 from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
 
@@ -10,19 +11,15 @@ from stream_fusion.logging_config import logger
 class YggflixAPI:
     def __init__(
         self,
-        pool_connections=10,
-        pool_maxsize=10,
         max_retries=3,
         timeout=10,
     ):
         """
         Initialize the YggflixAPI class.
 
-        This constructor sets up the API client with connection pooling and retry strategies.
+        This constructor sets up the API client on top of the shared async HTTP client.
 
         Args:
-            pool_connections (int): Number of connection pools to cache. Defaults to 10.
-            pool_maxsize (int): Maximum number of connections to save in the pool. Defaults to 10.
             max_retries (int): Maximum number of retries for failed requests. Defaults to 3.
             timeout (int): Timeout for requests in seconds. Defaults to 10.
 
@@ -31,23 +28,10 @@ class YggflixAPI:
         """
         self.base_url = f"{settings.yggflix_url}/api"
         self.timeout = timeout
-        self.session = requests.Session()
-
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=0.1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-        )
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retry_strategy,
-        )
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-
-    def _make_request(self, method, endpoint, params=None):
+        self.max_retries = max_retries
+        self.http = get_http_client()
+
+    async def _make_request(self, method, endpoint, params=None):
         """
         Make an HTTP request to the API.
 
@@ -62,32 +46,35 @@ class YggflixAPI:
             dict: JSON response from the API
 
         Raises:
-            requests.exceptions.HTTPError: If an HTTP error occurs
-            requests.exceptions.ConnectionError: If a connection error occurs
-            requests.exceptions.Timeout: If the request times out
-            requests.exceptions.RequestException: For any other request-related errors
+            aiohttp.ClientResponseError: If an HTTP error occurs
+            aiohttp.ClientConnectionError: If a connection error occurs
+            asyncio.TimeoutError: If the request times out
+            aiohttp.ClientError: For any other request-related errors
         """
         url = f"{self.base_url}{endpoint}"
         try:
-            response = self.session.request(
-                method, url, params=params, timeout=self.timeout
+            response = await self.http.request(
+                method,
+                url,
+                params=params,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
             )
-            response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as e:
+        except aiohttp.ClientResponseError as e:
             logger.error(f"HTTP error occurred: {e}")
             raise
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             logger.error(f"Connection error occurred: {e}")
             raise
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout error occurred: {e}")
+        except asyncio.TimeoutError as e:
+            logger.error(f"Timeout error occurred: {e!r}")
             raise
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             logger.error(f"An error occurred during the request: {e}")
             raise
 
-    def search(self, query=""):
+    async def search(self, query=""):
         """
         Perform a search on the API.
 
@@ -97,18 +84,18 @@ class YggflixAPI:
         Returns:
             dict: JSON response containing search results
         """
-        return self._make_request("GET", "/search", params={"q": query})
+        return await self._make_request("GET", "/search", params={"q": query})
 
-    def get_home(self):
+    async def get_home(self):
         """
         Get home page data from the API.
 
         Returns:
             dict: JSON response containing home page data
         """
-        return self._make_request("GET", "/home")
+        return await self._make_request("GET", "/home")
 
-    def get_movie_detail(self, movie_id: int):
+    async def get_movie_detail(self, movie_id: int):
         """
         Get details of a specific movie.
 
@@ -118,9 +105,9 @@ class YggflixAPI:
         Returns:
             dict: JSON response containing movie details
         """
-        return self._make_request("GET", f"/movie/{movie_id}")
+        return await self._make_request("GET", f"/movie/{movie_id}")
 
-    def get_movie_torrents(self, movie_id: int):
+    async def get_movie_torrents(self, movie_id: int):
         """
         Get torrents associated with a specific movie.
 
@@ -130,9 +117,9 @@ class YggflixAPI:
         Returns:
             dict: JSON response containing torrent information for the movie
         """
-        return self._make_request("GET", f"/movie/{movie_id}/torrents")
+        return await self._make_request("GET", f"/movie/{movie_id}/torrents")
 
-    def get_tvshow_detail(self, tvshow_id: int):
+    async def get_tvshow_detail(self, tvshow_id: int):
         """
         Get details of a specific TV show.
 
@@ -142,9 +129,9 @@ class YggflixAPI:
         Returns:
             dict: JSON response containing TV show details
         """
-        return self._make_request("GET", f"/tvshow/{tvshow_id}")
+        return await self._make_request("GET", f"/tvshow/{tvshow_id}")
 
-    def get_tvshow_torrents(self, tvshow_id: int):
+    async def get_tvshow_torrents(self, tvshow_id: int):
         """
         Get torrents associated with a specific TV show.
 
@@ -154,9 +141,9 @@ class YggflixAPI:
         Returns:
             dict: JSON response containing torrent information for the TV show
         """
-        return self._make_request("GET", f"/tvshow/{tvshow_id}/torrents")
+        return await self._make_request("GET", f"/tvshow/{tvshow_id}/torrents")
 
-    def get_torrents(
+    async def get_torrents(
         self,
         page: int = 1,
         q: str = "",
@@ -180,9 +167,9 @@ class YggflixAPI:
         if category_id is not None:
             params["category_id"] = category_id
 
-        return self._make_request("GET", "/torrents", params=params)
+        return await self._make_request("GET", "/torrents", params=params)
 
-    def get_torrent_detail(self, torrent_id: int) -> dict:
+    async def get_torrent_detail(self, torrent_id: int) -> dict:
         """
         Get detailed information about a specific torrent.
 
@@ -192,9 +179,9 @@ class YggflixAPI:
         Returns:
             dict: Detailed information about the torrent.
         """
-        return self._make_request("GET", f"/torrent/{torrent_id}")
+        return await self._make_request("GET", f"/torrent/{torrent_id}")
 
-    def download_torrent(self, torrent_id: int, passkey: str) -> bytes:
+    async def download_torrent(self, torrent_id: int, passkey: str) -> bytes:
         """
         Download a specific torrent file.
 
@@ -207,8 +194,8 @@ class YggflixAPI:
 
         Raises:
             ValueError: If the passkey is not exactly 32 characters long.
-            requests.exceptions.HTTPError: If an HTTP error occurs during the download.
-            requests.exceptions.RequestException: For any other request-related errors.
+            aiohttp.ClientResponseError: If an HTTP error occurs during the download.
+            aiohttp.ClientError: For any other request-related errors.
         """
         if len(passkey) != 32:
             raise ValueError("Passkey must be exactly 32 characters long.")
@@ -217,21 +204,14 @@ class YggflixAPI:
         params = {"passkey": passkey}
 
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
+            response = await self.http.get(
+                url, params=params, timeout=self.timeout, max_retries=self.max_retries
+            )
             return response.content
-        except requests.exceptions.HTTPError as e:
+        except aiohttp.ClientResponseError as e:
             logger.error(f"HTTP error occurred while downloading torrent: {e}")
             raise
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"An error occurred while downloading torrent: {e}")
             raise
 
-    def __del__(self):
-        """
-        Close the session when the object is destroyed.
-
-        This destructor ensures that the requests session is properly closed,
-        freeing up system resources.
-        """
-        self.session.close()
@@ -1,5 +1,5 @@
 from typing import List, Union
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import parse_title, warm_parse_cache
 
 from stream_fusion.logging_config import logger
 from stream_fusion.utils.detection import detect_languages
@@ -22,7 +22,7 @@ class YggflixService:
         else:
             self.ygg_passkey = config.get("yggPasskey")
 
-    def search(self, media: Union[Movie, Series]) -> List[YggflixResult]:
+    async def search(self, media: Union[Movie, Series]) -> List[YggflixResult]:
         """
         Search for a media (movie or series) on Yggflix.
 
@@ -36,12 +36,13 @@ class YggflixService:
             TypeError: If the media type is neither Movie nor Series.
         """
         if isinstance(media, Movie):
-            results = self.__search_movie(media)
+            results = await self.__search_movie(media)
         elif isinstance(media, Series):
-            results = self.__search_series(media)
+            results = await self.__search_series(media)
         else:
             raise TypeError("Only Movie and Series types are allowed as media!")
 
+        await warm_parse_cache(result.get("title") for result in results or [])
         return self.__post_process_results(results, media)
 
     def __filter_out_no_seeders(self, results: List[dict]) -> List[dict]:
@@ -53,28 +54,28 @@ class YggflixService:
         if settings.yggflix_url:
             return f"{settings.yggflix_url}/api/torrent/{id}/download?passkey={self.ygg_passkey}"
 
-    def __search_movie(self, media: Movie) -> List[dict]:
+    async def __search_movie(self, media: Movie) -> List[dict]:
         """Search for a movie on Yggflix."""
         if not self.has_tmdb:
             raise ValueError("Please use TMDB metadata provider for Yggflix")
 
         try:
             logger.info(f"Searching Yggflix for movie: {media.titles[0]}")
-            return self.yggflix.get_movie_torrents(media.tmdb_id)
+            return await self.yggflix.get_movie_torrents(media.tmdb_id)
         except Exception as e:
             logger.error(
                 f"Error searching Yggflix for movie: {media.titles[0]}", exc_info=True
             )
             return []
 
-    def __search_series(self, media: Series) -> List[dict]:
+    async def __search_series(self, media: Series) -> List[dict]:
         """Search for a series on Yggflix."""
         if not self.has_tmdb:
             raise ValueError("Please use TMDB metadata provider for Yggflix")
 
         try:
             logger.info(f"Searching Yggflix for series: {media.titles[0]}")
-            return self.yggflix.get_tvshow_torrents(int(media.tmdb_id))
+            return await self.yggflix.get_tvshow_torrents(int(media.tmdb_id))
         except Exception as e:
             logger.error(
                 f"Error searching Yggflix for series: {media.titles[0]}", exc_info=True
@@ -108,7 +109,7 @@ class YggflixService:
             item.privacy="private"
             item.languages=detect_languages(item.raw_title, default_language="fr")
             item.type=media.type
-            item.parsed_data=parse(item.raw_title)
+            item.parsed_data=parse_title(item.raw_title)
 
             items.append(item)
             logger.trace(f"Yggflix result: {item}")
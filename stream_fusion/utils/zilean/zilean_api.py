@@ -1,8 +1,9 @@
-import requests
+import asyncio
 from typing import List, Optional, Tuple
+
+import aiohttp
 from pydantic import BaseModel, ConfigDict, Field
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from stream_fusion.services.http import HttpResponse, get_http_client
 from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
 
@@ -78,8 +79,6 @@ class DMMTorrentInfo(BaseModel):
 class ZileanAPI:
     def __init__(
         self,
-        pool_connections: int = settings.zilean_pool_connections,
-        pool_maxsize: int = settings.zilean_api_pool_maxsize,
         max_retries: int = settings.zilean_max_retry,
     ):
         self.base_url = settings.zilean_url
@@ -87,33 +86,21 @@ class ZileanAPI:
             logger.error("Zilean API URL is not set in the environment variables.")
             raise ValueError("Zilean API URL is not set in the environment variables.")
 
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=0.1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],
-        )
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retry_strategy,
-        )
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.max_retries = max_retries
+        self.http = get_http_client()
 
-    def _request(self, method: str, endpoint: str, **kwargs):
+    async def _request(self, method: str, endpoint: str, **kwargs) -> HttpResponse:
         url = f"{self.base_url}{endpoint}"
         headers = kwargs.pop("headers", {})
         headers.update(
             {"accept": "application/json", "Content-Type": "application/json"}
         )
         try:
-            response = self.session.request(method, url, headers=headers, **kwargs)
-            response.raise_for_status()
-            return response
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur lors de la requête API : {e}")
+            return await self.http.request(
+                method, url, headers=headers, max_retries=self.max_retries, **kwargs
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Erreur lors de la requête API : {e!r}")
             raise
 
     def _convert_to_dmm_torrent_info(self, entry: dict) -> DMMTorrentInfo:
@@ -124,11 +111,11 @@ class ZileanAPI:
             entry['imdb'] = DMMImdbFile(**entry['imdb'])
         return DMMTorrentInfo(**entry)
 
-    def dmm_search(self, query: DMMQueryRequest) -> List[DMMTorrentInfo]:
-        response = self._request("POST", "/dmm/search", json=query.dict())
+    async def dmm_search(self, query: DMMQueryRequest) -> List[DMMTorrentInfo]:
+        response = await self._request("POST", "/dmm/search", json=query.dict())
         return [self._convert_to_dmm_torrent_info(entry) for entry in response.json()]
 
-    def dmm_filtered(
+    async def dmm_filtered(
         self,
         query: Optional[str] = None,
         season: Optional[int] = None,
@@ -148,23 +135,20 @@ class ZileanAPI:
             "ImdbId": imdb_id,
         }
         params = {k: v for k, v in params.items() if v is not None}
-        response = self._request("GET", "/dmm/filtered", params=params)
+        response = await self._request("GET", "/dmm/filtered", params=params)
         return [self._convert_to_dmm_torrent_info(entry) for entry in response.json()]
 
-    def dmm_on_demand_scrape(self) -> None:
-        self._request("GET", "/dmm/on-demand-scrape")
+    async def dmm_on_demand_scrape(self) -> None:
+        await self._request("GET", "/dmm/on-demand-scrape")
 
-    def healthchecks_ping(self) -> str:
-        response = self._request("GET", "/healthchecks/ping")
+    async def healthchecks_ping(self) -> str:
+        response = await self._request("GET", "/healthchecks/ping")
         return response.text
 
-    def imdb_search(
+    async def imdb_search(
         self, query: Optional[str] = None, year: Optional[int] = None, category: Optional[str] = None
     ) -> List[DMMImdbSearchResult]:
         params = {"Query": query, "Year": year, "Category": category}
         params = {k: v for k, v in params.items() if v is not None}
-        response = self._request("POST", "/imdb/search", params=params)
-        return [DMMImdbSearchResult(**file) for file in response.json()]
-
-    def __del__(self):
-        self.session.close()
\ No newline at end of file
+        response = await self._request("POST", "/imdb/search", params=params)
+        return [DMMImdbSearchResult(**file) for file in response.json()]
\ No newline at end of file
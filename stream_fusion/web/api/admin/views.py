@@ -61,7 +61,7 @@ async def session_based_security(
         logger.warning("No session ID found, redirecting to login")
         return redirect_to_login(request)
 
-    secret_key = redis_client.get(session_id)
+    secret_key = await redis_client.get(session_id)
     if not secret_key:
         logger.warning("Session expired or invalid, redirecting to login")
         request.session.clear()
@@ -69,12 +69,12 @@ async def session_based_security(
 
     if not secrets.compare_digest(secret_key.decode(), secret.value):
         logger.warning("Invalid secret key in session, redirecting to login")
-        redis_client.delete(session_id)
+        await redis_client.delete(session_id)
         request.session.clear()
         return redirect_to_login(request)
 
     # Refresh the session TTL
-    redis_client.expire(session_id, timedelta(hours=2))
+    await redis_client.expire(session_id, timedelta(hours=2))
     return True
 
 
@@ -91,7 +91,7 @@ async def login(
     logger.info("Processing login attempt")
     if secrets.compare_digest(secret_key, secret.value):
         session_id = str(uuid.uuid4())
-        redis_client.setex(session_id, timedelta(hours=2), secret_key)
+        await redis_client.setex(session_id, timedelta(hours=2), secret_key)
         request.session["session_id"] = session_id
         logger.info("Login successful")
         return RedirectResponse(
@@ -252,7 +252,7 @@ async def logout(request: Request, redis_client=get_redis_dependency()):
     logger.info("User logging out")
     session_id = request.session.get("session_id")
     if session_id:
-        redis_client.delete(session_id)
+        await redis_client.delete(session_id)
     request.session.clear()
     return RedirectResponse(
         url=custom_url_for("login_page")(request), status_code=HTTP_303_SEE_OTHER
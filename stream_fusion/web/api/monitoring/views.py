@@ -1,5 +1,10 @@
 from fastapi import APIRouter
 
+from stream_fusion.utils.cache.memory_cache import get_memory_cache
+from stream_fusion.utils.cache.segment_cache import get_segment_cache
+from stream_fusion.utils.debrid.client_registry import debrid_client_registry
+from stream_fusion.utils.parser.parse_cache import get_parse_cache_stats
+
 router = APIRouter()
 
 
@@ -10,3 +15,18 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get("/cache")
+def cache_stats() -> dict:
+    """
+    Returns the in-memory cache statistics of the worker serving the request.
+    """
+    memory_cache = get_memory_cache()
+    segment_cache = get_segment_cache()
+    return {
+        "memory_cache": memory_cache.stats() if memory_cache is not None else None,
+        "parse_cache": get_parse_cache_stats(),
+        "segment_cache": segment_cache.stats() if segment_cache is not None else None,
+        "debrid_clients": debrid_client_registry.stats(),
+    }
@@ -2,16 +2,20 @@ import aiohttp
 
 from yarl import URL
 from fastapi import FastAPI
-from redis import ConnectionPool
 from typing import AsyncGenerator
 from aiohttp_socks import ProxyConnector
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from stream_fusion.logging_config import configure_logging
+from stream_fusion.services.http import close_http_client, init_http_client
 from stream_fusion.services.postgresql.base import Base
 from stream_fusion.services.postgresql.models import load_all_models
 from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import close_redis_pool, get_redis_url, init_redis_pool
+from stream_fusion.utils.cache.memory_cache import close_memory_cache, init_memory_cache
+from stream_fusion.utils.cache.segment_cache import close_segment_cache, init_segment_cache
+from stream_fusion.utils.torrent.torrent_decoder import init_torrent_decoder, shutdown_torrent_decoder
 from stream_fusion.services.postgresql.utils import init_db_cleanup_function
 
 
@@ -37,6 +41,47 @@ def _setup_db(app: FastAPI) -> None:  # pragma: no cover
     # init_db_cleanup_function(engine) 
 
 
+def _create_connector(use_proxy: bool) -> aiohttp.BaseConnector:
+    if use_proxy:
+        parsed_url = URL(settings.proxy_url)
+        if parsed_url.scheme in ("socks5", "socks5h", "socks4", "http", "https"):
+            return ProxyConnector.from_url(parsed_url, limit=100, limit_per_host=50)
+        raise ValueError(f"Unsupported proxy scheme: {parsed_url.scheme}")
+    return aiohttp.TCPConnector(limit=100, limit_per_host=50)
+
+
+def _setup_http(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the shared aiohttp sessions and the async HTTP client.
+
+    ``app.state.http_session`` follows ``PLAYBACK_PROXY`` for playback.
+    API calls need a direct session and, when ``PROXY_URL`` is set, a
+    proxied one for the debrid services, so the missing one is created
+    alongside it.
+
+    :param app: fastAPI application.
+    """
+    timeout = aiohttp.ClientTimeout(total=settings.aiohttp_timeout)
+    playback_proxied = bool(settings.playback_proxy and settings.proxy_url)
+    app.state.http_session = aiohttp.ClientSession(
+        timeout=timeout, connector=_create_connector(playback_proxied)
+    )
+    app.state.http_extra_session = None
+
+    if playback_proxied:
+        app.state.http_extra_session = aiohttp.ClientSession(
+            timeout=timeout, connector=_create_connector(False)
+        )
+        init_http_client(app.state.http_extra_session, app.state.http_session)
+    elif settings.proxy_url:
+        app.state.http_extra_session = aiohttp.ClientSession(
+            timeout=timeout, connector=_create_connector(True)
+        )
+        init_http_client(app.state.http_session, app.state.http_extra_session)
+    else:
+        init_http_client(app.state.http_session)
+
+
 @asynccontextmanager
 async def lifespan_setup(
     app: FastAPI,
@@ -60,27 +105,23 @@ async def lifespan_setup(
 
     app.middleware_stack = app.build_middleware_stack()
 
-    if settings.playback_proxy and settings.proxy_url:
-        parsed_url = URL(settings.proxy_url)
-        if parsed_url.scheme in ("socks5", "socks5h", "socks4", "http", "https"):
-            connector = ProxyConnector.from_url(parsed_url, limit=100, limit_per_host=50)
-        else:
-            raise ValueError(f"Unsupported proxy scheme: {parsed_url.scheme}")
-    else:
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=50)
-
-    timeout = aiohttp.ClientTimeout(total=settings.aiohttp_timeout)
-    app.state.http_session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+    _setup_http(app)
+    init_torrent_decoder(settings.torrent_decode_workers)
 
-    app.state.redis_pool = ConnectionPool(
-        host=settings.redis_host, port=settings.redis_port, db=settings.redis_db, max_connections=50
-    )
+    app.state.redis_pool = init_redis_pool()
+    init_memory_cache(get_redis_url())
+    init_segment_cache()
 
     yield
 
     # Shutdown actions
+    await close_memory_cache()
+    close_segment_cache()
+    close_http_client()
+    shutdown_torrent_decoder()
     if app.state.http_session:
         await app.state.http_session.close()
-    if app.state.redis_pool:
-        app.state.redis_pool.disconnect()
+    if app.state.http_extra_session:
+        await app.state.http_extra_session.close()
+    await close_redis_pool()
     await app.state.db_engine.dispose()
\ No newline at end of file
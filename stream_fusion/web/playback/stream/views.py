@@ -1,10 +1,10 @@
-from io import BytesIO
+import hashlib
 import json
+import re
 from urllib.parse import unquote
 import redis.asyncio as redis
 import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from redis.exceptions import LockError
 from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi_simple_rate_limiter import rate_limiter
 from fastapi_simple_rate_limiter.database import create_redis_session
@@ -13,8 +13,15 @@ from starlette.background import BackgroundTask
 from stream_fusion.services.postgresql.dao.apikey_dao import APIKeyDAO
 from stream_fusion.services.redis.redis_config import get_redis_cache_dependency
 from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.segment_cache import SegmentCache, get_segment_cache
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.debrid.link_resolver import (
+    FAILED,
+    PENDING,
+    READY,
+    LinkResolver,
+)
 from stream_fusion.utils.debrid.get_debrid_service import (
     get_debrid_service,
     get_download_service,
@@ -31,84 +38,226 @@ from stream_fusion.web.playback.stream.schemas import (
 
 router = APIRouter()
 
-redis_client = redis.Redis(
-    host=settings.redis_host, port=settings.redis_port, db=settings.redis_db
-)
 redis_session = create_redis_session(
     host=settings.redis_host, port=settings.redis_port, db=settings.redis_db
 )
 
 DOWNLOAD_IN_PROGRESS_FLAG = "DOWNLOAD_IN_PROGRESS"
 
+INFO_HASH_PATTERN = re.compile(r"btih:([0-9a-fA-F]{40}|[A-Za-z2-7]{32})")
+
+
+def proxy_stream_headers() -> dict:
+    return {
+        "Content-Type": "video/mp4",
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
+        "Pragma": "no-cache",
+        "Connection": "keep-alive",
+        "Content-Disposition": "inline",
+        "Access-Control-Allow-Origin": "*",
+    }
+
 
 class ProxyStreamer:
+    """
+    Forwards the upstream body to the player chunk by chunk.
+
+    A reader task pulls chunks from the debrid with ``iter_chunked`` into a
+    bounded queue holding at most ``buffer_size`` bytes. The chunks are handed
+    to the response as they were received, without copying them. When the
+    player reads slower than the debrid sends, the full queue blocks the reader
+    and the backpressure reaches the upstream connection.
+    """
+
     def __init__(
         self,
         request: Request,
         url: str,
         headers: dict,
         buffer_size: int = settings.proxy_buffer_size,
+        chunk_size: int = settings.proxy_chunk_size,
     ):
         self.request = request
         self.url = url
         self.headers = headers
         self.response = None
-        self.buffer = BytesIO()
-        self.buffer_size = buffer_size
-        self.eof = False
-
-    async def fill_buffer(self):
-        while len(self.buffer.getvalue()) < self.buffer_size and not self.eof:
-            chunk = await self.response.content.read(
-                self.buffer_size - len(self.buffer.getvalue())
-            )
-            if not chunk:
-                self.eof = True
-                break
-            self.buffer.write(chunk)
-        self.buffer.seek(0)
+        self.chunk_size = chunk_size
+        self.queue = asyncio.Queue(maxsize=max(1, buffer_size // chunk_size))
+        self.reader = None
 
-    async def stream_content(self):
-        async with self.request.app.state.http_session.get(
+    async def read_ahead(self):
+        try:
+            async for chunk in self.response.content.iter_chunked(self.chunk_size):
+                await self.queue.put(chunk)
+        except Exception as e:
+            await self.queue.put(e)
+            return
+        await self.queue.put(None)
+
+    async def open(self):
+        """Send the upstream GET, its status and headers are used for the response."""
+        self.response = await self.request.app.state.http_session.get(
             self.url, headers=self.headers
-        ) as self.response:
+        )
+        return self.response
+
+    async def stream_content(self):
+        if self.response is None:
+            await self.open()
+        self.reader = asyncio.create_task(self.read_ahead())
+        try:
             while True:
-                if self.buffer.tell() == len(self.buffer.getvalue()):
-                    if self.eof:
-                        break
-                    self.buffer = BytesIO()
-                    await self.fill_buffer()
-
-                chunk = self.buffer.read(8192)
-                if chunk:
-                    yield chunk
-                else:
-                    await asyncio.sleep(0.1)
+                chunk = await self.queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            self.reader.cancel()
+            try:
+                await self.reader
+            except asyncio.CancelledError:
+                pass
+            await self.response.release()
 
     async def close(self):
+        if self.reader and not self.reader.done():
+            self.reader.cancel()
         if self.response:
             await self.response.release()
         logger.debug("Playback: Streaming connection closed")
 
 
-# class ProxyStreamer:
-#     def __init__(self, request: Request, url: str, headers: dict):
-#         self.request = request
-#         self.url = url
-#         self.headers = headers
-#         self.response = None
+class SegmentStreamer:
+    """
+    Serves a byte range of a torrent file from the blocks of a ``SegmentCache``.
+
+    Missing blocks are fetched from the viewer's debrid link with a range
+    request, the next block is fetched while the current one is sent.
+    """
+
+    def __init__(
+        self, request: Request, url: str, file_key: str, segment_cache: SegmentCache
+    ):
+        self.request = request
+        self.url = url
+        self.file_key = file_key
+        self.segment_cache = segment_cache
+        self.block_size = segment_cache.block_size
+
+    async def fetch_block(self, block: int):
+        start = block * self.block_size
+        headers = {"Range": f"bytes={start}-{start + self.block_size - 1}"}
+        async with self.request.app.state.http_session.get(
+            self.url, headers=headers
+        ) as response:
+            total_size = get_total_size(response.headers)
+            if response.status != 206 or total_size is None:
+                raise ValueError(
+                    f"Upstream answered {response.status} to a block range request"
+                )
+            return await response.read(), total_size
+
+    async def get_block(self, block: int) -> bytes:
+        return await self.segment_cache.get_block(
+            self.file_key, block, lambda: self.fetch_block(block)
+        )
+
+    async def stream_content(self, start: int, end: int, first_block: bytes):
+        block = start // self.block_size
+        data = first_block
+        offset = start - block * self.block_size
+        next_block = None
+        try:
+            while True:
+                last_block = (block + 1) * self.block_size > end
+                if not last_block:
+                    next_block = asyncio.create_task(self.get_block(block + 1))
+                yield data[offset : end - block * self.block_size + 1]
+                if last_block:
+                    break
+                data = await next_block
+                next_block = None
+                block += 1
+                offset = 0
+        finally:
+            if next_block is not None:
+                next_block.cancel()
+
+
+def segment_file_key(query: dict) -> str | None:
+    """Identify the file a playback query points to, across users and debrids."""
+    match = INFO_HASH_PATTERN.search(query.get("magnet") or "")
+    if not match:
+        return None
+    return f"{match.group(1).lower()}:{query.get('file_index')}:{query.get('season')}:{query.get('episode')}"
 
-#     async def stream_content(self):
-#         async with self.request.app.state.http_session.get(
-#             self.url, headers=self.headers
-#         ) as self.response:
-#             async for chunk in self.response.content.iter_any():
-#                 yield chunk
 
-#     async def close(self):
-#         if self.response:
-#             await self.response.release()
-#         logger.debug("Streaming connection closed")
+async def segment_cache_response(
+    request: Request,
+    segment_cache: SegmentCache,
+    file_key: str,
+    link: str,
+    range_requested: bool,
+    start: int,
+    end: int | str,
+) -> Response:
+    def range_not_satisfiable(total_size: int) -> Response:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{total_size}"},
+        )
+
+    total_size = segment_cache.get_size(file_key)
+    if total_size is not None and start >= total_size:
+        return range_not_satisfiable(total_size)
+
+    streamer = SegmentStreamer(request, link, file_key, segment_cache)
+    first_block = await streamer.get_block(start // segment_cache.block_size)
+    total_size = segment_cache.get_size(file_key)
+    end = min(int(end), total_size - 1) if end != "" else total_size - 1
+    if start > end:
+        return range_not_satisfiable(total_size)
+
+    stream_headers = proxy_stream_headers()
+    stream_headers["Content-Length"] = str(end - start + 1)
+    if range_requested:
+        stream_headers["Content-Range"] = f"bytes {start}-{end}/{total_size}"
+    logger.debug(f"Playback: Serving bytes {start}-{end} from the segment cache")
+    return StreamingResponse(
+        streamer.stream_content(start, end, first_block),
+        status_code=206 if range_requested else 200,
+        headers=stream_headers,
+    )
+
+
+def link_metadata_key(link: str) -> str:
+    return f"link_metadata:{hashlib.sha256(link.encode('utf-8')).hexdigest()[:32]}"
+
+
+def get_total_size(headers) -> int | None:
+    content_range = headers.get("Content-Range")
+    if content_range:
+        total = content_range.rsplit("/", 1)[-1]
+        return int(total) if total.isdigit() else None
+    content_length = headers.get("Content-Length")
+    return int(content_length) if content_length and content_length.isdigit() else None
+
+
+async def store_link_metadata(redis_cache: RedisCache, link: str, response) -> None:
+    """Keep the size and validators of a debrid link so HEAD requests and seeks need no probe."""
+    if response.status not in (200, 206):
+        return
+    size = get_total_size(response.headers)
+    if size is None:
+        return
+    metadata = {"size": size}
+    for header in ["ETag", "Last-Modified"]:
+        if header in response.headers:
+            metadata[header] = response.headers[header]
+    await redis_cache.set(link_metadata_key(link), metadata, expiration=3600)
 
 
 async def handle_download(
@@ -135,7 +284,7 @@ async def handle_download(
             )
 
         if isinstance(debrid_service, RealDebrid):
-            torrent_id = debrid_service.add_magnet_or_torrent_and_select(query, ip)
+            torrent_id = await debrid_service.add_magnet_or_torrent_and_select(query, ip)
             logger.success(
                 f"Playback: Added magnet or torrent to Real-Debrid: {torrent_id}"
             )
@@ -152,7 +301,7 @@ async def handle_download(
                 else None
             )
             privacy = query.get("privacy", "private")
-            torrent_info = debrid_service.add_magnet_or_torrent(
+            torrent_info = await debrid_service.add_magnet_or_torrent(
                 magnet, torrent_download, ip, privacy
             )
             logger.success(
@@ -170,7 +319,7 @@ async def handle_download(
                 if query["torrent_download"] is not None
                 else None
             )
-            debrid_service.add_magnet_or_torrent(magnet, torrent_download, ip)
+            await debrid_service.add_magnet_or_torrent(magnet, torrent_download, ip)
             logger.success(
                 f"Playback: Added magnet or torrent to download service: {magnet[:50]}"
             )
@@ -203,7 +352,7 @@ async def get_stream_link(
         link = await handle_download(query, config, ip, redis_cache)
     elif service:
         debrid_service = get_debrid_service(config, service)
-        link = debrid_service.get_stream_link(query, config, ip)
+        link = await debrid_service.get_stream_link(query, config, ip)
     else:
         logger.error("Playback: Service not found in query")
         raise HTTPException(status_code=500, detail="Service not found in query")
@@ -251,35 +400,24 @@ async def get_playback(
             link = await handle_download(query_dict, config, ip, redis_cache)
             return RedirectResponse(url=link, status_code=status.HTTP_302_FOUND)
 
-        lock_key = f"lock:stream:{api_key}:{decoded_query}_{ip}"
-        lock = redis_client.lock(lock_key, timeout=60)
-
-        try:
-            if await lock.acquire(blocking=False):
-                logger.debug("Playback: Lock acquired, getting stream link")
-                link = await get_stream_link(decoded_query, config, ip, redis_cache)
-            else:
-                logger.debug("Playback: Lock not acquired, waiting for cached link")
-                cache_key = f"stream_link:{api_key}:{decoded_query}_{ip}"
-                for _ in range(30):
-                    await asyncio.sleep(1)
-                    cached_link = await redis_cache.get(cache_key)
-                    if cached_link:
-                        logger.debug("Playback: Cached link found while waiting")
-                        link = cached_link
-                        break
-                else:
-                    logger.warning("Playback: Timed out waiting for cached link")
-                    raise HTTPException(
-                        status_code=503,
-                        detail="Service temporarily unavailable. Please try again.",
-                    )
-        finally:
-            try:
-                await lock.release()
-                logger.debug("Playback: Lock released")
-            except LockError:
-                logger.warning("Playback: Failed to release lock (already released)")
+        job_key = f"{api_key}:{decoded_query}_{ip}"
+        link = await redis_cache.get(f"stream_link:{job_key}")
+        if link:
+            logger.debug("Playback: Stream link found in cache")
+        else:
+            state = await LinkResolver(redis_cache).resolve(
+                job_key,
+                lambda job_cache: get_stream_link(decoded_query, config, ip, job_cache),
+            )
+            if state is None or state["status"] == PENDING:
+                logger.warning("Playback: Timed out waiting for the stream link")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Service temporarily unavailable. Please try again.",
+                )
+            if state["status"] == FAILED:
+                raise HTTPException(status_code=500, detail=state["error"])
+            link = state["link"]
 
         if not settings.proxied_link:
             logger.debug(f"Playback: Redirecting to non-proxied link: {link}")
@@ -293,6 +431,7 @@ async def get_playback(
 
         logger.debug("Playback: Preparing to proxy stream")
         headers = {}
+        start, end = 0, ""
         range_header = request.headers.get("range")
         if range_header and "=" in range_header:
             logger.debug(f"Playback: Range header found: {range_header}")
@@ -303,41 +442,53 @@ async def get_playback(
             headers["Range"] = f"bytes={start}-{end}"
             logger.debug(f"Playback: Range header set: {headers['Range']}")
 
+        metadata = await redis_cache.get(link_metadata_key(link))
+        if metadata and "Range" in headers and start >= metadata["size"]:
+            logger.debug("Playback: Requested range is past the end of the file")
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{metadata['size']}"},
+            )
+
+        segment_cache = get_segment_cache()
+        file_key = segment_file_key(query_dict)
+        if segment_cache is not None and file_key:
+            try:
+                return await segment_cache_response(
+                    request, segment_cache, file_key, link, "Range" in headers, start, end
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Playback: Segment cache unavailable, proxying directly: {e}"
+                )
+
         streamer = ProxyStreamer(request, link, headers)
 
         logger.debug(f"Playback: Initiating request to: {link}")
-        async with request.app.state.http_session.head(
-            link, headers=headers
-        ) as response:
+        response = await streamer.open()
+        try:
             logger.debug(f"Playback: Response status: {response.status}")
-            stream_headers = {
-                "Content-Type": "video/mp4",
-                "Accept-Ranges": "bytes",
-                "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
-                "Pragma": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Disposition": "inline",
-                "Access-Control-Allow-Origin": "*",
-            }
-
-            if response.status == 206:
-                logger.debug("Playback: Partial content response")
-                stream_headers["Content-Range"] = response.headers["Content-Range"]
-
-            for header in ["Content-Length", "ETag", "Last-Modified"]:
+            stream_headers = proxy_stream_headers()
+
+            for header in ["Content-Range", "Content-Length", "ETag", "Last-Modified"]:
                 if header in response.headers:
                     stream_headers[header] = response.headers[header]
                     logger.debug(
                         f"Playback: Header set: {header}: {stream_headers[header]}"
                     )
 
-            logger.debug("Playback: Preparing streaming response")
-            return StreamingResponse(
-                streamer.stream_content(),
-                status_code=206 if "Range" in headers else 200,
-                headers=stream_headers,
-                background=BackgroundTask(streamer.close),
-            )
+            await store_link_metadata(redis_cache, link, response)
+        except Exception:
+            await streamer.close()
+            raise
+
+        logger.debug("Playback: Preparing streaming response")
+        return StreamingResponse(
+            streamer.stream_content(),
+            status_code=response.status,
+            headers=stream_headers,
+            background=BackgroundTask(streamer.close),
+        )
 
     except Exception as e:
         logger.error(f"Playback: Playback error: {str(e)}", exc_info=True)
@@ -398,26 +549,32 @@ async def head_playback(
                 logger.info("Playback: Download not started, returning 200 OK")
                 return Response(status_code=status.HTTP_200_OK, headers=headers)
 
-        cache_key = f"stream_link:{api_key}:{decoded_query}_{ip}"
+        job_key = f"{api_key}:{decoded_query}_{ip}"
+        link = await redis_cache.get(f"stream_link:{job_key}")
+        if not link:
+            state = await LinkResolver(redis_cache).wait(job_key)
+            if state is not None and state["status"] == READY:
+                link = state["link"]
+
+        if link:
+            if (
+                not settings.proxied_link
+            ):  # avoid sending HEAD request if link is sent directly
+                return Response(status_code=status.HTTP_200_OK, headers=headers)
 
-        for _ in range(30):
-            if await redis_cache.exists(cache_key):
-                link = await redis_cache.get(cache_key)
+            metadata = await redis_cache.get(link_metadata_key(link))
+            if metadata:
+                headers["Content-Length"] = str(metadata["size"])
+                return Response(status_code=status.HTTP_200_OK, headers=headers)
 
-                if (
-                    not settings.proxied_link
-                ):  # avoid sending HEAD request if link is sent directly
+            async with request.app.state.http_session.head(link) as response:
+                if response.status == 200:
+                    headers["Content-Length"] = response.headers.get(
+                        "Content-Length", "0"
+                    )
+                    await store_link_metadata(redis_cache, link, response)
                     return Response(status_code=status.HTTP_200_OK, headers=headers)
 
-                async with request.app.state.http_session.head(link) as response:
-                    if response.status == 200:
-                        headers["Content-Length"] = response.headers.get(
-                            "Content-Length", "0"
-                        )
-                        return Response(status_code=status.HTTP_200_OK, headers=headers)
-
-            await asyncio.sleep(1)
-
         return Response(status_code=status.HTTP_202_ACCEPTED, headers=headers)
 
     except redis.ConnectionError as e:
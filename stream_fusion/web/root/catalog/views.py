@@ -1,7 +1,7 @@
 import asyncio
 import pickle
 
-from redis import Redis
+from redis.asyncio import Redis
 from tmdbv3api import TMDb, Movie, TV, Season, Discover, Find
 from fastapi_simple_rate_limiter import rate_limiter
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -60,7 +60,7 @@ async def validate_config_and_api_key(config: str, apikey_dao: APIKeyDAO):
 
 
 async def get_cached_item(redis_client: Redis, cache_key: str):
-    cached_item = await asyncio.to_thread(redis_client.get, cache_key)
+    cached_item = await redis_client.get(cache_key)
     if cached_item:
         return pickle.loads(cached_item)
     return None
@@ -69,9 +69,7 @@ async def get_cached_item(redis_client: Redis, cache_key: str):
 async def cache_item(
     redis_client: Redis, cache_key: str, item, duration: int = 7 * 24 * 60 * 60
 ):
-    await asyncio.to_thread(
-        redis_client.set, cache_key, pickle.dumps(item), ex=duration
-    )
+    await redis_client.set(cache_key, pickle.dumps(item), ex=duration)
 
 
 def extract_year(date_string):
@@ -189,7 +187,7 @@ async def get_catalog(
             return Metas(metas=full_catalog.metas[skip:])
 
         yggflix = YggflixAPI()
-        home_data = await asyncio.to_thread(yggflix.get_home)
+        home_data = await yggflix.get_home()
 
         metas = []
         pipeline = redis_client.pipeline()
@@ -236,7 +234,7 @@ async def get_catalog(
                 logger.error(f"Error processing item with TMDB ID {tmdb_id}: {str(e)}")
                 continue
 
-        await asyncio.to_thread(pipeline.execute)
+        await pipeline.execute()
 
         catalog = Metas(metas=metas)
         await cache_item(redis_client, cache_key, catalog, 1800)
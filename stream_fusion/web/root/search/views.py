@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import time
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -5,36 +6,35 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from stream_fusion.services.postgresql.dao.apikey_dao import APIKeyDAO
 from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
 from stream_fusion.services.redis.redis_config import get_redis_cache_dependency
-from stream_fusion.utils.cache.cache import search_public
 from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.single_flight import SingleFlight
 from stream_fusion.logging_config import logger
+from stream_fusion.utils.debrid.availability_cache import AvailabilityCache
 from stream_fusion.utils.debrid.get_debrid_service import get_all_debrid_services
 from stream_fusion.utils.filter.results_per_quality_filter import (
     ResultsPerQualityFilter,
 )
 from stream_fusion.utils.filter_results import (
     filter_items,
-    merge_items,
+    get_filter_pipeline,
     sort_items,
 )
-from stream_fusion.utils.jackett.jackett_result import JackettResult
-from stream_fusion.utils.jackett.jackett_service import JackettService
-from stream_fusion.utils.parser.parser_service import StreamParser
-from stream_fusion.utils.sharewood.sharewood_service import SharewoodService
-from stream_fusion.utils.yggfilx.yggflix_service import YggflixService
+from stream_fusion.utils.parser.parser_service import (
+    CONFIG_PLACEHOLDER,
+    StreamParser,
+    encode_config,
+    render_streams,
+)
 from stream_fusion.utils.metdata.cinemeta import Cinemeta
 from stream_fusion.utils.metdata.tmdb import TMDB
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
-from stream_fusion.utils.parse_config import parse_config
+from stream_fusion.utils.parse_config import config_fingerprint, parse_config
+from stream_fusion.utils.search.search_cache import SearchResultCache
 from stream_fusion.utils.security.security_api_key import check_api_key
-from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.web.root.search.schemas import SearchResponse, Stream
 from stream_fusion.web.root.search.stremio_parser import parse_to_stremio_streams
-from stream_fusion.utils.torrent.torrent_service import TorrentService
 from stream_fusion.utils.torrent.torrent_smart_container import TorrentSmartContainer
-from stream_fusion.utils.zilean.zilean_result import ZileanResult
-from stream_fusion.utils.zilean.zilean_service import ZileanService
 from stream_fusion.settings import settings
 
 
@@ -63,13 +63,13 @@ async def get_results(
         logger.warning("Search: API key not found in config.")
         raise HTTPException(status_code=401, detail="API key not found in config.")
 
-    def get_metadata():
+    async def get_metadata():
         logger.info(f"Search: Fetching metadata from {config['metadataProvider']}")
         if config["metadataProvider"] == "tmdb" and settings.tmdb_api_key:
             metadata_provider = TMDB(config)
         else:
             metadata_provider = Cinemeta(config)
-        return metadata_provider.get_metadata(stream_id, stream_type)
+        return await metadata_provider.get_metadata(stream_id, stream_type)
 
     media = await redis_cache.get_or_set(
         get_metadata, stream_id, stream_type, config["metadataProvider"]
@@ -77,12 +77,15 @@ async def get_results(
     logger.debug(f"Search: Retrieved media metadata for {str(media.titles)}")
 
     def stream_cache_key(media):
+        # Keyed on the config without its credentials: users sharing the same
+        # settings share the streams, only the playback URLs are per user.
+        fingerprint = config_fingerprint(config)
         if isinstance(media, Movie):
             key_string = (
-                f"stream:{api_key}:{media.titles[0]}:{media.year}:{media.languages[0]}"
+                f"stream:{fingerprint}:{media.titles[0]}:{media.year}:{media.languages[0]}"
             )
         elif isinstance(media, Series):
-            key_string = f"stream:{api_key}:{media.titles[0]}:{media.languages[0]}:{media.season}{media.episode}"
+            key_string = f"stream:{fingerprint}:{media.titles[0]}:{media.languages[0]}:{media.season}{media.episode}"
         else:
             logger.error("Search: Only Movie and Series are allowed as media!")
             raise HTTPException(
@@ -91,12 +94,16 @@ async def get_results(
         hashed_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
         return hashed_key[:16]
 
+    def render_response(stream_list):
+        rendered = render_streams(stream_list, encode_config(config))
+        return SearchResponse(streams=[Stream(**stream) for stream in rendered])
+
     cached_result = await redis_cache.get(stream_cache_key(media))
     if cached_result is not None:
         logger.info("Search: Returning cached processed results")
         total_time = time.time() - start
         logger.success(f"Search: Request completed in {total_time:.2f} seconds")
-        return SearchResponse(streams=cached_result)
+        return render_response(cached_result)
 
     debrid_services = get_all_debrid_services(config)
     logger.debug(f"Search: Found {len(debrid_services)} debrid services")
@@ -114,161 +121,66 @@ async def get_results(
         hashed_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
         return hashed_key[:16]
 
-    async def get_search_results(media, config):
-        search_results = []
-        torrent_service = TorrentService(config, torrent_dao)
-
-        async def perform_search(update_cache=False):
-            nonlocal search_results
-            search_results = []
-
-            if config["cache"] and not update_cache:
-                public_cached_results = search_public(media)
-                if public_cached_results:
-                    logger.success(
-                        f"Search: Found {len(public_cached_results)} public cached results"
-                    )
-                    public_cached_results = [
-                        JackettResult().from_cached_item(torrent, media)
-                        for torrent in public_cached_results
-                        if len(torrent.get("hash", "")) == 40
-                    ]
-                    public_cached_results = filter_items(
-                        public_cached_results, media, config=config
-                    )
-                    public_cached_results = await torrent_service.convert_and_process(
-                        public_cached_results
-                    )
-                    search_results.extend(public_cached_results)
-
-            if config["yggflix"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
-                yggflix_service = YggflixService(config)
-                yggflix_search_results = yggflix_service.search(media)
-                if yggflix_search_results:
-                    logger.success(
-                        f"Search: Found {len(yggflix_search_results)} results from YggFlix"
-                    )
-                    yggflix_search_results = filter_items(
-                        yggflix_search_results, media, config=config
-                    )
-                    yggflix_search_results = await torrent_service.convert_and_process(
-                        yggflix_search_results
-                    )
-                    search_results = merge_items(search_results, yggflix_search_results)
-
-            if config["zilean"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
-                zilean_service = ZileanService(config)
-                zilean_search_results = zilean_service.search(media)
-                if zilean_search_results:
-                    logger.success(
-                        f"Search: Found {len(zilean_search_results)} results from Zilean"
-                    )
-                    zilean_search_results = [
-                        ZileanResult().from_api_cached_item(torrent, media)
-                        for torrent in zilean_search_results
-                        if len(getattr(torrent, "info_hash", "")) == 40
-                    ]
-                    zilean_search_results = filter_items(
-                        zilean_search_results, media, config=config
-                    )
-                    zilean_search_results = await torrent_service.convert_and_process(
-                        zilean_search_results
-                    )
-                    logger.info(
-                        f"Search: Zilean final search results: {len(zilean_search_results)}"
-                    )
-                    search_results = merge_items(search_results, zilean_search_results)
-
-            if config["sharewood"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
-                sharewood_service = SharewoodService(config)
-                sharewood_search_results = sharewood_service.search(media)
-                if sharewood_search_results:
-                    logger.success(
-                        f"Search: Found {len(sharewood_search_results)} results from Sharewood"
-                    )
-                    sharewood_search_results = filter_items(
-                        sharewood_search_results, media, config=config
-                    )
-                    sharewood_search_results = (
-                        await torrent_service.convert_and_process(
-                            sharewood_search_results
-                        )
-                    )
-                    search_results = merge_items(
-                        search_results, sharewood_search_results
-                    )
-
-            if config["jackett"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
-                jackett_service = JackettService(config)
-                jackett_search_results = jackett_service.search(media)
-                logger.success(
-                    f"Search: Found {len(jackett_search_results)} results from Jackett"
-                )
-                filtered_jackett_search_results = filter_items(
-                    jackett_search_results, media, config=config
-                )
-                if filtered_jackett_search_results:
-                    torrent_results = await torrent_service.convert_and_process(
-                        filtered_jackett_search_results
-                    )
-                    search_results = merge_items(search_results, torrent_results)
-
-            if update_cache and search_results:
-                logger.info(
-                    f"Search: Updating cache with {len(search_results)} results"
-                )
-                try:
-                    cache_key = media_cache_key(media)
-                    search_results_dict = [item.to_dict() for item in search_results]
-                    await redis_cache.set(cache_key, search_results_dict)
-                    logger.success("Search: Cache update successful")
-                except Exception as e:
-                    logger.error(f"Search: Error updating cache: {e}")
-
-        await perform_search()
-        return search_results
-
     async def get_and_filter_results(media, config):
         min_results = int(config.get("minCachedResults", 5))
         cache_key = media_cache_key(media)
+        search_cache = SearchResultCache(
+            redis_cache, request.app.state.db_session_factory
+        )
+        single_flight = SingleFlight(redis_cache)
+        filter_pipeline = get_filter_pipeline(media, config)
 
-        unfiltered_results = await redis_cache.get(cache_key)
-        if unfiltered_results is None:
+        cached_search = await search_cache.get(cache_key)
+        if cached_search is None:
             logger.debug("Search: No results in cache. Performing new search.")
-            nocache_results = await get_search_results(media, config)
-            nocache_results_dict = [item.to_dict() for item in nocache_results]
-            await redis_cache.set(cache_key, nocache_results_dict)
-            logger.info(
-                f"Search: New search completed, found {len(nocache_results)} results"
+
+            async def search_and_cache():
+                return await search_cache.search(cache_key, media, config, torrent_dao)
+
+            unfiltered_results = await single_flight.run(
+                cache_key, search_and_cache, lambda: search_cache.load(cache_key)
             )
-            return nocache_results
-        else:
             logger.info(
-                f"Search: Retrieved {len(unfiltered_results)} results from redis cache"
+                f"Search: New search completed, found {len(unfiltered_results)} results"
+            )
+            # The search may have been run by another request, with its own config.
+            return filter_items(
+                unfiltered_results, media, config=config, pipeline=filter_pipeline
             )
-            unfiltered_results = [
-                TorrentItem.from_dict(item) for item in unfiltered_results
-            ]
 
-        filtered_results = filter_items(unfiltered_results, media, config=config)
+        unfiltered_results = cached_search.results
+        logger.info(
+            f"Search: Retrieved {len(unfiltered_results)} results from redis cache ({cached_search.age:.0f}s old)"
+        )
+        filtered_results = filter_items(
+            unfiltered_results, media, config=config, pipeline=filter_pipeline
+        )
 
-        if len(filtered_results) < min_results:
+        if len(filtered_results) >= min_results:
+            if search_cache.is_stale(cached_search):
+                logger.info("Search: Cached results are stale, refreshing in background")
+                search_cache.refresh_in_background(cache_key, media, config)
+        elif filtered_results:
             logger.info(
-                f"Search: Insufficient filtered results ({len(filtered_results)}). Performing new search."
+                f"Search: Insufficient filtered results ({len(filtered_results)}). Topping up in background."
+            )
+            search_cache.refresh_in_background(
+                cache_key, media, config, unfiltered_results, filtered_results
+            )
+        else:
+            logger.info("Search: No usable cached results. Performing top-up search.")
+
+            async def top_up_and_cache():
+                return await search_cache.search(
+                    cache_key, media, config, torrent_dao, unfiltered_results
+                )
+
+            unfiltered_results = await single_flight.run(
+                cache_key, top_up_and_cache, lambda: search_cache.load(cache_key)
+            )
+            filtered_results = filter_items(
+                unfiltered_results, media, config=config, pipeline=filter_pipeline
             )
-            await redis_cache.delete(cache_key)
-            unfiltered_results = await get_search_results(media, config)
-            unfiltered_results_dict = [item.to_dict() for item in unfiltered_results]
-            await redis_cache.set(cache_key, unfiltered_results_dict)
-            filtered_results = filter_items(unfiltered_results, media, config=config)
 
         logger.success(
             f"Search: Final number of filtered results: {len(filtered_results)}"
@@ -280,15 +192,26 @@ async def get_results(
     search_results = ResultsPerQualityFilter(config).filter(raw_search_results)
     logger.info(f"Search: Filtered search results per quality: {len(search_results)}")
 
-    def stream_processing(search_results, media, config):
+    async def stream_processing(search_results, media, config):
         torrent_smart_container = TorrentSmartContainer(search_results, media)
 
         if config["debrid"]:
-            for debrid in debrid_services:
-                hashes = torrent_smart_container.get_unaviable_hashes()
-                ip = request.client.host
-                result = debrid.get_availability_bulk(hashes, ip)
-                if result:
+            hashes = torrent_smart_container.get_unaviable_hashes()
+            ip = request.client.host
+            availability_cache = AvailabilityCache(redis_cache)
+            results = await asyncio.gather(
+                *(
+                    availability_cache.get_availability_bulk(debrid, hashes, ip)
+                    for debrid in debrid_services
+                ),
+                return_exceptions=True,
+            )
+            for debrid, result in zip(debrid_services, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Search: Availability check failed with {type(debrid).__name__}: {result}"
+                    )
+                elif result:
                     torrent_smart_container.update_availability(
                         result, type(debrid), media
                     )
@@ -308,15 +231,14 @@ async def get_results(
         best_matching_results = sort_items(best_matching_results, config)
         logger.info(f"Search: Found {len(best_matching_results)} best matching results")
 
-        parser = StreamParser(config)
+        parser = StreamParser(config, configb64=CONFIG_PLACEHOLDER)
         stream_list = parser.parse_to_stremio_streams(best_matching_results, media)
         logger.success(f"Search: Processed {len(stream_list)} streams for Stremio")
 
         return stream_list
 
-    stream_list = stream_processing(search_results, media, config)
-    streams = [Stream(**stream) for stream in stream_list]
-    await redis_cache.set(stream_cache_key(media), streams, expiration=1200)
+    stream_list = await stream_processing(search_results, media, config)
+    await redis_cache.set(stream_cache_key(media), stream_list, expiration=1200)
     total_time = time.time() - start
     logger.info(f"Search: Request completed in {total_time:.2f} seconds")
-    return SearchResponse(streams=streams)
+    return render_response(stream_list)
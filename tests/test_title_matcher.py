@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+import pytest
+
+from stream_fusion.utils.filter import title_matcher
+from stream_fusion.utils.filter.title_matcher import TitleMatcher
+
+
+def make_item(parsed_title):
+    return SimpleNamespace(parsed_data=SimpleNamespace(parsed_title=parsed_title))
+
+
+@pytest.fixture(autouse=True)
+def clear_decisions():
+    title_matcher._decisions.clear()
+    yield
+    title_matcher._decisions.clear()
+
+
+def test_decisions_are_not_shared_between_title_sets():
+    item = make_item("La Casa de Papel")
+
+    assert TitleMatcher(["La Casa de Papel", "Money Heist"])(item)
+    assert not TitleMatcher(["Money Heist"])(item)
+
+
+def test_decisions_are_reused_for_the_same_titles():
+    item = make_item("Money Heist")
+
+    assert TitleMatcher(["Money Heist"])(item)
+    assert len(title_matcher._decisions) == 1
+    assert TitleMatcher(["Money Heist"])(item)
+    assert len(title_matcher._decisions) == 1